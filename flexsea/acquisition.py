@@ -0,0 +1,413 @@
+from typing import Callable, Tuple
+
+import numpy as np
+
+from flexsea.utilities.worker import BackgroundWorker
+
+
+# ============================================
+#                 RingBuffer
+# ============================================
+class RingBuffer:
+    """
+    Fixed-capacity circular buffer of numpy rows with a single writer.
+
+    Rows are addressed by their absolute index, i.e., the number of
+    rows written before them. Only the most recent ``capacity`` rows
+    are retained. Readers never block the writer: the writer announces
+    the range it is about to overwrite before copying into the buffer
+    and publishes the new row count afterwards, so readers can discard
+    any rows that were overwritten while they were being copied.
+
+    Parameters
+    ----------
+    capacity : int
+        The maximum number of rows held by the buffer.
+
+    rowShape : Tuple
+        The shape of a single row, e.g., ``(nFields,)`` for plain
+        arrays or ``()`` for structured arrays.
+
+    dtype : np.dtype
+        The data type of the rows.
+    """
+
+    def __init__(self, capacity: int, rowShape: Tuple, dtype: np.dtype) -> None:
+        if capacity <= 0:
+            raise ValueError("Error: ring buffer capacity must be positive.")
+
+        self._capacity = capacity
+        self._data = np.zeros((capacity,) + tuple(rowShape), dtype=dtype)
+        self._written: int = 0
+        self._writing: int = 0
+
+    # -----
+    # write
+    # -----
+    def write(self, rows: np.ndarray) -> None:
+        """
+        Appends ``rows`` to the buffer, overwriting the oldest rows if
+        the buffer is full. Must only be called from one thread.
+        """
+        nRows = len(rows)
+        if nRows == 0:
+            return
+
+        if nRows > self._capacity:
+            rows = rows[-self._capacity :]
+            self._written += nRows - self._capacity
+            nRows = self._capacity
+
+        self._writing = self._written + nRows
+
+        start = self._written % self._capacity
+        first = min(nRows, self._capacity - start)
+        self._data[start : start + first] = rows[:first]
+        self._data[: nRows - first] = rows[first:]
+
+        self._written = self._writing
+
+    # -----
+    # read
+    # -----
+    def read(self, start: int, stop: int) -> np.ndarray:
+        """
+        Returns a copy of the rows with absolute indices in
+        ``[start, stop)``. Rows that are no longer in the buffer are
+        silently left out, so the result may be shorter than requested.
+        """
+        stop = min(stop, self._written)
+        start = max(start, stop - self._capacity, 0)
+        if start >= stop:
+            return self._data[:0].copy()
+
+        indices = np.arange(start, stop) % self._capacity
+        rows = self._data[indices]
+
+        # Anything the writer has started overwriting since we computed
+        # the range is no longer valid
+        firstValid = max(start, self._writing - self._capacity)
+
+        return rows[firstValid - start :]
+
+    # -----
+    # latest
+    # -----
+    def latest(self, n: int = 1) -> np.ndarray:
+        """
+        Returns a copy of the ``n`` most recent rows.
+        """
+        written = self._written
+        return self.read(written - n, written)
+
+    # -----
+    # snapshot
+    # -----
+    def snapshot(self) -> np.ndarray:
+        """
+        Returns a copy of every row currently held, oldest first.
+        """
+        written = self._written
+        return self.read(written - self._capacity, written)
+
+    # -----
+    # capacity
+    # -----
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    # -----
+    # written
+    # -----
+    @property
+    def written(self) -> int:
+        """
+        The total number of rows ever written to the buffer.
+        """
+        return self._written
+
+    # -----
+    # oldest
+    # -----
+    @property
+    def oldest(self) -> int:
+        """
+        The absolute index of the oldest row still held.
+        """
+        return max(0, self._written - self._capacity)
+
+
+# ============================================
+#                Acquisition
+# ============================================
+class Acquisition(BackgroundWorker):
+    """
+    Drains a device's data queue on a background thread into a
+    :py:class:`RingBuffer`. See
+    :py:class:`~flexsea.utilities.worker.BackgroundWorker` for stopping
+    it and how errors on the thread are reported. Such an error, e.g.,
+    from a sink (see :py:meth:`add_sink`), is also raised by the methods
+    that return samples, so that a failed acquisition isn't mistaken
+    for one that has stopped receiving data.
+
+    Normally created by :py:meth:`flexsea.device.Device.start_acquisition`
+    rather than directly.
+
+    Parameters
+    ----------
+    readFunc : Callable
+        Drains the device's data queue, returning the data and the
+        number of rows read, e.g.,
+        :py:meth:`flexsea.device.Device.read_all_array`.
+
+    capacity : int
+        The number of samples the ring buffer holds.
+
+    rowShape : Tuple
+        The shape of a single sample.
+
+    dtype : np.dtype
+        The data type of the samples.
+
+    timeField : int, str, None
+        The column (or, for structured samples, the field name) holding
+        the device's time stamp. Required by :py:meth:`since`.
+
+    pollPeriod : float, optional
+        Time, in seconds, between successive drains of the device's
+        queue.
+
+    samplePeriod : float, None, optional
+        Time, in the units of the time stamp, between two streamed
+        samples. Used to detect lost samples (see :py:attr:`overruns`).
+    """
+
+    def __init__(
+        self,
+        readFunc: Callable,
+        capacity: int,
+        rowShape: Tuple,
+        dtype: np.dtype,
+        timeField: int | str | None,
+        pollPeriod: float = 0.005,
+        samplePeriod: float | None = None,
+    ) -> None:
+        if pollPeriod <= 0:
+            raise ValueError("Error: poll period must be positive.")
+
+        super().__init__("flexsea-acquisition", "Error: acquisition thread failed.")
+
+        self._readFunc = readFunc
+        self._buffer = RingBuffer(capacity, rowShape, dtype)
+        self._rowShape = tuple(rowShape)
+        self._timeField = timeField
+        self._pollPeriod = pollPeriod
+        self._samplePeriod = samplePeriod
+        self._lastTime: float | None = None
+        self._lost: int = 0
+        self._sinks: Tuple[Callable, ...] = ()
+
+    # -----
+    # start
+    # -----
+    def start(self) -> None:
+        """
+        Starts the background thread.
+        """
+        if self.running:
+            print("Already acquiring.")
+            return
+        self._start_worker(self._work)
+
+    # -----
+    # _work
+    # -----
+    def _work(self) -> None:
+        while not self._stopEvent.is_set():
+            data, nRows = self._readFunc()
+            if nRows:
+                self._count_lost(data[:nRows])
+                self._buffer.write(data[:nRows])
+                for sink in self._sinks:
+                    sink(data[:nRows])
+            self._stopEvent.wait(self._pollPeriod)
+
+    # -----
+    # _count_lost
+    # -----
+    def _count_lost(self, rows: np.ndarray) -> None:
+        if self._samplePeriod is None or self._timeField is None:
+            return
+
+        times = self._times(rows).astype(np.float64)
+        if self._lastTime is not None:
+            times = np.concatenate(([self._lastTime], times))
+        self._lastTime = times[-1]
+
+        # Samples are streamed one period apart, so a gap of n periods
+        # between two consecutive time stamps means n - 1 samples never
+        # made it to us, e.g., because the device's queue overflowed
+        # between two drains
+        steps = np.rint(np.diff(times) / self._samplePeriod)
+        self._lost += int(np.sum(steps[steps > 1] - 1))
+
+    # -----
+    # _times
+    # -----
+    def _times(self, rows: np.ndarray) -> np.ndarray:
+        if isinstance(self._timeField, str):
+            return rows[self._timeField]
+        return rows[:, self._timeField]
+
+    # -----
+    # add_sink
+    # -----
+    def add_sink(self, sink: Callable, rowShape: Tuple | None = None) -> None:
+        """
+        Has ``sink`` called, on the background thread, with every batch
+        of newly acquired samples, e.g., to write them to disk. ``sink``
+        must not hold on to the array it is given, since it is reused.
+
+        An exception raised by ``sink`` stops the acquisition and is
+        raised again by the next call to, e.g., :py:meth:`latest` or
+        :py:meth:`stop`.
+
+        Parameters
+        ----------
+        sink : Callable
+            Called as ``sink(rows)``.
+
+        rowShape : Tuple, None, optional
+            The shape of a single sample that ``sink`` expects. If
+            given, it's checked against :py:attr:`rowShape` here rather
+            than failing on the background thread.
+
+        Raises
+        ------
+        ValueError
+            If ``rowShape`` doesn't match the acquired samples.
+        """
+        if rowShape is not None and tuple(rowShape) != self._rowShape:
+            msg = f"Error: sink expects rows of shape {tuple(rowShape)}, but the "
+            msg += f"acquired rows have shape {self._rowShape}."
+            raise ValueError(msg)
+        # The tuple is replaced rather than modified so that the
+        # background thread never sees it half-updated
+        self._sinks = self._sinks + (sink,)
+
+    # -----
+    # remove_sink
+    # -----
+    def remove_sink(self, sink: Callable) -> None:
+        """
+        Stops calling a sink added with :py:meth:`add_sink`. It may
+        still be called once more if the background thread is already
+        about to call it.
+        """
+        self._sinks = tuple(s for s in self._sinks if s is not sink)
+
+    # -----
+    # latest
+    # -----
+    def latest(self) -> np.ndarray | None:
+        """
+        Returns a copy of the most recent sample, or ``None`` if no
+        samples have been acquired yet.
+
+        Raises
+        ------
+        RuntimeError
+            If the background thread stopped because of an error.
+        """
+        self._raise_if_failed()
+        rows = self._buffer.latest(1)
+        if len(rows) == 0:
+            return None
+        return rows[0]
+
+    # -----
+    # since
+    # -----
+    def since(self, timestamp: int) -> np.ndarray:
+        """
+        Returns a copy of every buffered sample whose time stamp is
+        greater than ``timestamp``.
+
+        Parameters
+        ----------
+        timestamp : int
+            Device time stamp, in the same units as the device's
+            ``state_time`` field (milliseconds).
+
+        Raises
+        ------
+        RuntimeError
+            If the samples have no time field or if the background
+            thread stopped because of an error.
+
+        Returns
+        -------
+        np.ndarray
+            The samples, oldest first.
+        """
+        self._raise_if_failed()
+        if self._timeField is None:
+            raise RuntimeError("Error: device data do not have a time field.")
+
+        # The writer may overwrite rows while we search, so we search a
+        # copy. Device time stamps are monotonic, so it's sorted
+        rows = self._buffer.snapshot()
+        return rows[np.searchsorted(self._times(rows), timestamp, side="right") :]
+
+    # -----
+    # snapshot
+    # -----
+    def snapshot(self) -> np.ndarray:
+        """
+        Returns a copy of every buffered sample, oldest first.
+
+        Raises
+        ------
+        RuntimeError
+            If the background thread stopped because of an error.
+        """
+        self._raise_if_failed()
+        return self._buffer.snapshot()
+
+    # -----
+    # rowShape
+    # -----
+    @property
+    def rowShape(self) -> Tuple:
+        """
+        The shape of a single acquired sample.
+        """
+        return self._rowShape
+
+    # -----
+    # nSamples
+    # -----
+    @property
+    def nSamples(self) -> int:
+        """
+        The total number of samples acquired since starting.
+        """
+        return self._buffer.written
+
+    # -----
+    # overruns
+    # -----
+    @property
+    def overruns(self) -> int:
+        """
+        The number of samples the device streamed that never made it
+        into the ring buffer, e.g., because the device's queue
+        overflowed between two drains. These are counted from gaps
+        longer than one sample period between consecutive time stamps,
+        including gaps spanning a :py:meth:`stop` and :py:meth:`start`.
+        Samples that were acquired and later overwritten in the ring
+        buffer are not counted. Always 0 if the samples have no time
+        field or no sample period was given.
+        """
+        return self._lost
@@ -0,0 +1,300 @@
+import asyncio
+import ctypes as c
+from typing import Any, AsyncIterator, Callable, List
+
+import numpy as np
+
+from flexsea.device import Device
+from flexsea.utilities.polling import async_request_and_wait
+
+
+# ============================================
+#                AsyncDevice
+# ============================================
+class AsyncDevice:
+    """
+    Awaitable interface to a :py:class:`~flexsea.device.Device` for use
+    with ``asyncio``.
+
+    Calls that only cross into the C library, such as reading and
+    sending motor commands, take microseconds and are made directly.
+    Calls that block for longer, such as opening the port, are run in
+    a worker thread. Calls that ask the device for a value and then wait
+    for its answer (:py:meth:`firmware_version`, :py:meth:`get_uvlo`, and
+    :py:meth:`read_utts`) poll for the answer instead of sleeping for a
+    fixed amount of time, so they return as soon as the device responds
+    and never stall the event loop.
+
+    Attributes that are not defined here are forwarded to the wrapped
+    device, so, e.g., ``asyncDevice.name`` works as expected.
+
+    Parameters
+    ----------
+    device : Device
+        The device to wrap.
+
+    Examples
+    --------
+    >>> device = await AsyncDevice.create("12.0.0", "/dev/ttyACM0")
+    >>> async with device:
+    ...     await device.start_streaming(100)
+    ...     async for sample in device.stream():
+    ...         print(sample["mot_cur"])
+    """
+
+    # pylint: disable=protected-access
+
+    def __init__(self, device: Device) -> None:
+        self.device = device
+
+    # -----
+    # create
+    # -----
+    @classmethod
+    async def create(cls, *args, **kwargs) -> "AsyncDevice":
+        """
+        Constructs the wrapped :py:class:`~flexsea.device.Device` in a
+        worker thread, since doing so may download files from S3. The
+        arguments are those of the :py:class:`~flexsea.device.Device`
+        constructor.
+        """
+        device = await asyncio.to_thread(Device, *args, **kwargs)
+        return cls(device)
+
+    # -----
+    # __getattr__
+    # -----
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.device, name)
+
+    # -----
+    # __aenter__
+    # -----
+    async def __aenter__(self) -> "AsyncDevice":
+        await self.open()
+        return self
+
+    # -----
+    # __aexit__
+    # -----
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    # -----
+    # open
+    # -----
+    async def open(self, bootloading: bool = False) -> None:
+        """
+        See :py:meth:`~flexsea.device.Device.open`.
+        """
+        await asyncio.to_thread(self.device.open, bootloading)
+
+    # -----
+    # close
+    # -----
+    async def close(self) -> None:
+        """
+        See :py:meth:`~flexsea.device.Device.close`.
+        """
+        await asyncio.to_thread(self.device.close)
+
+    # -----
+    # start_streaming
+    # -----
+    async def start_streaming(
+        self, frequency: int, heartbeat: int = 0, useSafety: bool = False
+    ) -> None:
+        """
+        See :py:meth:`~flexsea.device.Device.start_streaming`.
+        """
+        await asyncio.to_thread(
+            self.device.start_streaming, frequency, heartbeat, useSafety
+        )
+
+    # -----
+    # stop_streaming
+    # -----
+    async def stop_streaming(self) -> None:
+        """
+        See :py:meth:`~flexsea.device.Device.stop_streaming`.
+        """
+        await asyncio.to_thread(self.device.stop_streaming)
+
+    # -----
+    # read
+    # -----
+    async def read(self, allData: bool = False) -> dict | List[dict]:
+        """
+        See :py:meth:`~flexsea.device.Device.read`.
+        """
+        return self.device.read(allData)
+
+    # -----
+    # stream
+    # -----
+    async def stream(self, asArray: bool = False) -> AsyncIterator[dict | np.ndarray]:
+        """
+        Yields every sample streamed by the device, oldest first.
+
+        The device's queue is drained once per streaming period and the
+        event loop is free in between. Iteration stops once the device
+        stops streaming.
+
+        Parameters
+        ----------
+        asArray : bool, optional
+            If ``False`` (the default), each sample is a dictionary, as
+            returned by :py:meth:`~flexsea.device.Device.read`. If
+            ``True``, each sample is a copy of one row of the array
+            returned by :py:meth:`~flexsea.device.Device.read_all_array`.
+        """
+        period = 1.0 / self.device.streamingFrequency
+
+        while self.device.streaming:
+            if asArray:
+                data, nRows = self.device.read_all_array()
+                for row in data[:nRows].copy():
+                    yield row
+            else:
+                for sample in self.device.read(allData=True):
+                    yield sample
+            await asyncio.sleep(period)
+
+    # -----
+    # set_gains
+    # -----
+    async def set_gains(
+        self, kp: int, ki: int, kd: int, k: int, b: int, ff: int
+    ) -> None:
+        """
+        See :py:meth:`~flexsea.device.Device.set_gains`.
+        """
+        await asyncio.to_thread(self.device.set_gains, kp, ki, kd, k, b, ff)
+
+    # -----
+    # command_motor_position
+    # -----
+    async def command_motor_position(self, value: int) -> int:
+        """
+        See :py:meth:`~flexsea.device.Device.command_motor_position`.
+        """
+        return self.device.command_motor_position(value)
+
+    # -----
+    # command_motor_current
+    # -----
+    async def command_motor_current(self, value: int) -> int:
+        """
+        See :py:meth:`~flexsea.device.Device.command_motor_current`.
+        """
+        return self.device.command_motor_current(value)
+
+    # -----
+    # command_motor_voltage
+    # -----
+    async def command_motor_voltage(self, value: int) -> int:
+        """
+        See :py:meth:`~flexsea.device.Device.command_motor_voltage`.
+        """
+        return self.device.command_motor_voltage(value)
+
+    # -----
+    # command_motor_impedance
+    # -----
+    async def command_motor_impedance(self, value: int) -> int:
+        """
+        See :py:meth:`~flexsea.device.Device.command_motor_impedance`.
+        """
+        return self.device.command_motor_impedance(value)
+
+    # -----
+    # stop_motor
+    # -----
+    async def stop_motor(self) -> int:
+        """
+        See :py:meth:`~flexsea.device.Device.stop_motor`.
+        """
+        return self.device.stop_motor()
+
+    # -----
+    # firmware_version
+    # -----
+    async def firmware_version(self, timeout: float | None = None) -> dict:
+        """
+        Gets the firmware versions of the device's MCUs. See
+        :py:attr:`~flexsea.device.Device.firmware_version`.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The longest time, in seconds, to wait for the device to
+            answer. Defaults to the device's ``responseTimeout``.
+        """
+        if not self.device.connected:
+            raise RuntimeError("Error: not connected.")
+
+        fw = await self._request_and_wait(
+            self.device._request_firmware_version,
+            self.device._last_received_firmware_version,
+            timeout,
+        )
+
+        return self.device._decode_firmware_version(fw)
+
+    # -----
+    # get_uvlo
+    # -----
+    async def get_uvlo(self, timeout: float | None = None) -> int:
+        """
+        Gets the currently set UVLO. See
+        :py:meth:`~flexsea.device.Device.get_uvlo`.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The longest time, in seconds, to wait for the device to
+            answer. Defaults to the device's ``responseTimeout``.
+        """
+        if not self.device.connected:
+            raise RuntimeError("Error: not connected.")
+
+        return await self._request_and_wait(
+            self.device._request_uvlo, self.device._last_received_uvlo, timeout
+        )
+
+    # -----
+    # read_utts
+    # -----
+    async def read_utts(self, timeout: float = 0.25) -> List[int]:
+        """
+        Gets the current value of each UTT. See
+        :py:meth:`~flexsea.device.Device.read_utts`.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The longest time, in seconds, to wait for the device to
+            answer.
+        """
+        # num_utts checks the device type, firmware version, and connection
+        data = (c.c_int * self.device.num_utts)()
+
+        return await self._request_and_wait(
+            self.device._request_utts,
+            lambda: self.device._last_received_utts(data),
+            timeout,
+        )
+
+    # -----
+    # _request_and_wait
+    # -----
+    async def _request_and_wait(
+        self, request: Callable, getter: Callable, timeout: float | None
+    ) -> Any:
+        if timeout is None:
+            timeout = self.device.responseTimeout
+        value, roundTripTime, changed = await async_request_and_wait(
+            request, getter, timeout
+        )
+        self.device.lastRoundTripTime = roundTripTime if changed else None
+        return value
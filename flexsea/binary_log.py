@@ -0,0 +1,356 @@
+import json
+import mmap
+from pathlib import Path
+import struct
+from threading import Lock
+from typing import Dict, List
+
+import numpy as np
+
+# Magic bytes, format version, header size, number of fields
+_prefix = struct.Struct("<8sIII")
+_magic = b"FXBINLOG"
+_formatVersion = 1
+# The header is padded so that the rows start on an aligned boundary
+_alignment = 64
+
+
+# ============================================
+#              BinaryLogWriter
+# ============================================
+class BinaryLogWriter:
+    """
+    Appends samples to a binary log file.
+
+    The file starts with a header holding the field names and any
+    metadata, e.g., the firmware version and the device's name,
+    followed by the samples as raw little-endian ``int32`` rows, exactly
+    as returned by :py:meth:`flexsea.device.Device.read_all_array`.
+    Every row has the same size, so a row can be found by its index
+    without parsing anything. Use :py:class:`BinaryLog` to read it.
+
+    Normally created by :py:meth:`flexsea.device.Device.start_binary_log`
+    rather than directly.
+
+    Parameters
+    ----------
+    fileName : str, Path
+        The file to write. Overwritten if it already exists.
+
+    fields : List[str]
+        The names of the columns.
+
+    metadata : dict, None, optional
+        Stored in the header as JSON.
+    """
+
+    def __init__(
+        self, fileName: str | Path, fields: List[str], metadata: dict | None = None
+    ) -> None:
+        self._fileName = Path(fileName)
+        self._nFields = len(fields)
+
+        info = json.dumps({"fields": list(fields), "metadata": metadata or {}})
+        info = info.encode("utf-8")
+        headerSize = _prefix.size + len(info)
+        headerSize += -headerSize % _alignment
+
+        header = _prefix.pack(_magic, _formatVersion, headerSize, self._nFields) + info
+        header = header.ljust(headerSize, b"\x00")
+
+        # pylint: disable-next=consider-using-with
+        self._fd = open(self._fileName, "wb")
+        self._fd.write(header)
+        self._nRows: int = 0
+        self._closed = False
+        self._lock = Lock()
+
+    # -----
+    # write
+    # -----
+    def write(self, rows: np.ndarray) -> None:
+        """
+        Appends ``rows``, a two-dimensional array with one column per
+        field, to the file. Rows written after :py:meth:`close` are
+        ignored.
+
+        Raises
+        ------
+        ValueError
+            If the rows don't have one column per field.
+        """
+        if rows.shape[1:] != (self._nFields,):
+            raise ValueError("Error: rows do not match the log's fields.")
+
+        with self._lock:
+            if self._closed:
+                return
+            self._fd.write(np.ascontiguousarray(rows, dtype="<i4").data)
+            self._nRows += len(rows)
+
+    # -----
+    # flush
+    # -----
+    def flush(self) -> None:
+        """
+        Makes sure everything written so far is in the file, e.g., so
+        that it can be read while still being written.
+        """
+        with self._lock:
+            if not self._closed:
+                self._fd.flush()
+
+    # -----
+    # close
+    # -----
+    def close(self) -> None:
+        """
+        Writes any buffered rows and closes the file.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._fd.close()
+
+    # -----
+    # __enter__
+    # -----
+    def __enter__(self) -> "BinaryLogWriter":
+        return self
+
+    # -----
+    # __exit__
+    # -----
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    # -----
+    # fileName
+    # -----
+    @property
+    def fileName(self) -> Path:
+        return self._fileName
+
+    # -----
+    # nFields
+    # -----
+    @property
+    def nFields(self) -> int:
+        return self._nFields
+
+    # -----
+    # closed
+    # -----
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    # -----
+    # nRows
+    # -----
+    @property
+    def nRows(self) -> int:
+        """
+        The number of rows written so far.
+        """
+        return self._nRows
+
+
+# ============================================
+#                 BinaryLog
+# ============================================
+class BinaryLog:
+    """
+    Reads a log written by :py:class:`BinaryLogWriter`.
+
+    The file is memory-mapped and :py:attr:`data` is a read-only numpy
+    view onto it, so opening even a very large log is instantaneous and
+    only the parts that are actually looked at are read from disk.
+
+    To find a time stamp quickly, every ``indexStride``-th time stamp is
+    copied into a small index when the log is opened. :py:meth:`seek`
+    binary searches the index and then the one block of rows it points
+    to, which takes O(log n) time. Time stamps must be non-decreasing.
+
+    Parameters
+    ----------
+    fileName : str, Path
+        The log to read.
+
+    timeField : str, None, optional
+        The field holding the time stamps. If ``None`` or not one of the
+        log's fields, :py:meth:`seek` and :py:meth:`between` can't be
+        used.
+
+    indexStride : int, optional
+        The number of rows between successive index entries.
+
+    Examples
+    --------
+    >>> with BinaryLog("session.fxlog") as log:
+    ...     rows = log.between(60000, 61000)
+    ...     current = rows[:, log.fieldIndex["mot_cur"]]
+    """
+
+    def __init__(
+        self,
+        fileName: str | Path,
+        timeField: str | None = "state_time",
+        indexStride: int = 1024,
+    ) -> None:
+        if indexStride <= 0:
+            raise ValueError("Error: index stride must be positive.")
+
+        self._fileName = Path(fileName)
+
+        with open(self._fileName, "rb") as fd:
+            prefix = fd.read(_prefix.size)
+            if len(prefix) < _prefix.size:
+                raise ValueError(f"Error: not a binary log: {self._fileName}")
+            magic, version, headerSize, nFields = _prefix.unpack(prefix)
+            if magic != _magic:
+                raise ValueError(f"Error: not a binary log: {self._fileName}")
+            if version != _formatVersion:
+                raise ValueError(f"Error: unsupported binary log version: {version}")
+            info = json.loads(fd.read(headerSize - _prefix.size).rstrip(b"\x00"))
+
+            self._fields: List[str] = info["fields"]
+            self._fieldIndex = {field: i for i, field in enumerate(self._fields)}
+            self._metadata: dict = info["metadata"]
+
+            fileSize = self._fileName.stat().st_size
+            # A row that was only partly written, e.g., if the program
+            # crashed, is left out
+            nRows = (fileSize - headerSize) // (4 * nFields) if nFields else 0
+
+            self._mmap: mmap.mmap | None = None
+            if nRows:
+                self._mmap = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+                self._data = np.frombuffer(
+                    self._mmap, dtype="<i4", count=nRows * nFields, offset=headerSize
+                ).reshape(nRows, nFields)
+            else:
+                self._data = np.zeros((0, nFields), dtype="<i4")
+
+        self._indexStride = indexStride
+        self._timeColumn = self._fieldIndex.get(timeField)
+        self._index: np.ndarray | None = None
+        if self._timeColumn is not None:
+            self._index = self._data[::indexStride, self._timeColumn].copy()
+
+    # -----
+    # seek
+    # -----
+    def seek(self, timestamp: int) -> int:
+        """
+        Returns the index of the first row whose time stamp is at or
+        after ``timestamp``, or the number of rows if there is none.
+        """
+        if self._index is None:
+            raise RuntimeError("Error: log does not have a time field.")
+
+        # The last index entry at or before the time stamp tells us
+        # which block to look in
+        block = max(0, int(np.searchsorted(self._index, timestamp, "left")) - 1)
+        start = block * self._indexStride
+        stop = min(start + 2 * self._indexStride, len(self._data))
+        times = self._data[start:stop, self._timeColumn]
+        return start + int(np.searchsorted(times, timestamp, "left"))
+
+    # -----
+    # between
+    # -----
+    def between(self, start: int, stop: int) -> np.ndarray:
+        """
+        Returns a view of the rows whose time stamp lies in
+        ``[start, stop]``.
+        """
+        first = self.seek(start)
+        last = self.seek(stop + 1)
+        return self._data[first:last]
+
+    # -----
+    # column
+    # -----
+    def column(self, field: str) -> np.ndarray:
+        """
+        Returns a view of every value of ``field``.
+        """
+        return self._data[:, self._fieldIndex[field]]
+
+    # -----
+    # close
+    # -----
+    def close(self) -> None:
+        """
+        Releases the log's own view of the file. The file is unmapped
+        once no views returned earlier, e.g., by :py:meth:`between`,
+        are left either.
+        """
+        self._data = self._data[:0].copy()
+        self._index = None if self._index is None else self._index[:0]
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            # Raised while views onto the map still exist, in which case
+            # it's closed when the last of them is garbage collected
+            except BufferError:
+                pass
+            self._mmap = None
+
+    # -----
+    # __enter__
+    # -----
+    def __enter__(self) -> "BinaryLog":
+        return self
+
+    # -----
+    # __exit__
+    # -----
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    # -----
+    # __len__
+    # -----
+    def __len__(self) -> int:
+        return len(self._data)
+
+    # -----
+    # data
+    # -----
+    @property
+    def data(self) -> np.ndarray:
+        """
+        Read-only, two-dimensional view of every row in the log, with
+        one column per field.
+        """
+        return self._data
+
+    # -----
+    # fields
+    # -----
+    @property
+    def fields(self) -> List[str]:
+        return self._fields
+
+    # -----
+    # fieldIndex
+    # -----
+    @property
+    def fieldIndex(self) -> Dict[str, int]:
+        """
+        Maps each field's name to its column in :py:attr:`data`.
+        """
+        return self._fieldIndex
+
+    # -----
+    # metadata
+    # -----
+    @property
+    def metadata(self) -> dict:
+        """
+        The metadata given to :py:class:`BinaryLogWriter`.
+        """
+        return self._metadata
@@ -0,0 +1,114 @@
+import argparse
+import sys
+from typing import List
+
+import flexsea.utilities.constants as fxc
+from flexsea.utilities.prefetch import prefetch
+
+
+# ============================================
+#                  _prefetch
+# ============================================
+def _prefetch(args: argparse.Namespace) -> int:
+    results = prefetch(
+        args.firmwareVersions,
+        args.operatingSystems,
+        args.cacheDir,
+        args.nWorkers,
+        args.timeout,
+        not args.noVerify,
+    )
+
+    nFailed = 0
+    for result in results:
+        if result["status"] == "failed":
+            nFailed += 1
+            print(f"failed      {result['object']}: {result['error']}")
+        else:
+            print(f"{result['status']:<11} {result['path']}")
+
+    print(f"{len(results) - nFailed} of {len(results)} files ready.")
+    return 1 if nFailed else 0
+
+
+# ============================================
+#                    main
+# ============================================
+def main(argv: List[str] | None = None) -> int:
+    """
+    Entry point of the ``flexsea`` command.
+
+    Parameters
+    ----------
+    argv : List[str], None, optional
+        The arguments, without the program name. Defaults to those
+        given on the command line.
+
+    Returns
+    -------
+    int
+        The exit status.
+    """
+    parser = argparse.ArgumentParser(prog="flexsea")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    prefetchParser = subparsers.add_parser(
+        "prefetch",
+        help="Download the files needed for the given firmware versions ahead of time.",
+    )
+    prefetchParser.add_argument(
+        "firmwareVersions",
+        nargs="+",
+        help="Firmware versions to download files for, e.g., 12.0.0.",
+    )
+    prefetchParser.add_argument(
+        "-o",
+        "--os",
+        dest="operatingSystems",
+        action="append",
+        choices=sorted(fxc.libFiles),
+        default=None,
+        help="Operating system to download libraries for. Can be repeated. "
+        "Defaults to the current one.",
+    )
+    prefetchParser.add_argument(
+        "-d",
+        "--cache-dir",
+        dest="cacheDir",
+        type=str,
+        default=None,
+        help=f"Directory to populate. Defaults to {fxc.dephyPath}.",
+    )
+    prefetchParser.add_argument(
+        "-j",
+        "--jobs",
+        dest="nWorkers",
+        type=int,
+        default=8,
+        help="Number of files downloaded at the same time.",
+    )
+    prefetchParser.add_argument(
+        "-t",
+        "--timeout",
+        dest="timeout",
+        type=int,
+        default=60,
+        help="Time, in seconds, spent trying to connect to S3.",
+    )
+    prefetchParser.add_argument(
+        "--no-verify",
+        dest="noVerify",
+        action="store_true",
+        help="Don't check files that are already present against S3.",
+    )
+    prefetchParser.set_defaults(func=_prefetch)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+# ============================================
+#                  Run Main
+# ============================================
+if __name__ == "__main__":
+    sys.exit(main())
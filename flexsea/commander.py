@@ -0,0 +1,123 @@
+from time import perf_counter
+from time import sleep
+from typing import Callable, Sequence
+
+import numpy as np
+
+
+# ============================================
+#               FastCommander
+# ============================================
+class FastCommander:
+    """
+    Sends motor commands of a single type with as little Python
+    overhead as possible.
+
+    The device id, the controller code, and the library's
+    ``fxSendMotorCommand`` function are bound once, when the commander
+    is created, so a call is just the call into the library. Unlike
+    :py:meth:`~flexsea.device.Device.command_motor_current` and
+    friends, the connection status is not checked and a failed command
+    does not raise: the status code is returned and it is up to the
+    caller to compare it against :py:attr:`success`.
+
+    Normally created by :py:meth:`flexsea.device.Device.fast_commander`
+    rather than directly.
+
+    Parameters
+    ----------
+    sendFunc : Callable
+        The library's ``fxSendMotorCommand`` function.
+
+    devId : int
+        The id of the device to command.
+
+    controller : int
+        The code of the controller to use, e.g.,
+        ``flexsea.utilities.constants.controllers["current"].value``.
+
+    mode : str
+        The name of the controller, e.g., ``current``.
+
+    success : int
+        The status code the library returns on success.
+
+    Examples
+    --------
+    >>> send = device.fast_commander("current")
+    >>> retCode = send(1000)
+    """
+
+    __slots__ = ("_send", "_devId", "_controller", "mode", "success")
+
+    def __init__(
+        self, sendFunc: Callable, devId: int, controller: int, mode: str, success: int
+    ) -> None:
+        self._send = sendFunc
+        self._devId = devId
+        self._controller = controller
+        self.mode = mode
+        self.success = success
+
+    # -----
+    # __call__
+    # -----
+    def __call__(self, value: int) -> int:
+        """
+        Sends ``value`` to the device and returns the status code.
+        """
+        return self._send(self._devId, self._controller, value)
+
+    # -----
+    # send_many
+    # -----
+    def send_many(
+        self, values: Sequence[int] | np.ndarray, period: float, stopOnFailure=True
+    ) -> np.ndarray:
+        """
+        Sends each of ``values`` in turn, one every ``period`` seconds,
+        e.g., to play back an open-loop trajectory.
+
+        Commands are scheduled against the time the first one was sent,
+        rather than by sleeping ``period`` after each one, so that the
+        time taken by each call doesn't accumulate.
+
+        Parameters
+        ----------
+        values : Sequence[int], np.ndarray
+            The setpoints, in the units of the controller.
+
+        period : float
+            Time, in seconds, between successive commands. If 0, the
+            commands are sent back-to-back.
+
+        stopOnFailure : bool, optional
+            If ``True`` (the default), no more commands are sent after
+            one fails.
+
+        Returns
+        -------
+        np.ndarray
+            The status code of each command. Commands that were not sent
+            because of an earlier failure have a status code of -1.
+        """
+        values = np.asarray(values, dtype=np.int64).tolist()
+        retCodes = np.full(len(values), -1, dtype=np.int32)
+
+        send = self._send
+        devId = self._devId
+        controller = self._controller
+        success = self.success
+
+        start = perf_counter()
+        for i, value in enumerate(values):
+            if period > 0:
+                delay = start + i * period - perf_counter()
+                if delay > 0:
+                    sleep(delay)
+            retCode = send(devId, controller, value)
+            retCodes[i] = retCode
+            if stopOnFailure and retCode != success:
+                break
+
+        return retCodes
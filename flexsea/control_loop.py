@@ -0,0 +1,274 @@
+from time import perf_counter
+from typing import Callable
+
+import numpy as np
+
+from flexsea.utilities.scheduling import pin_to_cpu
+from flexsea.utilities.scheduling import set_realtime_priority
+from flexsea.utilities.scheduling import wait_until
+from flexsea.utilities.stats import RunningStats
+from flexsea.utilities.worker import BackgroundWorker
+
+
+# ============================================
+#                ControlLoop
+# ============================================
+class ControlLoop(BackgroundWorker):
+    """
+    Calls a function at a fixed rate with the latest sample from a
+    device.
+
+    Every tick has an absolute deadline, ``start + i / frequency``, so
+    the time spent reading and in the callback doesn't make the loop
+    drift the way ``read(); command(); sleep(dt)`` does. The loop
+    sleeps until just before each deadline and then polls the clock
+    (see :py:func:`~flexsea.utilities.scheduling.wait_until`). If a
+    tick runs past one or more of the following deadlines, those ticks
+    are skipped, rather than run back-to-back to catch up, and counted
+    in :py:attr:`overruns`.
+
+    Each tick, the latest sample is copied into an array that is
+    allocated once, up front, and passed to the callback along with the
+    tick's index. The callback can return ``False`` to stop the loop.
+
+    The loop either runs on the calling thread, with :py:meth:`run`, or
+    on a background thread, with :py:meth:`start` (see
+    :py:class:`~flexsea.utilities.worker.BackgroundWorker`). Either way,
+    :py:meth:`stop` ends it after the current tick.
+
+    Normally created by :py:meth:`flexsea.device.Device.control_loop`
+    rather than directly.
+
+    Parameters
+    ----------
+    readFunc : Callable
+        Returns the latest sample, e.g.,
+        :py:meth:`flexsea.device.Device.read_array`.
+
+    callback : Callable
+        Called as ``callback(sample, tick)`` once per tick.
+
+    frequency : float
+        The rate, in Hz, at which the callback is called.
+
+    sample : np.ndarray
+        The array the samples are copied into. Its shape and data type
+        must match what ``readFunc`` returns.
+
+    priority : int, None, optional
+        If given, the thread running the loop tries to switch to
+        real-time scheduling with this priority (see
+        :py:func:`~flexsea.utilities.scheduling.set_realtime_priority`).
+
+    cpu : int, None, optional
+        If given, the thread running the loop tries to pin itself to
+        this CPU core.
+
+    spin : float, optional
+        Time, in seconds, spent polling the clock before each deadline
+        instead of sleeping.
+
+    Examples
+    --------
+    >>> def controller(sample, tick):
+    ...     device.command_motor_current(-10 * sample[iAngle])
+    >>> loop = device.control_loop(controller, 500)
+    >>> loop.run(duration=10)
+    >>> print(loop.stats)
+    """
+
+    def __init__(
+        self,
+        readFunc: Callable,
+        callback: Callable,
+        frequency: float,
+        sample: np.ndarray,
+        priority: int | None = None,
+        cpu: int | None = None,
+        spin: float = 0.0005,
+    ) -> None:
+        if frequency <= 0:
+            raise ValueError("Error: frequency must be positive.")
+
+        super().__init__("flexsea-loop", "Error: control loop thread failed.")
+
+        self._readFunc = readFunc
+        self._callback = callback
+        self._period = 1.0 / frequency
+        self._sample = sample
+        self._priority = priority
+        self._cpu = cpu
+        self._spin = spin
+
+        self._ticks: int = 0
+        self._overruns: int = 0
+        self._periodStats = RunningStats()
+        self._durationStats = RunningStats()
+
+    # -----
+    # run
+    # -----
+    def run(self, duration: float | None = None, nTicks: int | None = None) -> None:
+        """
+        Runs the loop on the calling thread until ``duration`` seconds
+        have passed, ``nTicks`` ticks have run, the callback returns
+        ``False``, or :py:meth:`stop` is called from another thread.
+        With neither ``duration`` nor ``nTicks``, only the last two stop
+        the loop.
+
+        If ``priority`` or ``cpu`` were given, they apply to the
+        calling thread and stay in effect after the loop ends.
+
+        Parameters
+        ----------
+        duration : float, None, optional
+            The longest time, in seconds, to run for.
+
+        nTicks : int, None, optional
+            The largest number of ticks to run.
+        """
+        self._stopEvent.clear()
+        self._work(duration, nTicks)
+
+    # -----
+    # _work
+    # -----
+    def _work(self, duration: float | None, nTicks: int | None) -> None:
+        self._ticks = 0
+        self._overruns = 0
+        self._periodStats.reset()
+        self._durationStats.reset()
+
+        if self._priority is not None:
+            set_realtime_priority(self._priority)
+        if self._cpu is not None:
+            pin_to_cpu(self._cpu)
+
+        self._loop(duration, nTicks)
+
+    # -----
+    # _loop
+    # -----
+    def _loop(self, duration: float | None, nTicks: int | None) -> None:
+        readFunc = self._readFunc
+        callback = self._callback
+        sample = self._sample
+        period = self._period
+        spin = self._spin
+        stopEvent = self._stopEvent
+        periodStats = self._periodStats
+        durationStats = self._durationStats
+
+        start = perf_counter()
+        end = start + duration if duration is not None else None
+        deadline = start
+        previous = None
+        index = 0
+
+        while not stopEvent.is_set():
+            if nTicks is not None and self._ticks >= nTicks:
+                break
+            if end is not None and deadline >= end:
+                break
+
+            now = wait_until(deadline, spin)
+            if previous is not None:
+                periodStats.update(now - previous)
+            previous = now
+
+            np.copyto(sample, readFunc())
+            result = callback(sample, self._ticks)
+            self._ticks += 1
+
+            finished = perf_counter()
+            durationStats.update(finished - now)
+
+            if result is False:
+                break
+
+            # Skip any deadlines that have already passed
+            index += 1
+            missed = int((finished - start) / period) - index + 1
+            if missed > 0:
+                self._overruns += missed
+                index += missed
+            deadline = start + index * period
+
+    # -----
+    # start
+    # -----
+    def start(self, duration: float | None = None, nTicks: int | None = None) -> None:
+        """
+        Runs the loop on a background thread. Takes the same arguments
+        as :py:meth:`run`.
+        """
+        if self.running:
+            print("Already running.")
+            return
+        self._start_worker(self._work, duration, nTicks)
+
+    # -----
+    # ticks
+    # -----
+    @property
+    def ticks(self) -> int:
+        """
+        The number of times the callback has been called.
+        """
+        return self._ticks
+
+    # -----
+    # overruns
+    # -----
+    @property
+    def overruns(self) -> int:
+        """
+        The number of ticks skipped because the previous tick ran past
+        their deadline. A growing value means the callback, or reading
+        the sample, takes longer than the period.
+        """
+        return self._overruns
+
+    # -----
+    # period
+    # -----
+    @property
+    def period(self) -> RunningStats:
+        """
+        Statistics of the time, in seconds, between the starts of
+        successive ticks.
+        """
+        return self._periodStats
+
+    # -----
+    # duration
+    # -----
+    @property
+    def duration(self) -> RunningStats:
+        """
+        Statistics of the time, in seconds, taken to read the sample and
+        run the callback.
+        """
+        return self._durationStats
+
+    # -----
+    # stats
+    # -----
+    @property
+    def stats(self) -> dict:
+        """
+        All of the loop's counters, e.g., for monitoring.
+
+        Returns
+        -------
+        dict
+            ``ticks``, ``overruns``, and the ``period`` and ``duration``
+            statistics, each as a dictionary (see
+            :py:meth:`~flexsea.utilities.stats.RunningStats.as_dict`).
+        """
+        return {
+            "ticks": self._ticks,
+            "overruns": self._overruns,
+            "period": self._periodStats.as_dict(),
+            "duration": self._durationStats.as_dict(),
+        }
@@ -0,0 +1,371 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import os
+from pathlib import Path
+import re
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from flexsea.utilities.parquet import import_pyarrow
+
+
+# ============================================
+#               data_log_files
+# ============================================
+def data_log_files(path: str | Path) -> List[Path]:
+    """
+    Returns the data log files making up a session, in order.
+
+    When a log reaches the size set with
+    :py:meth:`~flexsea.device.Device.set_file_size`, the C library
+    carries on in a new file. Given a directory, e.g., the one set with
+    :py:meth:`~flexsea.device.Device.set_log_directory`, every ``.csv``
+    file in it is returned, sorted by name with any numbers in the name
+    compared by value, so that ``log_10.csv`` comes after
+    ``log_9.csv``.
+
+    Parameters
+    ----------
+    path : str, Path
+        A single log file or a directory of them.
+
+    Returns
+    -------
+    List[Path]
+        The log files.
+    """
+    path = Path(path)
+    if not path.is_dir():
+        return [path]
+
+    def natural_key(file: Path) -> List:
+        return [int(s) if s.isdigit() else s for s in re.split(r"(\d+)", file.name)]
+
+    return sorted(path.glob("*.csv"), key=natural_key)
+
+
+# ============================================
+#                _read_header
+# ============================================
+def _read_header(file: Path) -> Tuple[List[str] | None, List[str]]:
+    """
+    Returns the column names, if the file starts with them, and the
+    values of the first row of data.
+    """
+    with open(file, "r", encoding="utf-8") as fd:
+        names = None
+        first = fd.readline().strip().rstrip(",")
+        tokens = [token.strip() for token in first.split(",")]
+        try:
+            for token in tokens:
+                float(token)
+        except ValueError:
+            names = tokens
+            tokens = [token.strip() for token in fd.readline().strip().split(",")]
+
+    return names, tokens
+
+
+# ============================================
+#                _parse_file
+# ============================================
+def _parse_file(
+    file: Path,
+    dtype: np.dtype,
+    usecols: List[int],
+    hasHeader: bool,
+    timeField: str | None,
+    start: float | None,
+    stop: float | None,
+    chunkRows: int,
+) -> Iterator[np.ndarray]:
+    """
+    Yields the rows of ``file`` within the time range, ``chunkRows`` at
+    a time, as structured arrays.
+    """
+    with open(file, "r", encoding="utf-8") as fd:
+        if hasHeader:
+            fd.readline()
+        while True:
+            lines = list(islice(fd, chunkRows))
+            if not lines:
+                return
+            rows = np.loadtxt(lines, delimiter=",", dtype=dtype, usecols=usecols)
+            rows = np.atleast_1d(rows)
+
+            if timeField is not None:
+                times = rows[timeField]
+                # Time stamps only go up, so nothing after this chunk can
+                # be in range
+                if stop is not None and len(times) and times[0] > stop:
+                    return
+                mask = np.ones(len(rows), dtype=bool)
+                if start is not None:
+                    mask &= times >= start
+                if stop is not None:
+                    mask &= times <= stop
+                rows = rows[mask]
+
+            if len(rows):
+                yield rows
+
+
+# ============================================
+#                DataLogReader
+# ============================================
+class DataLogReader:
+    """
+    Parses the data logs written by the C library (see
+    :py:meth:`~flexsea.device.Device.set_log_directory`) into numpy
+    arrays, a chunk at a time, so that memory use doesn't grow with the
+    size of the logs.
+
+    The logs are comma-separated. When they are split across several
+    files, only the first one has the column names. Nothing in the
+    logs says what type a column is, so columns are parsed as
+    ``float64``, which holds every integer the C library logs exactly,
+    unless given in ``dtypes``.
+
+    Parameters
+    ----------
+    path : str, Path
+        A single log file or a directory of them (see
+        :py:func:`data_log_files`).
+
+    columns : List[str], None, optional
+        The columns to load. All of them if ``None``. Columns that
+        aren't loaded aren't converted either, which is much faster.
+
+    start : float, None, optional
+        Only rows whose time stamp is at least this are loaded.
+
+    stop : float, None, optional
+        Only rows whose time stamp is at most this are loaded. Since
+        time stamps only go up, reading stops at the first chunk past
+        ``stop``.
+
+    timeField : str, optional
+        The column holding the time stamps.
+
+    chunkRows : int, optional
+        The number of lines parsed at a time.
+
+    fields : List[str], None, optional
+        The column names, for logs whose first file has none.
+
+    dtypes : Dict[str, np.dtype], None, optional
+        The data type of any of the columns, e.g., ``{"state_time":
+        np.int64}``.
+
+    Examples
+    --------
+    >>> reader = DataLogReader("DataLog/", columns=["state_time", "mot_cur"])
+    >>> for chunk in reader:
+    ...     print(chunk["mot_cur"].mean())
+    >>> data = reader.read()
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        columns: List[str] | None = None,
+        start: float | None = None,
+        stop: float | None = None,
+        timeField: str = "state_time",
+        chunkRows: int = 100000,
+        fields: List[str] | None = None,
+        dtypes: Dict[str, np.dtype] | None = None,
+    ) -> None:
+        if chunkRows <= 0:
+            raise ValueError("Error: chunk size must be positive.")
+
+        self._files = data_log_files(path)
+        if not self._files:
+            raise FileNotFoundError(f"Error: no data logs found in: {path}")
+
+        names, _ = _read_header(self._files[0])
+        names = names or fields
+        if names is None:
+            raise ValueError("Error: data log has no column names; pass fields.")
+        self._fields = names
+
+        self._columns = list(columns) if columns is not None else list(names)
+        unknown = set(self._columns) - set(names)
+        if unknown:
+            raise ValueError(f"Error: unknown columns: {', '.join(sorted(unknown))}")
+        dtypes = dtypes or {}
+        unknown = set(dtypes) - set(names)
+        if unknown:
+            raise ValueError(f"Error: unknown columns: {', '.join(sorted(unknown))}")
+
+        timeKnown = timeField in names
+        if (start is not None or stop is not None) and not timeKnown:
+            raise ValueError(f"Error: data log has no field: {timeField}")
+        self._timeField = timeField if timeKnown else None
+
+        # The time stamps are needed to filter even if they aren't wanted
+        toLoad = list(self._columns)
+        if self._timeField is not None and self._timeField not in toLoad:
+            toLoad.append(self._timeField)
+
+        self._usecols = [names.index(column) for column in toLoad]
+        self._dtype = np.dtype(
+            [(column, dtypes.get(column, np.float64)) for column in toLoad]
+        )
+        self._start = start
+        self._stop = stop
+        self._chunkRows = chunkRows
+
+    # -----
+    # __iter__
+    # -----
+    def __iter__(self) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Yields the requested columns, a chunk at a time, in order.
+        """
+        for i, file in enumerate(self._files):
+            for rows in self._iter_file(i, file):
+                yield self._to_columns(rows)
+
+    # -----
+    # _iter_file
+    # -----
+    def _iter_file(self, i: int, file: Path) -> Iterator[np.ndarray]:
+        # Only the first file has the column names
+        hasHeader = i == 0 and _read_header(file)[0] is not None
+        return _parse_file(
+            file,
+            self._dtype,
+            self._usecols,
+            hasHeader,
+            self._timeField,
+            self._start,
+            self._stop,
+            self._chunkRows,
+        )
+
+    # -----
+    # _read_file
+    # -----
+    def _read_file(self, i: int) -> np.ndarray:
+        chunks = list(self._iter_file(i, self._files[i]))
+        if not chunks:
+            return np.zeros(0, dtype=self._dtype)
+        return np.concatenate(chunks)
+
+    # -----
+    # _to_columns
+    # -----
+    def _to_columns(self, rows: np.ndarray) -> Dict[str, np.ndarray]:
+        return {column: np.ascontiguousarray(rows[column]) for column in self._columns}
+
+    # -----
+    # read
+    # -----
+    def read(self, nWorkers: int | None = None) -> Dict[str, np.ndarray]:
+        """
+        Loads the requested columns of every file.
+
+        Parameters
+        ----------
+        nWorkers : int, None, optional
+            The number of processes parsing files at the same time. If
+            ``None``, one per CPU core, up to the number of files. Each
+            process loads a whole file, so memory use grows with this.
+
+        Returns
+        -------
+        Dict[str, np.ndarray]
+            One array per column.
+        """
+        nFiles = len(self._files)
+        if nWorkers is None:
+            nWorkers = min(nFiles, os.cpu_count() or 1)
+
+        if nWorkers <= 1 or nFiles == 1:
+            parts = [self._read_file(i) for i in range(nFiles)]
+        else:
+            with ProcessPoolExecutor(max_workers=nWorkers) as executor:
+                parts = list(executor.map(self._read_file, range(nFiles)))
+
+        return self._to_columns(np.concatenate(parts))
+
+    # -----
+    # to_parquet
+    # -----
+    def to_parquet(self, fileName: str | Path, compression: str = "zstd") -> int:
+        """
+        Converts the logs, a chunk at a time, to a Parquet file that can
+        be read with :py:func:`flexsea.recorder.read_recording`, with
+        one row group per chunk.
+
+        Requires the optional ``pyarrow`` dependency.
+
+        Parameters
+        ----------
+        fileName : str, Path
+            The file to write. Overwritten if it already exists.
+
+        compression : str, optional
+            Any codec supported by pyarrow, e.g., ``zstd``, ``snappy``,
+            or ``none``.
+
+        Returns
+        -------
+        int
+            The number of rows written.
+        """
+        pa, pq = import_pyarrow()
+
+        schema = pa.schema(
+            [
+                (column, pa.from_numpy_dtype(self._dtype[column]))
+                for column in self._columns
+            ]
+        )
+        nRows = 0
+        with pq.ParquetWriter(fileName, schema, compression=compression) as writer:
+            for chunk in self:
+                writer.write_table(pa.Table.from_pydict(chunk, schema=schema))
+                nRows += len(chunk[self._columns[0]])
+
+        return nRows
+
+    # -----
+    # files
+    # -----
+    @property
+    def files(self) -> List[Path]:
+        return self._files
+
+    # -----
+    # fields
+    # -----
+    @property
+    def fields(self) -> List[str]:
+        """
+        The names of every column in the logs.
+        """
+        return self._fields
+
+
+# ============================================
+#               read_data_log
+# ============================================
+def read_data_log(
+    path: str | Path,
+    columns: List[str] | None = None,
+    start: float | None = None,
+    stop: float | None = None,
+    timeField: str = "state_time",
+    nWorkers: int | None = None,
+    dtypes: Dict[str, np.dtype] | None = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Loads the data logs written by the C library. Shorthand for
+    ``DataLogReader(path, columns, start, stop, timeField,
+    dtypes=dtypes).read(nWorkers)``; see :py:class:`DataLogReader`.
+    """
+    reader = DataLogReader(path, columns, start, stop, timeField, dtypes=dtypes)
+    return reader.read(nWorkers)
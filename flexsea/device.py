@@ -1,11 +1,19 @@
 import ctypes as c
 from pathlib import Path
 import sys
+from time import perf_counter
 from time import sleep
-from typing import List
+from typing import Any, Callable, Dict, List, Tuple
 
+import numpy as np
 from semantic_version import Version
 
+from flexsea.acquisition import Acquisition
+from flexsea.binary_log import BinaryLogWriter
+from flexsea.commander import FastCommander
+from flexsea.control_loop import ControlLoop
+from flexsea.recorder import Recorder
+from flexsea.trajectory import TrajectoryPlayer
 import flexsea.utilities.constants as fxc
 from flexsea.utilities.decorators import minimum_required_version
 from flexsea.utilities.decorators import requires_device_not
@@ -14,8 +22,15 @@ from flexsea.utilities.decorators import training_warn
 from flexsea.utilities.decorators import validate
 from flexsea.utilities.firmware import decode_firmware
 from flexsea.utilities.firmware import validate_given_firmware_version
+from flexsea.utilities.labels import allocate_label_buffer
+from flexsea.utilities.labels import cache_labels
+from flexsea.utilities.labels import decode_labels
+from flexsea.utilities.labels import get_cached_labels
+from flexsea.utilities.labels import label_cache_key
 from flexsea.utilities.library import get_c_library
+from flexsea.utilities.library import set_prototypes
 from flexsea.utilities.library import set_read_functions
+from flexsea.utilities.polling import request_and_wait
 from flexsea.utilities.specs import get_device_spec
 
 
@@ -101,6 +116,63 @@ class Device:
         and cause the wearer to potentially fall. If this is ``True``, you
         must call ``stop_motor`` manually.
 
+    responseTimeout : float, optional
+        Methods such as :py:attr:`firmware_version` and :py:meth:`get_uvlo`
+        ask the device for a value and then wait for its answer. This is
+        the longest time, in seconds, they will wait. They return as soon
+        as the answer arrives, so this only matters when the device is
+        slow to respond or its answer hasn't changed since the last time
+        it was asked. The default is 5 seconds.
+
+    offline : bool, optional
+        If ``True``, S3 is never contacted. The firmware version is
+        validated against the cached list of available versions and the
+        C library (and, for legacy devices, the device spec) must
+        already be on disk. If ``False`` (the default), the cached list
+        of versions is still used if it is younger than
+        ``flexsea.utilities.constants.firmwareVersionCacheTtl`` seconds
+        and contains a match for ``firmwareVersion``; otherwise it is
+        refreshed from S3.
+
+    clib : Any, optional
+        An already loaded library to use instead of the pre-compiled
+        one, e.g., a
+        :py:class:`~flexsea.utilities.simulator.SimulatedLibrary` for
+        working without hardware. If given, ``firmwareVersion`` must be
+        a full semantic version string; it is not checked against the
+        versions available on S3 and nothing is downloaded. Only
+        non-legacy firmware is supported.
+
+    trackStatus : bool, optional
+        If ``False`` (the default), every check of :py:attr:`connected`
+        or :py:attr:`streaming`, including the one done by each read and
+        motor command, asks the library. If ``True``, the status is
+        instead kept locally: it is updated by :py:meth:`open`,
+        :py:meth:`close`, :py:meth:`start_streaming`, and
+        :py:meth:`stop_streaming`, and re-synchronized with the library
+        whenever a read or command fails and by :py:meth:`sync_status`.
+        This makes the checks nearly free, which matters in fast
+        control loops, but means that a device that drops out is only
+        noticed once a read or command fails or the status is
+        re-synchronized.
+
+    statusResyncPeriod : float, optional
+        If given and ``trackStatus`` is ``True``, the status is
+        re-synchronized with the library whenever it is checked and
+        more than this many seconds have passed since the last time.
+
+    cacheLabels : bool, optional
+        If ``True`` (the default), the names of the data fields are
+        cached in ``~/.dephy``, keyed by the device's name and side, the
+        firmware version, and the library version, and later calls to
+        :py:meth:`open` for the same kind of device use the cached
+        names instead of asking the device for them. If the device
+        turns out to send a different number of fields, e.g., because
+        its firmware was updated without the version changing, which is
+        checked with the first sample read, the names are read from the
+        device again and, if they differ, replace the cached ones.
+        Ignored if ``clib`` is given.
+
     Attributes
     ----------
 
@@ -141,6 +213,24 @@ class Device:
         The frequency (in Hz) at which the device is sending data. See:
         :py:meth:`start_streaming`
 
+    responseTimeout : float
+        The value of ``responseTimeout`` passed to the constructor.
+
+    offline : bool
+        The value of ``offline`` passed to the constructor.
+
+    trackStatus : bool
+        The value of ``trackStatus`` passed to the constructor.
+
+    statusResyncPeriod : float, None
+        The value of ``statusResyncPeriod`` passed to the constructor.
+
+    lastRoundTripTime : float, None
+        The time, in seconds, between the most recent request for a value
+        (e.g., :py:meth:`get_uvlo`) and the device's answer arriving.
+        ``None`` if no new answer arrived before the timeout, which is
+        also the case when the answer is the same as the previous one.
+
     bootloaderActive
     firmwareVersion
     uvlo
@@ -156,6 +246,7 @@ class Device:
     invalidDevice
     libVersion
     isLegacy
+    fieldIndex
 
 
     Examples
@@ -179,7 +270,14 @@ class Device:
         debug: bool = False,
         s3Timeout: int = 60,
         stopMotorOnDisconnect: bool = False,
+        responseTimeout: float = 5.0,
+        offline: bool = False,
+        clib: Any = None,
+        trackStatus: bool = False,
+        statusResyncPeriod: float | None = None,
+        cacheLabels: bool = True,
     ) -> None:
+        # pylint: disable=too-many-branches
         if not debug:
             sys.tracebacklimit = 0
         fxc.dephyPath.mkdir(parents=True, exist_ok=True)
@@ -187,10 +285,24 @@ class Device:
         self.port: str = port
         self.interactive = interactive
         self._stopMotorOnDisconnect = stopMotorOnDisconnect
-
-        self.firmwareVersion = validate_given_firmware_version(
-            firmwareVersion, self.interactive, s3Timeout
-        )
+        self.offline = offline
+        self.s3Timeout = s3Timeout
+        self.trackStatus = trackStatus
+        self.statusResyncPeriod = statusResyncPeriod
+        self.cacheLabels = cacheLabels and clib is None
+        self._checkLabels: bool = False
+        self._isOpen: bool = False
+        self._isStreaming: bool = False
+        self._lastStatusSync: float = 0.0
+
+        if clib is None:
+            self.firmwareVersion = validate_given_firmware_version(
+                firmwareVersion, self.interactive, s3Timeout, self.offline
+            )
+        else:
+            self.firmwareVersion = Version(firmwareVersion)
+            if self.firmwareVersion < fxc.legacyCutoff:
+                raise ValueError("Error: clib requires non-legacy firmware.")
 
         if libFile:
             self.libFile = Path(libFile).expanduser().absolute()
@@ -210,17 +322,37 @@ class Device:
         self.heartbeat: int = 0
         self.id: int = 0
         self.streamingFrequency: int = 0
+        self.responseTimeout: float = responseTimeout
+        self.lastRoundTripTime: float | None = None
 
-        (self._clib, self.libFile) = get_c_library(
-            self.firmwareVersion, self.libFile, s3Timeout
-        )
+        if clib is None:
+            (self._clib, self.libFile) = get_c_library(
+                self.firmwareVersion, self.libFile, s3Timeout, self.offline
+            )
+        else:
+            self._clib = set_prototypes(clib, self.firmwareVersion)
 
+        self._acquisition: Acquisition | None = None
+        self._trajectory: TrajectoryPlayer | None = None
+        self._recorder: Recorder | None = None
+        self._binaryLog: BinaryLogWriter | None = None
         self._fields: List[str] | None = None
+        self._fieldIndex: Dict[str, int] = {}
         self._gains: dict = {}
         self._hasHabs: bool | None = None
         self._name: str = ""
+        self._nReadFields: c.c_int = c.c_int()
+        self._readAllArray: np.ndarray | None = None
+        self._readAllPointers: c.Array | None = None
+        self._readAllFunc: Callable | None = None
+        self._readAllRecords: np.ndarray | None = None
+        self._readArray: np.ndarray | None = None
+        self._readBuffer: c.Array | None = None
+        self._readFunc: Callable | None = None
         self._side: str = ""
         self._state: c.Structure | None = None
+        self._stateBuffer: c.Array | None = None
+        self._stateDtype: np.dtype | None = None
         self._stateType: c.Structure | None = None
 
         if self.firmwareVersion < fxc.legacyCutoff:
@@ -289,6 +421,8 @@ class Device:
         if self.id in (self._INVALID_DEVICE.value, -1):
             raise RuntimeError("Failed to connect to device.")
 
+        self._isOpen = True
+
         self._name = self.name
         self._side = self.side
         self._hasHabs = self._name not in fxc.noHabs
@@ -303,7 +437,8 @@ class Device:
             self._get_state()
         else:
             self._get_fields()
-        self._clib = set_read_functions(
+            self._allocate_read_buffer()
+        self._readFunc, self._readAllFunc = set_read_functions(
             self._clib, self._name, self._isLegacy, self._stateType
         )
 
@@ -311,7 +446,9 @@ class Device:
     # _get_state
     # -----
     def _get_state(self) -> None:
-        stateSpec = get_device_spec(self._name, self.firmwareVersion)
+        stateSpec = get_device_spec(
+            self._name, self.firmwareVersion, self.s3Timeout, self.offline
+        )
 
         class LegacyDeviceState(c.Structure):
             _pack_ = 1
@@ -319,35 +456,109 @@ class Device:
 
         self._stateType = LegacyDeviceState
         self._state = LegacyDeviceState()
+        self._fields = list(stateSpec.keys())
+        self._fieldIndex = {field: i for i, field in enumerate(self._fields)}
+
+        # numpy understands packed ctypes structures, so the state can be
+        # viewed as a zero-dimensional structured array without copying.
+        # We use frombuffer rather than np.ctypeslib.as_array because the
+        # latter goes through PEP 3118, which mishandles packed structures
+        self._stateDtype = np.dtype(LegacyDeviceState)
+        self._readArray = np.frombuffer(self._state, dtype=self._stateDtype).reshape(())
 
     # -----
     # _get_fields
     # -----
     def _get_fields(self) -> None:
+        # Cached labels are checked against the first sample read, see
+        # _refresh_labels
+        self._checkLabels = False
+        if self.cacheLabels:
+            fields = get_cached_labels(self._label_cache_key())
+            if fields is not None:
+                self._checkLabels = True
+                self._set_fields(fields)
+                return
+
+        self._set_fields(self._read_labels())
+
+        if self.cacheLabels:
+            cache_labels(self._label_cache_key(), self._fields)
+
+    # -----
+    # _label_cache_key
+    # -----
+    def _label_cache_key(self) -> str:
+        return label_cache_key(
+            self._name, self._side, str(self.firmwareVersion), str(self._libVersion)
+        )
+
+    # -----
+    # _read_labels
+    # -----
+    def _read_labels(self) -> List[str]:
         maxFields = self._clib.fxGetMaxDataElements()
         maxFieldLength = self._clib.fxGetMaxDataLabelLength()
         nLabels = c.c_int()
 
-        # https://code.activestate.com/lists/python-list/704158
-        labels = (c.POINTER(c.c_char) * maxFields)()
-
-        for i in range(maxFields):
-            labels[i] = c.create_string_buffer(maxFieldLength)
+        labels, block = allocate_label_buffer(maxFields, maxFieldLength)
 
         retCode = self._clib.fxGetDataLabelsWrapper(self.id, labels, c.byref(nLabels))
 
         if retCode != self._SUCCESS.value:
             raise RuntimeError("Could not get device field labels.")
 
-        # Convert the labels from chars to python strings
-        fields = [""] * nLabels.value
-        if self._fields is None:
-            self._fields = []
-        for i in range(nLabels.value):
-            for j in range(maxFieldLength):
-                fields[i] += labels[i][j].decode("utf8")
-            fields[i] = fields[i].strip("\x00")
-            self._fields.append(fields[i])
+        return decode_labels(block, nLabels.value, maxFieldLength)
+
+    # -----
+    # _set_fields
+    # -----
+    def _set_fields(self, fields: List[str]) -> None:
+        self._fields = fields
+        self._fieldIndex = {field: i for i, field in enumerate(self._fields)}
+
+    # -----
+    # _refresh_labels
+    # -----
+    def _refresh_labels(self) -> bool:
+        """
+        Called when the device sends a different number of fields than
+        expected. The labels are read from the device again and, if
+        they differ from the ones in use, e.g., because the cached ones
+        are out of date, they replace them, the cache is updated, and
+        the read buffers are re-allocated to match.
+
+        Returns
+        -------
+        bool
+            ``True`` if the labels changed, in which case the read can
+            be retried, and ``False`` otherwise.
+        """
+        fields = self._read_labels()
+        if fields == self._fields:
+            return False
+        print("Warning: field labels are out of date; using the device's.")
+        self._set_fields(fields)
+        if self.cacheLabels:
+            cache_labels(self._label_cache_key(), fields)
+        self._allocate_read_buffer()
+        if self._readAllArray is not None:
+            self._allocate_read_all_buffer(len(self._readAllArray))
+        return True
+
+    # -----
+    # _allocate_read_buffer
+    # -----
+    def _allocate_read_buffer(self) -> None:
+        # The buffer is allocated once per connection and re-used by every
+        # read so that the hot path doesn't allocate or call
+        # fxGetMaxDataElements. The numpy array is a view onto the same
+        # memory, not a copy
+        maxDataElements = self._clib.fxGetMaxDataElements()
+        self._readBuffer = (c.c_int32 * maxDataElements)()
+        self._readArray = np.frombuffer(self._readBuffer, dtype=np.int32)[
+            : len(self._fields)
+        ]
 
     # -----
     # close
@@ -359,6 +570,10 @@ class Device:
 
         Will no longer be able to send commands or receive data.
         """
+        if self._trajectory is not None and self._trajectory.running:
+            self.stop_trajectory()
+        if self._acquisition is not None and self._acquisition.running:
+            self.stop_acquisition()
         if self.connected or self.streaming:
             if self._stopMotorOnDisconnect:
                 self.stop_motor()
@@ -366,8 +581,12 @@ class Device:
             retCode = self._clib.fxClose(self.id)
 
             if retCode != self._SUCCESS.value:
+                self._handle_failure(retCode)
                 raise RuntimeError("Failed to close connection.")
 
+            self._isOpen = False
+            self._isStreaming = False
+
     # -----
     # start_streaming
     # -----
@@ -419,6 +638,8 @@ class Device:
         else:
             self._stream_without_safety()
 
+        self._isStreaming = True
+
     # -----
     # _stream_with_safety
     # -----
@@ -453,8 +674,327 @@ class Device:
         retCode = self._clib.fxStopStreaming(self.id)
 
         if retCode != self._SUCCESS.value:
+            self._handle_failure(retCode)
             raise RuntimeError("Failed to stop streaming.")
 
+        self._isStreaming = False
+
+    # -----
+    # start_acquisition
+    # -----
+    @requires_status("streaming")
+    def start_acquisition(
+        self, bufferSeconds: float = 10.0, pollPeriod: float = 0.005
+    ) -> Acquisition:
+        """
+        Starts draining the device's data queue on a background thread.
+
+        Every streamed sample is copied into a ring buffer that is
+        allocated up front and holds the most recent ``bufferSeconds``
+        of data. This decouples the rate at which the caller looks at
+        the data from the rate at which it arrives, so samples are
+        neither lost nor duplicated. While acquiring, use the returned
+        object's ``latest``, ``since``, and ``snapshot`` methods instead
+        of :py:meth:`read`, since both would compete for the same queue.
+
+        Parameters
+        ----------
+        bufferSeconds : float, optional
+            How many seconds worth of samples, at the current
+            :py:attr:`streamingFrequency`, the ring buffer holds.
+
+        pollPeriod : float, optional
+            Time, in seconds, between successive drains of the queue.
+
+        Raises
+        ------
+        RuntimeError
+            If an acquisition is already running.
+
+        Returns
+        -------
+        Acquisition
+            The object holding the ring buffer.
+        """
+        if self._acquisition is not None and self._acquisition.running:
+            raise RuntimeError("Error: acquisition already running.")
+
+        capacity = max(1, int(np.ceil(bufferSeconds * self.streamingFrequency)))
+
+        if self._isLegacy:
+            rowShape = ()
+            dtype = self._stateDtype
+            timeField = "state_time" if "state_time" in self._fieldIndex else None
+        else:
+            rowShape = (len(self._fields),)
+            dtype = np.int32
+            timeField = self._fieldIndex.get("state_time")
+
+        self._acquisition = Acquisition(
+            self.read_all_array,
+            capacity,
+            rowShape,
+            dtype,
+            timeField,
+            pollPeriod,
+            1000.0 / self.streamingFrequency,
+        )
+        self._acquisition.start()
+
+        return self._acquisition
+
+    # -----
+    # stop_acquisition
+    # -----
+    def stop_acquisition(self) -> None:
+        """
+        Stops the background acquisition started by
+        :py:meth:`start_acquisition`, along with the recording, if any.
+        The buffered samples remain available through
+        :py:attr:`acquisition`.
+        """
+        if self._acquisition is None:
+            return
+        self.stop_recording()
+        self.stop_binary_log()
+        self._acquisition.stop()
+
+    # -----
+    # acquisition
+    # -----
+    @property
+    def acquisition(self) -> Acquisition | None:
+        """
+        The most recent background acquisition, if any.
+
+        Returns
+        -------
+        Acquisition, None
+            The object holding the ring buffer of acquired samples.
+        """
+        return self._acquisition
+
+    # -----
+    # start_recording
+    # -----
+    @requires_status("streaming")
+    def start_recording(
+        self,
+        fileName: str | Path,
+        chunkRows: int = 10000,
+        compression: str = "zstd",
+        maxPendingChunks: int = 4,
+    ) -> Recorder:
+        """
+        Starts writing every streamed sample to a Parquet file.
+
+        The samples are taken from the background acquisition, which is
+        started with its default settings if it isn't already running
+        (see :py:meth:`start_acquisition`). They are written in chunks
+        of ``chunkRows`` samples, one column per field, on a background
+        thread, with the minimum and maximum of every column stored
+        for each chunk. Use :py:func:`flexsea.recorder.read_recording`
+        to load a time range back. The firmware version, the device's
+        name and side, and the streaming frequency are stored in the
+        file's metadata.
+
+        Requires the optional ``pyarrow`` dependency, which can be
+        installed with ``pip install flexsea[parquet]``.
+
+        Parameters
+        ----------
+        fileName : str, Path
+            The file to write. Overwritten if it already exists.
+
+        chunkRows : int, optional
+            The number of samples per chunk.
+
+        compression : str, optional
+            Any codec supported by pyarrow, e.g., ``zstd``, ``snappy``,
+            or ``none``.
+
+        maxPendingChunks : int, optional
+            How many chunks may wait to be written to disk before the
+            acquisition thread waits for them. Together with
+            ``chunkRows``, this bounds the memory used.
+
+        Raises
+        ------
+        RuntimeError
+            If a recording is already running.
+
+        ValueError
+            If the running acquisition's samples don't match the
+            device's fields, e.g., because they changed since it was
+            started.
+
+        Returns
+        -------
+        Recorder
+            The object writing the file.
+        """
+        if self._recorder is not None and not self._recorder.closed:
+            raise RuntimeError("Error: already recording.")
+
+        if self._acquisition is None or not self._acquisition.running:
+            self.start_acquisition()
+
+        if self._isLegacy:
+            rowShape = ()
+            dtype = self._stateDtype
+        else:
+            rowShape = (len(self._fields),)
+            dtype = np.int32
+
+        recorder = Recorder(
+            fileName,
+            self._fields,
+            rowShape,
+            dtype,
+            chunkRows,
+            compression,
+            maxPendingChunks,
+            self._log_metadata(),
+        )
+        try:
+            self._acquisition.add_sink(recorder.write, rowShape)
+        except ValueError:
+            recorder.close()
+            raise
+        self._recorder = recorder
+
+        return self._recorder
+
+    # -----
+    # stop_recording
+    # -----
+    def stop_recording(self) -> None:
+        """
+        Stops the recording started by :py:meth:`start_recording`,
+        writes any buffered samples, and closes the file. The
+        acquisition keeps running.
+        """
+        if self._recorder is None or self._recorder.closed:
+            return
+        if self._acquisition is not None:
+            self._acquisition.remove_sink(self._recorder.write)
+        self._recorder.close()
+
+    # -----
+    # recorder
+    # -----
+    @property
+    def recorder(self) -> Recorder | None:
+        """
+        The most recent recording, if any.
+
+        Returns
+        -------
+        Recorder, None
+            The object writing the file.
+        """
+        return self._recorder
+
+    # -----
+    # start_binary_log
+    # -----
+    @requires_status("streaming")
+    def start_binary_log(self, fileName: str | Path) -> BinaryLogWriter:
+        """
+        Starts appending every streamed sample to a binary log file.
+
+        The file holds the field names, the firmware version, the
+        device's name and side, and the streaming frequency, followed by
+        the samples as raw ``int32`` rows, exactly as returned by
+        :py:meth:`read_all_array`. Unlike the C library's text logs,
+        nothing has to be parsed to read it back: open it with
+        :py:class:`flexsea.binary_log.BinaryLog`, which memory-maps the
+        file and can seek to a time stamp in O(log n) time.
+
+        The samples are taken from the background acquisition, which is
+        started with its default settings if it isn't already running
+        (see :py:meth:`start_acquisition`).
+
+        Parameters
+        ----------
+        fileName : str, Path
+            The file to write. Overwritten if it already exists.
+
+        Raises
+        ------
+        RuntimeError
+            If a binary log is already being written or if the device
+            is a legacy device, whose samples aren't plain ``int32``
+            rows.
+
+        ValueError
+            If the running acquisition's samples don't match the
+            device's fields, e.g., because they changed since it was
+            started.
+
+        Returns
+        -------
+        BinaryLogWriter
+            The object writing the file.
+        """
+        if self._isLegacy:
+            raise RuntimeError("Error: binary logs require firmware >= 10.0.0.")
+        if self._binaryLog is not None and not self._binaryLog.closed:
+            raise RuntimeError("Error: already writing a binary log.")
+
+        if self._acquisition is None or not self._acquisition.running:
+            self.start_acquisition()
+
+        binaryLog = BinaryLogWriter(fileName, self._fields, self._log_metadata())
+        try:
+            self._acquisition.add_sink(binaryLog.write, (binaryLog.nFields,))
+        except ValueError:
+            binaryLog.close()
+            raise
+        self._binaryLog = binaryLog
+
+        return self._binaryLog
+
+    # -----
+    # stop_binary_log
+    # -----
+    def stop_binary_log(self) -> None:
+        """
+        Stops the binary log started by :py:meth:`start_binary_log` and
+        closes the file. The acquisition keeps running.
+        """
+        if self._binaryLog is None or self._binaryLog.closed:
+            return
+        if self._acquisition is not None:
+            self._acquisition.remove_sink(self._binaryLog.write)
+        self._binaryLog.close()
+
+    # -----
+    # binaryLog
+    # -----
+    @property
+    def binaryLog(self) -> BinaryLogWriter | None:
+        """
+        The most recent binary log, if any.
+
+        Returns
+        -------
+        BinaryLogWriter, None
+            The object writing the file.
+        """
+        return self._binaryLog
+
+    # -----
+    # _log_metadata
+    # -----
+    def _log_metadata(self) -> dict:
+        return {
+            "firmwareVersion": str(self.firmwareVersion),
+            "name": self.name,
+            "side": self.side,
+            "streamingFrequency": self.streamingFrequency,
+        }
+
     # -----
     # set_gains
     # -----
@@ -603,6 +1143,282 @@ class Device:
         controller = fxc.controllers["impedance"]
         return self._clib.fxSendMotorCommand(self.id, controller, value)
 
+    # -----
+    # fast_commander
+    # -----
+    @requires_status("connected")
+    def fast_commander(self, mode: str) -> FastCommander:
+        """
+        Returns a callable that sends motor commands of the given type
+        with minimal overhead, for high-rate control loops.
+
+        The returned :py:class:`~flexsea.commander.FastCommander` skips
+        the status check and the error handling done by, e.g.,
+        :py:meth:`command_motor_current`: it returns the status code of
+        each command instead of raising. It is only valid for as long as
+        the device stays connected.
+
+        Parameters
+        ----------
+        mode : str
+            One of ``position``, ``current``, ``voltage``, or
+            ``impedance``.
+
+        Raises
+        ------
+        ValueError
+            If ``mode`` is not a known controller.
+
+        Returns
+        -------
+        FastCommander
+            Call it with a setpoint, e.g., ``send(1000)``, or use its
+            ``send_many`` method to play back a trajectory.
+
+        Examples
+        --------
+        >>> send = device.fast_commander("current")
+        >>> for current in currents:
+        ...     if send(current) != device.success:
+        ...         break
+        """
+        if mode not in fxc.controllers or mode == "none":
+            raise ValueError(f"Error: unknown controller: {mode}")
+
+        return FastCommander(
+            self._clib.fxSendMotorCommand,
+            self.id,
+            fxc.controllers[mode].value,
+            mode,
+            self._SUCCESS.value,
+        )
+
+    # -----
+    # start_trajectory
+    # -----
+    @requires_status("connected")
+    def start_trajectory(
+        self,
+        setpoints: np.ndarray,
+        frequency: float,
+        mode: str,
+        measuredField: str | None = None,
+        priority: int | None = None,
+        cpu: int | None = None,
+    ) -> TrajectoryPlayer:
+        """
+        Starts sending an array of setpoints to the motor at a fixed
+        rate on a background thread.
+
+        Unlike a loop calling, e.g., :py:meth:`command_motor_position`
+        and then ``sleep``, each setpoint is sent against an absolute
+        deadline, so the trajectory doesn't drift, and the timing of
+        every tick is recorded. See
+        :py:class:`~flexsea.trajectory.TrajectoryPlayer`.
+
+        If the device is streaming, the field the controller acts on
+        (e.g., ``mot_ang`` for position control) is read right after
+        each setpoint is sent, from the running acquisition if there is
+        one (see :py:meth:`start_acquisition`) or from the device's
+        queue otherwise, in which case :py:meth:`read` should not be
+        called until the trajectory is done.
+
+        Parameters
+        ----------
+        setpoints : np.ndarray
+            One-dimensional array of setpoints. For impedance control,
+            these are positions.
+
+        frequency : float
+            The rate, in Hz, at which setpoints are sent.
+
+        mode : str
+            One of ``position``, ``current``, ``voltage``, or
+            ``impedance``.
+
+        measuredField : str, None, optional
+            The field to record alongside each setpoint, instead of the
+            one the controller acts on.
+
+        priority : int, None, optional
+            If given, the thread tries to switch to real-time scheduling
+            with this priority, between 1 and 99. Only possible on
+            Linux and usually only as root.
+
+        cpu : int, None, optional
+            If given, the thread tries to pin itself to this CPU core.
+            Only possible on Linux.
+
+        Raises
+        ------
+        RuntimeError
+            If a trajectory is already playing, or if ``measuredField``
+            is given but the device isn't streaming.
+
+        ValueError
+            If ``mode`` or ``measuredField`` is unknown.
+
+        Returns
+        -------
+        TrajectoryPlayer
+            Use its ``wait`` method to block until the trajectory is
+            done and its ``results`` for the recorded data.
+
+        Examples
+        --------
+        >>> t = np.arange(0, 2, 0.001)
+        >>> positions = pos0 + 1000 * np.sin(2 * np.pi * t)
+        >>> player = device.start_trajectory(positions, 1000, "position")
+        >>> player.wait()
+        >>> print(player.missedDeadlines)
+        """
+        if self._trajectory is not None and self._trajectory.running:
+            raise RuntimeError("Error: trajectory already playing.")
+
+        commander = self.fast_commander(mode)
+
+        readFunc = None
+        if self.streaming:
+            field = measuredField or fxc.controllerFields[mode]
+            if field not in self._fieldIndex:
+                raise ValueError(f"Error: unknown field: {field}")
+            # Legacy samples are structured, so they're indexed by name
+            key = field if self._isLegacy else self._fieldIndex[field]
+            readFunc = self._trajectory_read_func(key)
+        elif measuredField is not None:
+            raise RuntimeError("Error: device must be streaming to record data.")
+
+        self._trajectory = TrajectoryPlayer(
+            commander, setpoints, frequency, readFunc, priority, cpu
+        )
+        self._trajectory.start()
+
+        return self._trajectory
+
+    # -----
+    # _trajectory_read_func
+    # -----
+    def _trajectory_read_func(self, key: int | str) -> Callable:
+        acquisition = self._acquisition
+        if acquisition is not None and acquisition.running:
+
+            def read_acquired() -> float:
+                sample = acquisition.latest()
+                return np.nan if sample is None else sample[key]
+
+            return read_acquired
+
+        return lambda: self.read_array()[key]
+
+    # -----
+    # stop_trajectory
+    # -----
+    def stop_trajectory(self) -> None:
+        """
+        Stops the trajectory started by :py:meth:`start_trajectory`.
+        The motor is left at the last setpoint sent and the recorded
+        data remain available through :py:attr:`trajectory`.
+        """
+        if self._trajectory is None:
+            return
+        self._trajectory.stop()
+
+    # -----
+    # trajectory
+    # -----
+    @property
+    def trajectory(self) -> TrajectoryPlayer | None:
+        """
+        The most recent trajectory, if any.
+
+        Returns
+        -------
+        TrajectoryPlayer, None
+            The object holding the recorded data.
+        """
+        return self._trajectory
+
+    # -----
+    # control_loop
+    # -----
+    @requires_status("streaming")
+    def control_loop(
+        self,
+        callback: Callable,
+        frequency: float,
+        priority: int | None = None,
+        cpu: int | None = None,
+    ) -> ControlLoop:
+        """
+        Creates a loop that calls ``callback`` at a fixed rate with the
+        device's latest sample.
+
+        This replaces the usual ``while True: read(); command();
+        sleep(dt)`` loop, which drifts by however long the read and the
+        command took each time. See
+        :py:class:`~flexsea.control_loop.ControlLoop`. Use the returned
+        object's ``run`` method to run the loop on the calling thread or
+        ``start`` to run it in the background.
+
+        The sample passed to the callback is the same array every tick,
+        allocated once here, and has the same layout as the array
+        returned by :py:meth:`read_array` (use :py:attr:`fieldIndex` to
+        find a field). If an acquisition is running (see
+        :py:meth:`start_acquisition`), the sample is its latest one;
+        otherwise it is read from the device's queue.
+
+        Parameters
+        ----------
+        callback : Callable
+            Called as ``callback(sample, tick)``, where ``tick`` counts
+            the calls. Returning ``False`` stops the loop.
+
+        frequency : float
+            The rate, in Hz, at which ``callback`` is called. There's
+            nothing to gain from going faster than
+            :py:attr:`streamingFrequency`.
+
+        priority : int, None, optional
+            If given, the thread running the loop tries to switch to
+            real-time scheduling with this priority, between 1 and 99.
+            Only possible on Linux and usually only as root.
+
+        cpu : int, None, optional
+            If given, the thread running the loop tries to pin itself to
+            this CPU core. Only possible on Linux.
+
+        Returns
+        -------
+        ControlLoop
+            The loop, which also keeps statistics of its period, of how
+            long each tick took, and of how many ticks were skipped.
+
+        Examples
+        --------
+        >>> iAngle = device.fieldIndex["mot_ang"]
+        >>> def controller(sample, tick):
+        ...     device.command_motor_current(-10 * int(sample[iAngle]))
+        >>> loop = device.control_loop(controller, 500)
+        >>> loop.run(duration=10)
+        >>> print(loop.stats)
+        """
+        if self._isLegacy:
+            sample = np.zeros((), dtype=self._stateDtype)
+        else:
+            sample = np.zeros(len(self._fields), dtype=np.int32)
+
+        readFunc = self.read_array
+        acquisition = self._acquisition
+        if acquisition is not None and acquisition.running:
+            # Until the first sample arrives, the callback gets zeros
+            def read_acquired() -> np.ndarray:
+                latest = acquisition.latest()
+                return sample if latest is None else latest
+
+            readFunc = read_acquired
+
+        return ControlLoop(readFunc, callback, frequency, sample, priority, cpu)
+
     # -----
     # stop_motor
     # -----
@@ -732,23 +1548,55 @@ class Device:
             A dictionary with the semantic version strings of manage,
             execute, and regulate's firmware. And habs, if applicable.
         """
-        self._clib.fxRequestFirmwareVersion(self.id)
+        fw = self._request_and_wait(
+            self._request_firmware_version,
+            self._last_received_firmware_version,
+            self.responseTimeout,
+        )
+        return self._decode_firmware_version(fw)
 
-        sleep(5)
+    # -----
+    # _request_firmware_version
+    # -----
+    def _request_firmware_version(self) -> None:
+        self._clib.fxRequestFirmwareVersion(self.id)
 
+    # -----
+    # _last_received_firmware_version
+    # -----
+    def _last_received_firmware_version(self) -> Tuple[int, int, int, int]:
         fw = self._clib.fxGetLastReceivedFirmwareVersion(self.id)
+        return (fw.mn, fw.ex, fw.re, fw.habs)
+
+    # -----
+    # _decode_firmware_version
+    # -----
+    def _decode_firmware_version(self, fw: Tuple[int, int, int, int]) -> dict:
+        mn, ex, re, habs = fw
 
         fwDict = {
-            "mn": decode_firmware(fw.mn),
-            "ex": decode_firmware(fw.ex),
-            "re": decode_firmware(fw.re),
+            "mn": decode_firmware(mn),
+            "ex": decode_firmware(ex),
+            "re": decode_firmware(re),
         }
 
         if self._hasHabs:
-            fwDict["habs"] = decode_firmware(fw.habs)
+            fwDict["habs"] = decode_firmware(habs)
 
         return fwDict
 
+    # -----
+    # _request_and_wait
+    # -----
+    def _request_and_wait(
+        self, request: Callable, getter: Callable, timeout: float
+    ) -> Any:
+        # Polls for the response rather than sleeping for the worst-case
+        # response time. See request_and_wait for details
+        value, roundTripTime, changed = request_and_wait(request, getter, timeout)
+        self.lastRoundTripTime = roundTripTime if changed else None
+        return value
+
     # -----
     # print
     # -----
@@ -805,30 +1653,99 @@ class Device:
     # _read_all_legacy
     # -----
     def _read_all_legacy(self) -> List[dict]:
+        nRead = self._read_all_legacy_into_buffer()
+        rows = self._readAllRecords[:nRead].tolist()
+        return [dict(zip(self._fields, row)) for row in rows]
+
+    # -----
+    # _read_all_legacy_into_buffer
+    # -----
+    def _read_all_legacy_into_buffer(self) -> int:
         qs = self._clib.fxGetReadDataQueueSize(self.id)
-        data = (self._stateType * qs)()
-        allData = []
 
-        nRead = self._clib.read_all(self.id, data, qs)
+        if self._stateBuffer is None or qs > len(self._stateBuffer):
+            # Same growth strategy as _allocate_read_all_buffer
+            capacity = 1 << max(qs - 1, 0).bit_length()
+            self._stateBuffer = (self._stateType * capacity)()
+            self._readAllRecords = np.frombuffer(
+                self._stateBuffer, dtype=self._stateDtype
+            )
 
-        for i in range(nRead):
-            # pylint: disable-next=protected-access
-            allData.append({f[0]: getattr(data[i], f[0]) for f in data[i]._fields_})
+        if qs == 0:
+            return 0
 
-        return allData
+        return self._readAllFunc(self.id, self._stateBuffer, qs)
 
     # -----
     # _read_all
     # -----
     def _read_all(self) -> List[dict]:
+        nRows = self._read_all_into_buffer()
+        rows = self._readAllArray[:nRows].tolist()
+        return [dict(zip(self._fields, row)) for row in rows]
+
+    # -----
+    # read_all_array
+    # -----
+    @requires_status("streaming")
+    def read_all_array(self, structured: bool = False) -> Tuple[np.ndarray, int]:
+        """
+        Drains the data queue into a single two-dimensional numpy array.
+
+        This is the batched counterpart to ``read(allData=True)``. Every
+        entry in the queue is read with one call into the C library and
+        written into one contiguous block of memory that is re-used
+        across calls. The block only grows if the queue holds more
+        entries than it has room for.
+
+        Parameters
+        ----------
+        structured : bool, optional
+            If ``False`` (the default), the returned array has shape
+            ``(nSamples, nFields)`` and the columns are given by
+            :py:attr:`fieldIndex`. If ``True``, a structured view of the
+            same memory with shape ``(nSamples,)`` is returned instead,
+            so columns can be accessed by name, e.g., ``data["mot_cur"]``.
+            Legacy devices always return a structured array, since their
+            fields do not all share the same data type.
+
+        Returns
+        -------
+        Tuple[np.ndarray, int]
+            The array holding the data and the number of rows that were
+            filled. The array is a view onto the re-used block, so it is
+            overwritten by the next call to ``read_all_array`` or
+            ``read(allData=True)``.
+        """
+        if self._isLegacy:
+            nRows = self._read_all_legacy_into_buffer()
+            return self._readAllRecords[:nRows], nRows
+
+        nRows = self._read_all_into_buffer()
+        if structured:
+            return self._readAllRecords[:nRows], nRows
+        return self._readAllArray[:nRows], nRows
+
+    # -----
+    # _read_all_into_buffer
+    # -----
+    def _read_all_into_buffer(self) -> int:
+        # The rows are laid out according to the labels, so cached labels
+        # are checked with a single read before the queue is drained,
+        # rather than losing a whole batch if they're out of date
+        if self._checkLabels:
+            self._read_into_buffer()
+
         qs = self._clib.fxGetReadDataQueueSize(self.id)
-        data = (c.POINTER(c.c_int32) * qs)()
-        nElements = c.c_int()
 
-        for i in range(qs):
-            data[i] = (c.c_int32 * len(self._fields))()
+        if self._readAllArray is None or qs > len(self._readAllArray):
+            self._allocate_read_all_buffer(qs)
+
+        if qs == 0:
+            return 0
 
-        self._clib.read_all(self.id, data, c.byref(nElements))
+        nElements = c.c_int()
+        self._readAllFunc(self.id, self._readAllPointers, c.byref(nElements))
 
         try:
             assert nElements.value == len(self._fields)
@@ -836,47 +1753,110 @@ class Device:
             print("Different number of fields read than expected.")
             raise err
 
-        allData = []
+        return qs
+
+    # -----
+    # _allocate_read_all_buffer
+    # -----
+    def _allocate_read_all_buffer(self, nRows: int) -> None:
+        # fxReadDeviceAllWrapper expects an array of row pointers, so we
+        # point each one at a row of a single contiguous block rather than
+        # allocating each row separately. The capacity is rounded up to a
+        # power of two so that a slowly growing queue doesn't cause a
+        # re-allocation on every call
+        capacity = 1 << max(nRows - 1, 0).bit_length()
+        nFields = len(self._fields)
 
-        for i in range(qs):
-            singleTimeStepData = []
-            for j in range(nElements.value):
-                singleTimeStepData.append(data[i][j])
-            allData.append(dict(zip(self._fields, singleTimeStepData)))
+        # If the device sends more fields than expected, e.g., because
+        # the cached labels are out of date, the last row runs over, so
+        # the block has room for the longest row the library can write
+        padding = max(len(self._readBuffer) - nFields, 0)
+        block = np.zeros(capacity * nFields + padding, dtype=np.int32)
+        self._readAllArray = block[: capacity * nFields].reshape(capacity, nFields)
+        self._readAllRecords = self._readAllArray.view(
+            np.dtype([(field, np.int32) for field in self._fields])
+        )[:, 0]
 
-        return allData
+        rowPointer = c.POINTER(c.c_int32)
+        self._readAllPointers = (rowPointer * capacity)()
+        address = self._readAllArray.ctypes.data
+        rowStride = nFields * self._readAllArray.itemsize
+        for i in range(capacity):
+            self._readAllPointers[i] = c.cast(address + i * rowStride, rowPointer)
 
     # -----
     # _read_legacy
     # -----
     def _read_legacy(self) -> dict:
-        if self._clib.read(self.id, c.byref(self._state)) != self._SUCCESS.value:
+        self._read_legacy_into_buffer()
+        return dict(zip(self._fields, self._readArray.item()))
+
+    # -----
+    # _read_legacy_into_buffer
+    # -----
+    def _read_legacy_into_buffer(self) -> None:
+        retCode = self._readFunc(self.id, c.byref(self._state))
+
+        if retCode != self._SUCCESS.value:
+            self._handle_failure(retCode)
             raise RuntimeError("Error: read command failed.")
-        # pylint: disable-next=protected-access
-        return {f[0]: getattr(self._state, f[0]) for f in self._state._fields_}
 
     # -----
     # _read
     # -----
     def _read(self) -> dict:
-        maxDataElements = self._clib.fxGetMaxDataElements()
-        nFields = c.c_int()
-        deviceData = (c.c_int32 * maxDataElements)()
+        self._read_into_buffer()
+        return dict(zip(self._fields, self._readArray.tolist()))
+
+    # -----
+    # read_array
+    # -----
+    @requires_status("streaming")
+    def read_array(self) -> np.ndarray:
+        """
+        Gets the most recent entry in the data queue as a numpy array.
+
+        This is the allocation-free counterpart to :py:meth:`read`. The
+        data are read into a buffer that is allocated once when the
+        device is opened and the returned array is a view onto that
+        buffer. Use :py:attr:`fieldIndex` to look up the column of a
+        given field, e.g., ``data[device.fieldIndex["mot_cur"]]``.
+
+        Returns
+        -------
+        np.ndarray
+            One-dimensional ``int32`` array with one element per field.
+            For legacy devices, whose fields do not all share the same
+            data type, this is instead a zero-dimensional structured
+            array, e.g., ``data["mot_cur"]``. Either way, the array is
+            overwritten by the next call to ``read_array`` or ``read``,
+            so call ``copy()`` on it if you need to keep it.
+        """
+        if self._isLegacy:
+            self._read_legacy_into_buffer()
+        else:
+            self._read_into_buffer()
+        return self._readArray
 
-        retCode = self._clib.read(self.id, deviceData, c.byref(nFields))
+    # -----
+    # _read_into_buffer
+    # -----
+    def _read_into_buffer(self) -> None:
+        retCode = self._readFunc(self.id, self._readBuffer, c.byref(self._nReadFields))
 
         if retCode != self._SUCCESS.value:
+            self._handle_failure(retCode)
             raise RuntimeError("Could not read from device.")
 
         try:
-            assert nFields.value == len(self._fields)
+            assert self._nReadFields.value == len(self._fields)
         except AssertionError as err:
+            if self._refresh_labels():
+                self._read_into_buffer()
+                return
             print("Incorrect number of fields read.")
             raise err
-
-        data = [deviceData[i] for i in range(nFields.value)]
-
-        return dict(zip(self._fields, data))
+        self._checkLabels = False
 
     # -----
     # find_poles
@@ -920,22 +1900,37 @@ class Device:
     # uvlo - getter
     # -----
     @requires_status("connected")
-    def get_uvlo(self) -> int:
+    def get_uvlo(self, timeout: float | None = None) -> int:
         """
         Gets the currently set UVLO.
 
+        Parameters
+        ----------
+        timeout : float, optional
+            The longest time, in seconds, to wait for the device to
+            answer. Defaults to :py:attr:`responseTimeout`.
+
         Returns
         -------
         int
-            Status code indicating success or failure.
-
-        See Also
-        --------
-        :py:func:`success`
-        :py:func:`failure`
+            The UVLO in milli-volts.
         """
+        if timeout is None:
+            timeout = self.responseTimeout
+        return self._request_and_wait(
+            self._request_uvlo, self._last_received_uvlo, timeout
+        )
+
+    # -----
+    # _request_uvlo
+    # -----
+    def _request_uvlo(self) -> None:
         self._clib.fxRequestUVLO(self.id)
-        sleep(5)
+
+    # -----
+    # _last_received_uvlo
+    # -----
+    def _last_received_uvlo(self) -> int:
         return self._clib.fxGetLastReceivedUVLO(self.id)
 
     # -----
@@ -1263,31 +2258,47 @@ class Device:
     @requires_device_not("actpack")
     @minimum_required_version("9.1.0")
     @requires_status("connected")
-    def read_utts(self) -> List[int]:
+    def read_utts(self, timeout: float = 0.25) -> List[int]:
         """
         UTTs are not sent as a part of regular communication, so here we
         first request that the device send the UTTs to Mn, and then we
         read them.
 
+        Parameters
+        ----------
+        timeout : float, optional
+            The longest time, in seconds, to wait for the device to
+            answer.
+
         Returns
         -------
         List[int]
             The current value of each UTT.
         """
+        numUtts = self.num_utts
+        data = (c.c_int * numUtts)()
+
+        return self._request_and_wait(
+            self._request_utts, lambda: self._last_received_utts(data), timeout
+        )
+
+    # -----
+    # _request_utts
+    # -----
+    def _request_utts(self) -> None:
         if self._clib.fxRequestUTT(self.id) != self._SUCCESS.value:
             raise RuntimeError("Error: could not request UTTs.")
-        # We have to sleep for a bit in order to allow the device time
-        # to fulfill the request
-        sleep(0.25)
 
-        numUtts = self.num_utts
-        data = (c.c_int * numUtts)()
-        retCode = self._clib.fxGetLastReceivedUTT(self.id, data, numUtts)
+    # -----
+    # _last_received_utts
+    # -----
+    def _last_received_utts(self, data: c.Array) -> List[int]:
+        retCode = self._clib.fxGetLastReceivedUTT(self.id, data, len(data))
 
         if retCode != self._SUCCESS.value:
             raise RuntimeError("Error: could not read UTTs.")
 
-        return [data[i] for i in range(numUtts)]
+        return data[:]
 
     # -----
     # gains
@@ -1623,6 +2634,26 @@ class Device:
         """
         return self._libVersion
 
+    # -----
+    # fieldIndex
+    # -----
+    @property
+    def fieldIndex(self) -> Dict[str, int]:
+        """
+        Maps the name of each data field to its position in the arrays
+        returned by :py:meth:`read_array`.
+
+        The mapping is fixed once the device is opened, so it can be
+        looked up once outside of a control loop and the integer
+        indices used inside of it.
+
+        Returns
+        -------
+        Dict[str, int]
+            The index of each field keyed by the field's name.
+        """
+        return self._fieldIndex
+
     # -----
     # log files
     # -----
@@ -1671,16 +2702,57 @@ class Device:
     # -----
     @property
     def connected(self) -> bool:
-        return self._clib.fxIsOpen(self.id)
+        if not self.trackStatus:
+            return self._clib.fxIsOpen(self.id)
+        self._maybe_sync_status()
+        return self._isOpen
 
     # -----
     # streaming
     # -----
     @property
     def streaming(self) -> bool:
-        if self.connected:
-            return self._clib.fxIsStreaming(self.id)
-        return False
+        if not self.trackStatus:
+            if self.connected:
+                return self._clib.fxIsStreaming(self.id)
+            return False
+        self._maybe_sync_status()
+        return self._isStreaming
+
+    # -----
+    # sync_status
+    # -----
+    def sync_status(self) -> None:
+        """
+        Updates the locally tracked :py:attr:`connected` and
+        :py:attr:`streaming` status from the library. Only needed when
+        ``trackStatus`` is ``True``.
+        """
+        self._isOpen = bool(self._clib.fxIsOpen(self.id))
+        self._isStreaming = self._isOpen and bool(self._clib.fxIsStreaming(self.id))
+        self._lastStatusSync = perf_counter()
+
+    # -----
+    # _maybe_sync_status
+    # -----
+    def _maybe_sync_status(self) -> None:
+        if self.statusResyncPeriod is None:
+            return
+        if perf_counter() - self._lastStatusSync > self.statusResyncPeriod:
+            self.sync_status()
+
+    # -----
+    # _handle_failure
+    # -----
+    def _handle_failure(self, retCode: int) -> None:
+        # A failed call may mean the device disconnected or stopped streaming,
+        # which a locally tracked status wouldn't otherwise notice
+        if not self.trackStatus:
+            return
+        if retCode == self._NOT_STREAMING.value:
+            self._isStreaming = False
+        else:
+            self.sync_status()
 
     # -----
     # request_re_config_settings
@@ -0,0 +1,308 @@
+from time import perf_counter
+from typing import Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from flexsea.device import Device
+import flexsea.utilities.constants as fxc
+from flexsea.utilities.stats import RunningStats
+
+
+# ============================================
+#                 DeviceGroup
+# ============================================
+class DeviceGroup:
+    """
+    Several :py:class:`~flexsea.device.Device` instances that are
+    opened, streamed, read, and commanded together.
+
+    This is meant for setups such as bilateral exos, where the left
+    and right devices must stay in step. Reads of every member are
+    collected into one stacked array and motor commands are sent to
+    every member back-to-back, with the status checks done up front so
+    that nothing but the C calls themselves sits between members. The
+    time taken by each read and the spread between members are
+    recorded so the synchronization can be verified.
+
+    Parameters
+    ----------
+    firmwareVersion : str, List[str]
+        Firmware version of every device, or a list with one version
+        per port. See :py:class:`~flexsea.device.Device`.
+
+    ports : List[str]
+        The communication port of each device.
+
+    **kwargs
+        Passed on to the constructor of each
+        :py:class:`~flexsea.device.Device`.
+
+    Attributes
+    ----------
+    devices : List[Device]
+        The members of the group, in the same order as ``ports``.
+
+    Examples
+    --------
+    >>> group = DeviceGroup("12.0.0", ["/dev/ttyACM0", "/dev/ttyACM1"])
+    >>> group.open()
+    >>> group.start_streaming(1000)
+    >>> data, times = group.read()
+    >>> group.command_motor_current([500, -500])
+    """
+
+    def __init__(
+        self, firmwareVersion: str | List[str], ports: List[str], **kwargs
+    ) -> None:
+        if len(ports) == 0:
+            raise ValueError("Error: a device group needs at least one port.")
+
+        if isinstance(firmwareVersion, str):
+            firmwareVersion = [firmwareVersion] * len(ports)
+        if len(firmwareVersion) != len(ports):
+            raise ValueError("Error: need one firmware version per port.")
+
+        self.devices: List[Device] = [
+            Device(version, port, **kwargs)
+            for version, port in zip(firmwareVersion, ports)
+        ]
+
+        self._data: np.ndarray | None = None
+        self._times = np.zeros(len(self.devices), dtype=np.float64)
+        self._readLatency = [RunningStats() for _ in self.devices]
+        self._readSkew = RunningStats()
+        self._commandSkew = RunningStats()
+
+    # -----
+    # __len__
+    # -----
+    def __len__(self) -> int:
+        return len(self.devices)
+
+    # -----
+    # __iter__
+    # -----
+    def __iter__(self) -> Iterator[Device]:
+        return iter(self.devices)
+
+    # -----
+    # __getitem__
+    # -----
+    def __getitem__(self, index: int) -> Device:
+        return self.devices[index]
+
+    # -----
+    # open
+    # -----
+    def open(self) -> None:
+        """
+        Connects to every device. If one of them can't be opened, those
+        that already were are closed again, so that their ports are
+        released, before the error is raised.
+        """
+        opened = []
+        try:
+            for device in self.devices:
+                device.open()
+                opened.append(device)
+        except BaseException:
+            for device in opened:
+                device.close()
+            raise
+
+        nFields = max(len(device.fieldIndex) for device in self.devices)
+        # Legacy devices have float fields, which would be truncated by an
+        # integer array, and float64 holds every int32 value exactly
+        if any(device.isLegacy for device in self.devices):
+            dtype = np.float64
+        else:
+            dtype = np.int32
+        self._data = np.zeros((len(self.devices), nFields), dtype=dtype)
+
+    # -----
+    # close
+    # -----
+    def close(self) -> None:
+        """
+        Disconnects from every device.
+        """
+        for device in self.devices:
+            device.close()
+
+    # -----
+    # start_streaming
+    # -----
+    def start_streaming(
+        self, frequency: int, heartbeat: int = 0, useSafety: bool = False
+    ) -> None:
+        """
+        Has every device start streaming. See
+        :py:meth:`~flexsea.device.Device.start_streaming`.
+        """
+        for device in self.devices:
+            device.start_streaming(frequency, heartbeat, useSafety)
+
+    # -----
+    # stop_streaming
+    # -----
+    def stop_streaming(self) -> None:
+        """
+        Has every device stop streaming.
+        """
+        for device in self.devices:
+            device.stop_streaming()
+
+    # -----
+    # read
+    # -----
+    def read(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Reads the most recent data from every device.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            The first array has shape ``(nDevices, nFields)`` and holds
+            one row of data per device. Devices with fewer fields than
+            the widest member are zero-padded; use each device's
+            :py:attr:`~flexsea.device.Device.fieldIndex` to find a
+            field's column. The data are ``int32``, or ``float64`` if any
+            member is a legacy device, since those have float fields.
+            The second array holds the host time, from
+            :py:func:`time.perf_counter`, at which each device's read
+            completed. Both arrays are re-used by the next call.
+        """
+        if self._data is None:
+            raise RuntimeError("Error: not connected.")
+
+        first = 0.0
+        for i, device in enumerate(self.devices):
+            start = perf_counter()
+            row = device.read_array()
+            end = perf_counter()
+            if device.isLegacy:
+                self._data[i, : len(device.fieldIndex)] = row.item()
+            else:
+                self._data[i, : row.size] = row
+            self._times[i] = end
+            self._readLatency[i].update(end - start)
+            if i == 0:
+                first = end
+
+        self._readSkew.update(end - first)
+
+        return self._data, self._times
+
+    # -----
+    # command_motor_position
+    # -----
+    def command_motor_position(self, values: int | Sequence[int]) -> None:
+        """
+        Sets the motor position of every device. ``values`` is either one
+        value for every device or one value per device.
+        """
+        self._command("position", values)
+
+    # -----
+    # command_motor_current
+    # -----
+    def command_motor_current(self, values: int | Sequence[int]) -> None:
+        """
+        Sets the motor current of every device. ``values`` is either one
+        value for every device or one value per device.
+        """
+        self._command("current", values)
+
+    # -----
+    # command_motor_voltage
+    # -----
+    def command_motor_voltage(self, values: int | Sequence[int]) -> None:
+        """
+        Sets the motor voltage of every device. ``values`` is either one
+        value for every device or one value per device.
+        """
+        self._command("voltage", values)
+
+    # -----
+    # command_motor_impedance
+    # -----
+    def command_motor_impedance(self, values: int | Sequence[int]) -> None:
+        """
+        Sets the impedance setpoint of every device. ``values`` is either
+        one value for every device or one value per device.
+        """
+        self._command("impedance", values)
+
+    # -----
+    # stop_motor
+    # -----
+    def stop_motor(self) -> None:
+        """
+        Stops the motor of every device.
+        """
+        for device in self.devices:
+            device.stop_motor()
+
+    # -----
+    # _command
+    # -----
+    def _command(self, mode: str, values: int | Sequence[int]) -> None:
+        values = np.broadcast_to(np.asarray(values, dtype=np.int64), len(self.devices))
+
+        if not all(device.connected for device in self.devices):
+            raise RuntimeError("Error: not connected.")
+
+        # Everything that isn't the C call itself is done before the first
+        # command goes out so that the skew between devices is minimal
+        controller = fxc.controllers[mode]
+        # pylint: disable-next=protected-access
+        funcs = [device._clib.fxSendMotorCommand for device in self.devices]
+        ids = [device.id for device in self.devices]
+        args = list(zip(funcs, ids, values.tolist()))
+        retCodes = [0] * len(args)
+
+        start = perf_counter()
+        for i, (func, devId, value) in enumerate(args):
+            retCodes[i] = func(devId, controller, value)
+        self._commandSkew.update(perf_counter() - start)
+
+        for device, retCode in zip(self.devices, retCodes):
+            if retCode != device.success:
+                # pylint: disable-next=protected-access
+                device._handle_failure(retCode)
+                raise RuntimeError(f"Command: {mode} failed on {device.port}.")
+
+    # -----
+    # stats
+    # -----
+    @property
+    def stats(self) -> dict:
+        """
+        Timing statistics, in seconds, for the group.
+
+        Returns
+        -------
+        dict
+            ``readLatency`` is a list with the statistics of how long each
+            device's read took. ``readSkew`` is the time between the first
+            and last device's read completing within a call to
+            :py:meth:`read`. ``commandSkew`` is the time between the first
+            and last device being sent a motor command.
+        """
+        return {
+            "readLatency": [stats.as_dict() for stats in self._readLatency],
+            "readSkew": self._readSkew.as_dict(),
+            "commandSkew": self._commandSkew.as_dict(),
+        }
+
+    # -----
+    # reset_stats
+    # -----
+    def reset_stats(self) -> None:
+        """
+        Clears the timing statistics.
+        """
+        for stats in self._readLatency:
+            stats.reset()
+        self._readSkew.reset()
+        self._commandSkew.reset()
@@ -0,0 +1,352 @@
+import json
+from pathlib import Path
+from queue import Queue
+from threading import Lock
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from flexsea.utilities.parquet import import_pyarrow
+from flexsea.utilities.worker import BackgroundWorker
+
+
+# ============================================
+#                  Recorder
+# ============================================
+class Recorder(BackgroundWorker):
+    """
+    Writes streamed samples to a Parquet file in fixed-size chunks.
+
+    Samples are copied into one of a small pool of chunk buffers that
+    are allocated up front. Full chunks are compressed and written to
+    disk on a background thread, each as one Parquet row group, which
+    stores the minimum and maximum of every column. This lets
+    :py:func:`read_recording` load only the chunks covering a given
+    time range. If the disk falls behind by more than
+    ``maxPendingChunks``, :py:meth:`write` blocks until a buffer is
+    free, so memory use is bounded no matter how long the recording.
+
+    Requires the optional ``pyarrow`` dependency.
+
+    Normally created by :py:meth:`flexsea.device.Device.start_recording`
+    rather than directly.
+
+    Parameters
+    ----------
+    fileName : str, Path
+        The Parquet file to write. Overwritten if it already exists.
+
+    fields : List[str]
+        The names of the columns.
+
+    rowShape : Tuple
+        The shape of a single sample, i.e., ``(len(fields),)`` for
+        plain arrays or ``()`` for structured arrays.
+
+    dtype : np.dtype
+        The data type of the samples. For structured arrays, its field
+        names must be ``fields``.
+
+    chunkRows : int, optional
+        The number of samples per chunk.
+
+    compression : str, optional
+        Any codec supported by pyarrow, e.g., ``zstd``, ``snappy``, or
+        ``none``.
+
+    maxPendingChunks : int, optional
+        The number of full chunks that can wait to be written before
+        :py:meth:`write` blocks.
+
+    metadata : dict, None, optional
+        Stored in the file, as JSON, under the ``flexsea`` key, e.g.,
+        the firmware version and the device's name.
+    """
+
+    def __init__(
+        self,
+        fileName: str | Path,
+        fields: List[str],
+        rowShape: Tuple,
+        dtype: np.dtype,
+        chunkRows: int = 10000,
+        compression: str = "zstd",
+        maxPendingChunks: int = 4,
+        metadata: dict | None = None,
+    ) -> None:
+        if chunkRows <= 0 or maxPendingChunks <= 0:
+            raise ValueError("Error: chunk size and pending chunks must be positive.")
+
+        super().__init__("flexsea-recorder", "Error: failed to write recording.")
+
+        pa, pq = import_pyarrow()
+        self._pa = pa
+
+        self._fileName = Path(fileName)
+        self._fields = list(fields)
+        self._isStructured = len(rowShape) == 0
+        self._chunkRows = chunkRows
+
+        dtype = np.dtype(dtype)
+        if self._isStructured:
+            types = [pa.from_numpy_dtype(dtype[field]) for field in self._fields]
+        else:
+            types = [pa.from_numpy_dtype(dtype)] * len(self._fields)
+        schema = pa.schema(list(zip(self._fields, types)))
+        if metadata is not None:
+            schema = schema.with_metadata({"flexsea": json.dumps(metadata)})
+        self._schema = schema
+
+        self._writer = pq.ParquetWriter(
+            self._fileName, schema, compression=compression, write_statistics=True
+        )
+
+        # Full buffers go from _free to _pending and back again once
+        # they've been written, so nothing is allocated while recording
+        self._free: Queue = Queue()
+        self._pending: Queue = Queue()
+        for _ in range(maxPendingChunks + 1):
+            self._free.put(np.zeros((chunkRows,) + tuple(rowShape), dtype=dtype))
+        self._buffer = self._free.get()
+        self._nBuffered: int = 0
+
+        self._nRows: int = 0
+        self._nChunks: int = 0
+        self._closed = False
+        self._lock = Lock()
+        self._start_worker(self._work)
+
+    # -----
+    # write
+    # -----
+    def write(self, rows: np.ndarray) -> None:
+        """
+        Appends ``rows`` to the recording. Samples written after
+        :py:meth:`close` are ignored.
+
+        Raises
+        ------
+        RuntimeError
+            If writing an earlier chunk to disk failed.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._raise_if_failed()
+
+            nRows = len(rows)
+            start = 0
+            while start < nRows:
+                n = min(nRows - start, self._chunkRows - self._nBuffered)
+                self._buffer[self._nBuffered : self._nBuffered + n] = rows[
+                    start : start + n
+                ]
+                self._nBuffered += n
+                start += n
+                if self._nBuffered == self._chunkRows:
+                    self._submit()
+
+            self._nRows += nRows
+
+    # -----
+    # _submit
+    # -----
+    def _submit(self) -> None:
+        self._pending.put((self._buffer, self._nBuffered))
+        self._buffer = self._free.get()
+        self._nBuffered = 0
+
+    # -----
+    # _work
+    # -----
+    def _work(self) -> None:
+        while True:
+            item = self._pending.get()
+            if item is None:
+                return
+            buffer, nRows = item
+            # Once something has failed, we hold on to the error and keep
+            # recycling the buffers so that write doesn't block before it
+            # can report it
+            if self._error is None:
+                try:
+                    self._writer.write_table(self._to_table(buffer[:nRows]))
+                    self._nChunks += 1
+                except Exception as err:  # pylint: disable=broad-exception-caught
+                    self._error = err
+            self._free.put(buffer)
+
+    # -----
+    # _to_table
+    # -----
+    def _to_table(self, rows: np.ndarray):
+        if self._isStructured:
+            columns = [rows[field] for field in self._fields]
+        else:
+            columns = [
+                np.ascontiguousarray(rows[:, i]) for i in range(len(self._fields))
+            ]
+        return self._pa.Table.from_arrays(columns, schema=self._schema)
+
+    # -----
+    # close
+    # -----
+    def close(self) -> None:
+        """
+        Writes any buffered samples and closes the file.
+
+        Raises
+        ------
+        RuntimeError
+            If writing to the file failed.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._nBuffered:
+                self._submit()
+            self._pending.put(None)
+
+        try:
+            self.wait()
+        finally:
+            self._writer.close()
+
+    # -----
+    # stop
+    # -----
+    def stop(self) -> None:
+        """
+        Same as :py:meth:`close`.
+        """
+        self.close()
+
+    # -----
+    # fileName
+    # -----
+    @property
+    def fileName(self) -> Path:
+        return self._fileName
+
+    # -----
+    # closed
+    # -----
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    # -----
+    # nRows
+    # -----
+    @property
+    def nRows(self) -> int:
+        """
+        The number of samples recorded so far, including those not yet
+        written to disk.
+        """
+        return self._nRows
+
+    # -----
+    # nChunks
+    # -----
+    @property
+    def nChunks(self) -> int:
+        """
+        The number of chunks written to disk so far.
+        """
+        return self._nChunks
+
+
+# ============================================
+#               read_recording
+# ============================================
+def read_recording(
+    fileName: str | Path,
+    start: int | None = None,
+    stop: int | None = None,
+    columns: List[str] | None = None,
+    timeField: str = "state_time",
+) -> Dict[str, np.ndarray]:
+    """
+    Loads the samples of a recording made by :py:class:`Recorder` whose
+    time stamp lies in ``[start, stop]``.
+
+    Only the chunks whose minimum and maximum time stamps overlap the
+    range are read from disk, so a short stretch of a long recording
+    loads quickly.
+
+    Requires the optional ``pyarrow`` dependency.
+
+    Parameters
+    ----------
+    fileName : str, Path
+        The recording.
+
+    start : int, None, optional
+        The earliest time stamp to load, in the units of ``timeField``.
+        No lower bound if ``None``.
+
+    stop : int, None, optional
+        The latest time stamp to load. No upper bound if ``None``.
+
+    columns : List[str], None, optional
+        The fields to load. All of them if ``None``.
+
+    timeField : str, optional
+        The field holding the time stamps.
+
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        One array per field.
+    """
+    _, pq = import_pyarrow()
+
+    parquetFile = pq.ParquetFile(fileName)
+    metadata = parquetFile.metadata
+    timeColumn = parquetFile.schema_arrow.get_field_index(timeField)
+    if timeColumn < 0:
+        raise ValueError(f"Error: recording has no field: {timeField}")
+
+    rowGroups = []
+    for i in range(metadata.num_row_groups):
+        stats = metadata.row_group(i).column(timeColumn).statistics
+        if stats is not None and stats.has_min_max:
+            if start is not None and stats.max < start:
+                continue
+            if stop is not None and stats.min > stop:
+                continue
+        rowGroups.append(i)
+
+    toRead = None
+    if columns is not None:
+        toRead = list(dict.fromkeys(list(columns) + [timeField]))
+
+    table = parquetFile.read_row_groups(rowGroups, columns=toRead)
+    data = {name: table.column(name).to_numpy() for name in table.column_names}
+
+    mask = np.ones(table.num_rows, dtype=bool)
+    if start is not None:
+        mask &= data[timeField] >= start
+    if stop is not None:
+        mask &= data[timeField] <= stop
+
+    names = columns if columns is not None else table.column_names
+    return {name: data[name][mask] for name in names}
+
+
+# ============================================
+#           read_recording_metadata
+# ============================================
+def read_recording_metadata(fileName: str | Path) -> dict:
+    """
+    Returns the metadata stored in a recording made by
+    :py:class:`Recorder`, or an empty dictionary if there is none.
+    """
+    _, pq = import_pyarrow()
+
+    metadata = pq.read_schema(fileName).metadata or {}
+    if b"flexsea" not in metadata:
+        return {}
+    return json.loads(metadata[b"flexsea"])
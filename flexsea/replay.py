@@ -0,0 +1,519 @@
+import csv
+import math
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from flexsea.binary_log import BinaryLog
+from flexsea.data_log import DataLogReader
+from flexsea.recorder import read_recording_metadata
+from flexsea.utilities.parquet import import_pyarrow
+
+
+# ============================================
+#                _open_source
+# ============================================
+def _open_source(
+    path: Path, chunkRows: int
+) -> Tuple[List[str], dict, np.dtype, Iterator[np.ndarray]]:
+    """
+    Returns the field names, the metadata, the data type of the samples,
+    and an iterator over the samples of a recording, ``chunkRows`` at a
+    time. Nothing is read until the iterator asks for it.
+
+    As with :py:meth:`flexsea.device.Device.read_all_array`, samples
+    whose fields all have the same type are the rows of a
+    two-dimensional array of that type, and others, i.e., those of
+    legacy devices, the elements of a structured array.
+    """
+    if path.is_dir() or path.suffix == ".csv":
+        # The data logs don't say what type each field is, and those of
+        # legacy devices hold floats, so we keep the reader's float64,
+        # which also holds every int32 exactly
+        reader = DataLogReader(path, chunkRows=chunkRows)
+        fields = reader.fields
+
+        def iter_data_log() -> Iterator[np.ndarray]:
+            for chunk in reader:
+                yield np.column_stack([chunk[field] for field in fields])
+
+        return fields, {}, np.dtype(np.float64), iter_data_log()
+
+    if path.suffix == ".parquet":
+        _, pq = import_pyarrow()
+        parquetFile = pq.ParquetFile(path)
+        schema = parquetFile.schema_arrow
+        fields = schema.names
+        dtype = np.dtype(
+            [(field.name, field.type.to_pandas_dtype()) for field in schema]
+        )
+        types = {dtype[field] for field in fields}
+        if len(types) == 1:
+            dtype = types.pop()
+
+        def iter_parquet() -> Iterator[np.ndarray]:
+            for batch in parquetFile.iter_batches(batch_size=chunkRows):
+                columns = [column.to_numpy() for column in batch.columns]
+                if dtype.names is None:
+                    yield np.column_stack(columns)
+                    continue
+                rows = np.empty(batch.num_rows, dtype=dtype)
+                for field, column in zip(fields, columns):
+                    rows[field] = column
+                yield rows
+
+        return fields, read_recording_metadata(path), dtype, iter_parquet()
+
+    log = BinaryLog(path)
+
+    def iter_binary_log() -> Iterator[np.ndarray]:
+        # Slices of the memory map, so only the pages looked at are read
+        for start in range(0, len(log), chunkRows):
+            yield log.data[start : start + chunkRows]
+
+    return log.fields, log.metadata, log.data.dtype, iter_binary_log()
+
+
+# ============================================
+#                ReplayDevice
+# ============================================
+class ReplayDevice:
+    """
+    Plays back a recorded session through the same reading methods as
+    :py:class:`~flexsea.device.Device`, so that controllers can be run
+    and benchmarked without hardware.
+
+    The recording can be a binary log (see
+    :py:meth:`~flexsea.device.Device.start_binary_log`), a Parquet
+    recording (see :py:meth:`~flexsea.device.Device.start_recording`),
+    or the C library's data logs (see
+    :py:mod:`flexsea.data_log`). It is read from disk lazily, a chunk at
+    a time, so recordings of any size can be replayed.
+
+    Once streaming has started, the samples become available according
+    to their time stamps: at the rate they were recorded if ``speed`` is
+    1, twice as fast if it is 2, and so on. If ``speed`` is ``None``,
+    the time stamps are ignored and every call to :py:meth:`read`
+    returns the next sample, as fast as the caller can go.
+
+    Motor commands aren't sent anywhere. Instead, they are captured,
+    along with the time stamp of the latest sample that had been read
+    when they were issued, in :py:attr:`commands` and, if
+    ``commandLog`` is given, written to that CSV file.
+
+    Parameters
+    ----------
+    path : str, Path
+        The recording. Files ending in ``.parquet`` are read as Parquet
+        recordings, files ending in ``.csv`` and directories as data
+        logs, and anything else as a binary log.
+
+    speed : float, None, optional
+        How many times faster than real time to replay, or ``None`` for
+        as fast as possible.
+
+    timeField : str, optional
+        The field holding the time stamps, in milliseconds.
+
+    commandLog : str, Path, None, optional
+        The CSV file the captured commands are written to.
+
+    chunkRows : int, optional
+        The number of samples read from disk at a time.
+
+    Examples
+    --------
+    >>> device = ReplayDevice("session.fxlog", speed=None)
+    >>> device.open()
+    >>> device.start_streaming(1000)
+    >>> while not device.finished:
+    ...     data = device.read()
+    ...     device.command_motor_current(controller(data))
+    >>> device.close()
+    >>> print(device.stats)
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        speed: float | None = 1.0,
+        timeField: str = "state_time",
+        commandLog: str | Path | None = None,
+        chunkRows: int = 10000,
+    ) -> None:
+        if speed is not None and speed <= 0:
+            raise ValueError("Error: speed must be positive.")
+
+        self._path = Path(path)
+        self._speed = speed
+        self._chunkRows = chunkRows
+        self._commandLog = Path(commandLog) if commandLog is not None else None
+
+        self._fields, self._metadata, self._dtype, self._chunks = _open_source(
+            self._path, chunkRows
+        )
+        self._fieldIndex = {field: i for i, field in enumerate(self._fields)}
+        if timeField not in self._fieldIndex:
+            raise ValueError(f"Error: recording has no field: {timeField}")
+        self._timeField = timeField
+        self._timeColumn = self._fieldIndex[timeField]
+        self._isStructured = self._dtype.names is not None
+        self._rowShape = () if self._isStructured else (len(self._fields),)
+
+        self._chunk = np.zeros((0,) + self._rowShape, dtype=self._dtype)
+        self._position: int = 0
+        self._latest: np.ndarray | None = None
+        self._firstTime: float | None = None
+        self._finished = False
+
+        self._isOpen = False
+        self._isStreaming = False
+        self.streamingFrequency: int = 0
+        self._startTime: float = 0.0
+        self._stopTime: float | None = None
+        self._nSamples: int = 0
+
+        self._commands: List[Tuple[float, str, tuple]] = []
+        self._commandFile = None
+        self._commandWriter = None
+
+    # -----
+    # open
+    # -----
+    def open(self) -> None:
+        """
+        Opens the command log, if any.
+        """
+        if self._commandLog is not None and self._commandFile is None:
+            # pylint: disable-next=consider-using-with
+            self._commandFile = open(
+                self._commandLog, "w", encoding="utf-8", newline=""
+            )
+            self._commandWriter = csv.writer(self._commandFile)
+            self._commandWriter.writerow(["time", "command", "values"])
+        self._isOpen = True
+
+    # -----
+    # close
+    # -----
+    def close(self) -> None:
+        """
+        Stops the replay and closes the command log.
+        """
+        if self._isStreaming:
+            self.stop_streaming()
+        if self._commandFile is not None:
+            self._commandFile.close()
+            self._commandFile = None
+            self._commandWriter = None
+        self._isOpen = False
+
+    # -----
+    # start_streaming
+    # -----
+    def start_streaming(
+        self, frequency: int = 0, heartbeat: int = 0, useSafety: bool = False
+    ) -> None:
+        """
+        Starts the replay clock. The arguments are only there for
+        compatibility with :py:meth:`flexsea.device.Device.start_streaming`:
+        samples arrive at the rate they were recorded.
+        """
+        # pylint: disable=unused-argument
+        if not self._isOpen:
+            raise RuntimeError("Error: device is not connected.")
+        self.streamingFrequency = frequency
+        self._startTime = perf_counter()
+        self._stopTime = None
+        self._isStreaming = True
+
+    # -----
+    # stop_streaming
+    # -----
+    def stop_streaming(self) -> None:
+        """
+        Stops the replay clock.
+        """
+        self._stopTime = perf_counter()
+        self._isStreaming = False
+
+    # -----
+    # _next_chunk
+    # -----
+    def _next_chunk(self) -> bool:
+        """
+        Moves on to the next chunk of the recording, returning
+        ``False`` if there are none left.
+        """
+        for chunk in self._chunks:
+            if len(chunk):
+                self._chunk = chunk
+                self._position = 0
+                if self._firstTime is None:
+                    self._firstTime = float(self._times(chunk[0]))
+                return True
+        self._finished = True
+        return False
+
+    # -----
+    # _take
+    # -----
+    def _take(self, maxRows: int) -> np.ndarray:
+        """
+        Returns up to ``maxRows`` of the samples that are due, in order,
+        and moves past them.
+        """
+        pieces = []
+        nTaken = 0
+        while nTaken < maxRows:
+            if self._position >= len(self._chunk) and not self._next_chunk():
+                break
+
+            chunk = self._chunk
+            stop = min(len(chunk), self._position + maxRows - nTaken)
+            if self._speed is not None:
+                elapsed = (perf_counter() - self._startTime) * 1000.0 * self._speed
+                due = self._firstTime + elapsed
+                times = self._times(chunk[self._position : stop])
+                stop = self._position + int(np.searchsorted(times, due, "right"))
+
+            if stop == self._position:
+                break
+            pieces.append(chunk[self._position : stop])
+            nTaken += stop - self._position
+            self._position = stop
+
+        if not pieces:
+            return self._chunk[:0]
+        rows = pieces[0] if len(pieces) == 1 else np.concatenate(pieces)
+        # A view with the same shape as what Device.read_array returns
+        self._latest = rows[-1:].reshape(self._rowShape)
+        self._nSamples += len(rows)
+        return rows
+
+    # -----
+    # _times
+    # -----
+    def _times(self, rows: np.ndarray) -> np.ndarray:
+        if self._isStructured:
+            return rows[self._timeField]
+        return rows[..., self._timeColumn]
+
+    # -----
+    # read
+    # -----
+    def read(self, allData: bool = False) -> dict | List[dict]:
+        """
+        Gets the replayed data, like
+        :py:meth:`flexsea.device.Device.read`.
+
+        Parameters
+        ----------
+        allData : bool, optional
+            If ``False`` (the default), only the most recent sample that
+            is due is returned, and any others are skipped, as with a
+            real device. If ``True``, every sample that is due and
+            hasn't been read yet is returned, up to ``chunkRows`` of
+            them. When replaying as fast as possible, a sample is always
+            due, so this returns the next ``chunkRows`` samples.
+
+        Returns
+        -------
+        dict, List[dict]
+            The samples, keyed by field name. Once the recording is
+            over (see :py:attr:`finished`), ``read()`` keeps returning
+            the last sample and ``read(allData=True)`` an empty list.
+        """
+        return self._to_dicts(self._read(allData), allData)
+
+    # -----
+    # read_array
+    # -----
+    def read_array(self) -> np.ndarray:
+        """
+        Gets the most recent sample as a numpy array, like
+        :py:meth:`flexsea.device.Device.read_array`: a one-dimensional
+        array, or, for recordings of legacy devices, a zero-dimensional
+        structured array, with the data type of the recording. The C
+        library's data logs don't record the types of their fields, so
+        their samples are ``float64``. Zeros until the first sample is
+        due.
+        """
+        self._read(False)
+        if self._latest is None:
+            return np.zeros(self._rowShape, dtype=self._dtype)
+        return self._latest
+
+    # -----
+    # _read
+    # -----
+    def _read(self, allData: bool) -> np.ndarray:
+        if not self._isStreaming:
+            raise RuntimeError("Error: device is not streaming.")
+
+        if allData:
+            return self._take(self._chunkRows)
+        if self._speed is None:
+            return self._take(1)
+
+        # Skip to the most recent sample that's due
+        latest = self._chunk[:0]
+        while True:
+            rows = self._take(self._chunkRows)
+            if not len(rows):  # pylint: disable=use-implicit-booleaness-not-len
+                break
+            latest = rows[-1:]
+        return latest
+
+    # -----
+    # _to_dicts
+    # -----
+    def _to_dicts(self, rows: np.ndarray, allData: bool) -> dict | List[dict]:
+        if allData:
+            return [dict(zip(self._fields, row)) for row in rows.tolist()]
+        if self._latest is None:
+            return dict.fromkeys(self._fields, 0)
+        return dict(zip(self._fields, self._latest.tolist()))
+
+    # -----
+    # _capture
+    # -----
+    def _capture(self, command: str, *values) -> int:
+        time = math.nan
+        if self._latest is not None:
+            time = float(self._times(self._latest))
+        self._commands.append((time, command, values))
+        if self._commandWriter is not None:
+            self._commandWriter.writerow([time, command, " ".join(map(str, values))])
+        return 0
+
+    # -----
+    # command_motor_position
+    # -----
+    def command_motor_position(self, value: int) -> int:
+        return self._capture("position", value)
+
+    # -----
+    # command_motor_current
+    # -----
+    def command_motor_current(self, value: int) -> int:
+        return self._capture("current", value)
+
+    # -----
+    # command_motor_voltage
+    # -----
+    def command_motor_voltage(self, value: int) -> int:
+        return self._capture("voltage", value)
+
+    # -----
+    # command_motor_impedance
+    # -----
+    def command_motor_impedance(self, value: int) -> int:
+        return self._capture("impedance", value)
+
+    # -----
+    # set_gains
+    # -----
+    def set_gains(self, kp: int, ki: int, kd: int, k: int, b: int, ff: int) -> None:
+        self._capture("gains", kp, ki, kd, k, b, ff)
+
+    # -----
+    # stop_motor
+    # -----
+    def stop_motor(self) -> int:
+        return self._capture("stop")
+
+    # -----
+    # connected
+    # -----
+    @property
+    def connected(self) -> bool:
+        return self._isOpen
+
+    # -----
+    # streaming
+    # -----
+    @property
+    def streaming(self) -> bool:
+        return self._isStreaming
+
+    # -----
+    # finished
+    # -----
+    @property
+    def finished(self) -> bool:
+        """
+        ``True`` once every sample in the recording has been read.
+        """
+        if not self._finished and self._position >= len(self._chunk):
+            self._next_chunk()
+        return self._finished
+
+    # -----
+    # name
+    # -----
+    @property
+    def name(self) -> str:
+        """
+        The name of the recorded device, if the recording has it.
+        """
+        return self._metadata.get("name", "unknown")
+
+    # -----
+    # side
+    # -----
+    @property
+    def side(self) -> str:
+        """
+        The side of the recorded device, if the recording has it.
+        """
+        return self._metadata.get("side", "undefined")
+
+    # -----
+    # fieldIndex
+    # -----
+    @property
+    def fieldIndex(self) -> Dict[str, int]:
+        return self._fieldIndex
+
+    # -----
+    # commands
+    # -----
+    @property
+    def commands(self) -> List[Tuple[float, str, tuple]]:
+        """
+        Every captured command, as ``(time, command, values)``, where
+        ``time`` is the time stamp of the latest sample read before the
+        command was issued.
+        """
+        return self._commands
+
+    # -----
+    # stats
+    # -----
+    @property
+    def stats(self) -> dict:
+        """
+        How fast the replay went.
+
+        Returns
+        -------
+        dict
+            ``samples``: the number of samples read; ``seconds``: the
+            wall-clock time since streaming started; ``samplesPerSecond``;
+            and ``speed``: how many times faster than real time the
+            recording was read through.
+        """
+        end = self._stopTime if self._stopTime is not None else perf_counter()
+        seconds = end - self._startTime if self._startTime else 0.0
+        recorded = 0.0
+        if self._latest is not None and self._firstTime is not None:
+            recorded = (float(self._times(self._latest)) - self._firstTime) / 1000
+        return {
+            "samples": self._nSamples,
+            "seconds": seconds,
+            "samplesPerSecond": self._nSamples / seconds if seconds else 0.0,
+            "speed": recorded / seconds if seconds else 0.0,
+        }
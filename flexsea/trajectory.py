@@ -0,0 +1,254 @@
+from time import perf_counter
+from typing import Callable, Dict
+
+import numpy as np
+
+from flexsea.commander import FastCommander
+from flexsea.utilities.scheduling import pin_to_cpu
+from flexsea.utilities.scheduling import set_realtime_priority
+from flexsea.utilities.scheduling import wait_until
+from flexsea.utilities.stats import Histogram
+from flexsea.utilities.stats import RunningStats
+from flexsea.utilities.worker import BackgroundWorker
+
+
+# ============================================
+#              TrajectoryPlayer
+# ============================================
+class TrajectoryPlayer(BackgroundWorker):
+    """
+    Sends an array of setpoints to a device at a fixed rate on a
+    background thread.
+
+    Every setpoint has an absolute deadline, ``start + i / frequency``,
+    so the time spent sending commands and reading data doesn't make
+    the trajectory drift. The thread sleeps until just before each
+    deadline and then polls the clock (see
+    :py:func:`~flexsea.utilities.scheduling.wait_until`). If sending a
+    setpoint runs past one or more of the following deadlines, those
+    setpoints are skipped in favor of the latest one that is due, rather
+    than sent back-to-back to catch up, and counted in
+    :py:attr:`missedDeadlines`.
+
+    For each tick, the commanded value, the measured value (if
+    ``readFunc`` is given), the time it was sent, and how late it was
+    are recorded into arrays that are allocated up front.
+
+    Playing stops at the end of the trajectory, at the first command
+    that fails, or when :py:meth:`stop` is called (see
+    :py:class:`~flexsea.utilities.worker.BackgroundWorker`). The motor
+    is left at the last setpoint sent.
+
+    Normally created by :py:meth:`flexsea.device.Device.start_trajectory`
+    rather than directly.
+
+    Parameters
+    ----------
+    commander : FastCommander
+        Sends the setpoints.
+
+    setpoints : np.ndarray
+        One-dimensional array of setpoints, in the units of the
+        commander's controller.
+
+    frequency : float
+        The rate, in Hz, at which setpoints are sent.
+
+    readFunc : Callable, None, optional
+        Returns the measured value of the commanded channel. Called
+        right after each setpoint is sent.
+
+    priority : int, None, optional
+        If given, the thread tries to switch to real-time scheduling
+        with this priority (see
+        :py:func:`~flexsea.utilities.scheduling.set_realtime_priority`).
+
+    cpu : int, None, optional
+        If given, the thread tries to pin itself to this CPU core.
+
+    spin : float, optional
+        Time, in seconds, spent polling the clock before each deadline
+        instead of sleeping.
+    """
+
+    def __init__(
+        self,
+        commander: FastCommander,
+        setpoints: np.ndarray,
+        frequency: float,
+        readFunc: Callable | None = None,
+        priority: int | None = None,
+        cpu: int | None = None,
+        spin: float = 0.0005,
+    ) -> None:
+        if frequency <= 0:
+            raise ValueError("Error: frequency must be positive.")
+
+        super().__init__("flexsea-trajectory", "Error: trajectory thread failed.")
+
+        self._commander = commander
+        self._setpoints = np.asarray(setpoints, dtype=np.int64).ravel()
+        self._period = 1.0 / frequency
+        self._readFunc = readFunc
+        self._priority = priority
+        self._cpu = cpu
+        self._spin = spin
+
+        nTicks = len(self._setpoints)
+        self._times = np.full(nTicks, np.nan, dtype=np.float64)
+        self._lateness = np.full(nTicks, np.nan, dtype=np.float64)
+        self._measured = np.full(nTicks, np.nan, dtype=np.float64)
+        self._retCodes = np.full(nTicks, -1, dtype=np.int32)
+        self._nTicks: int = 0
+        self._nSent: int = 0
+        self._missedDeadlines: int = 0
+
+        # Lateness is binned in microseconds over one period
+        self._jitter = Histogram(0.0, self._period * 1e6, 50)
+        self._latenessStats = RunningStats()
+
+    # -----
+    # start
+    # -----
+    def start(self) -> None:
+        """
+        Starts playing the trajectory from the beginning.
+        """
+        if self.running:
+            print("Already playing.")
+            return
+        self._nTicks = 0
+        self._nSent = 0
+        self._missedDeadlines = 0
+        # Skipped setpoints keep these values
+        self._times.fill(np.nan)
+        self._lateness.fill(np.nan)
+        self._measured.fill(np.nan)
+        self._retCodes.fill(-1)
+        self._jitter.reset()
+        self._latenessStats.reset()
+        self._start_worker(self._work)
+
+    # -----
+    # _work
+    # -----
+    def _work(self) -> None:
+        if self._priority is not None:
+            set_realtime_priority(self._priority)
+        if self._cpu is not None:
+            pin_to_cpu(self._cpu)
+
+        send = self._commander
+        success = send.success
+        readFunc = self._readFunc
+        period = self._period
+        spin = self._spin
+        setpoints = self._setpoints.tolist()
+        nTicks = len(setpoints)
+
+        start = perf_counter()
+        i = 0
+        while i < nTicks:
+            if self._stopEvent.is_set():
+                return
+
+            now = wait_until(start + i * period, spin)
+
+            # Skip any setpoints whose deadline is a full period or more in
+            # the past and send the latest one that is due instead
+            latest = min(int((now - start) / period), nTicks - 1)
+            if latest > i:
+                self._missedDeadlines += latest - i
+                i = latest
+
+            retCode = send(setpoints[i])
+
+            self._times[i] = now - start
+            self._retCodes[i] = retCode
+            lateness = now - (start + i * period)
+            self._lateness[i] = lateness
+            self._latenessStats.update(lateness)
+            self._jitter.update(lateness * 1e6)
+            self._nTicks = i + 1
+            self._nSent += 1
+
+            if retCode != success:
+                raise RuntimeError(
+                    f"Error: command {i} failed with status code {retCode}."
+                )
+
+            if readFunc is not None:
+                self._measured[i] = readFunc()
+            i += 1
+
+    # -----
+    # nSent
+    # -----
+    @property
+    def nSent(self) -> int:
+        """
+        The number of setpoints sent so far, not counting those skipped
+        because they were overdue.
+        """
+        return self._nSent
+
+    # -----
+    # missedDeadlines
+    # -----
+    @property
+    def missedDeadlines(self) -> int:
+        """
+        The number of setpoints skipped because, by the time they could
+        be sent, the next one was already due. A growing value means
+        sending, or reading the measured value, takes longer than the
+        period.
+        """
+        return self._missedDeadlines
+
+    # -----
+    # jitter
+    # -----
+    @property
+    def jitter(self) -> Histogram:
+        """
+        Histogram of how late, in microseconds, each setpoint was sent.
+        """
+        return self._jitter
+
+    # -----
+    # lateness
+    # -----
+    @property
+    def lateness(self) -> RunningStats:
+        """
+        Statistics of how late, in seconds, each setpoint was sent.
+        """
+        return self._latenessStats
+
+    # -----
+    # results
+    # -----
+    @property
+    def results(self) -> Dict[str, np.ndarray]:
+        """
+        Copies of the per-tick records up to the last setpoint sent.
+
+        Returns
+        -------
+        dict
+            ``time``: when each setpoint was sent, in seconds since the
+            first one; ``commanded``: the setpoints; ``measured``: the
+            measured values (``nan`` if not read); ``lateness``: how
+            late each setpoint was, in seconds; and ``retCode``: the
+            status code of each command. Skipped setpoints have a
+            ``time``, ``measured``, and ``lateness`` of ``nan`` and a
+            ``retCode`` of -1.
+        """
+        n = self._nTicks
+        return {
+            "time": self._times[:n].copy(),
+            "commanded": self._setpoints[:n].copy(),
+            "measured": self._measured[:n].copy(),
+            "lateness": self._lateness[:n].copy(),
+            "retCode": self._retCodes[:n].copy(),
+        }
@@ -1,15 +1,191 @@
 import hashlib
+import json
+import os
 from pathlib import Path
-from typing import List
+from threading import Lock
+from time import perf_counter, time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Tuple
 
-import boto3
-from botocore import UNSIGNED
-from botocore.client import BaseClient, Config
-from botocore.exceptions import ClientError
-from botocore.exceptions import ConnectTimeoutError
-from botocore.exceptions import ProfileNotFound
+import semantic_version as sem
 
+import flexsea.utilities.constants as fxc
 from flexsea.utilities.decorators import check_status_code
+from flexsea.utilities.stats import RunningStats
+
+# Size of the pieces objects are streamed to disk in
+_chunkSize = 1024 * 1024
+
+# Clients shared by every caller, keyed by profile and timeout
+_clients: Dict[Tuple[str | None, int], Any] = {}
+_clientsLock = Lock()
+
+# The manifest of each bucket, keyed by bucket name
+_manifests: Dict[str, "S3Manifest"] = {}
+_manifestsLock = Lock()
+
+# How long each S3 operation took, in seconds, keyed by operation name
+_timings: Dict[str, RunningStats] = {}
+_timingsLock = Lock()
+
+
+# ============================================
+#                load_s3_stack
+# ============================================
+def load_s3_stack() -> SimpleNamespace:
+    """
+    Returns ``boto3`` and the parts of ``botocore`` that ``flexsea``
+    uses: ``UNSIGNED``, ``Config``, and ``exceptions``.
+
+    The S3 stack is slow to import, so rather than importing it at the
+    top of a module, everything that needs it goes through here. That
+    way it is only loaded once something actually talks to S3 and
+    ``import flexsea`` stays fast, e.g., when working offline.
+    """
+    # pylint: disable=import-outside-toplevel
+    import boto3
+    from botocore import UNSIGNED
+    from botocore import exceptions
+    from botocore.config import Config
+
+    return SimpleNamespace(
+        boto3=boto3, UNSIGNED=UNSIGNED, Config=Config, exceptions=exceptions
+    )
+
+
+# ============================================
+#                get_s3_client
+# ============================================
+def get_s3_client(profile: str | None = None, timeout: int = 60) -> Any:
+    """
+    Returns the S3 client for the given profile and timeout, creating
+    it the first time.
+
+    Creating a client resolves credentials and sets up a connection
+    pool, which is slow, so every S3 operation in ``flexsea`` shares
+    one client per profile and timeout. Each client keeps up to
+    ``flexsea.utilities.constants.s3MaxPoolConnections`` connections
+    open, so a batch of downloads reuses connections rather than
+    opening a new one each time. Clients are safe to share between
+    threads. Every operation a client makes is timed (see
+    :py:func:`get_s3_timings`).
+
+    Parameters
+    ----------
+    profile : str, None, optional
+        The name of the profile in the ``~/.aws/credentials`` file. If
+        ``None``, the client is anonymous and can only access public
+        files.
+
+    timeout : int, optional
+        Time, in seconds, spent trying to connect to S3 before an
+        exception is raised.
+
+    Raises
+    ------
+    ValueError
+        If the given profile cannot be found.
+
+    Returns
+    -------
+    BaseClient
+        The shared client.
+    """
+    key = (profile, timeout)
+
+    with _clientsLock:
+        if key not in _clients:
+            s3 = load_s3_stack()
+            config = s3.Config(
+                connect_timeout=timeout,
+                max_pool_connections=fxc.s3MaxPoolConnections,
+            )
+            # https://stackoverflow.com/a/34866092
+            if profile is None:
+                config = config.merge(s3.Config(signature_version=s3.UNSIGNED))
+                session = s3.boto3.session.Session()
+            else:
+                try:
+                    session = s3.boto3.session.Session(profile_name=profile)
+                except s3.exceptions.ProfileNotFound as err:
+                    msg = f"Error: invalid AWS profile `{profile}`"
+                    raise ValueError(msg) from err
+            client = session.client("s3", config=config, region_name="us-east-1")
+            client.meta.events.register("before-call.s3", _start_timer)
+            client.meta.events.register("after-call.s3", _stop_timer)
+            client.meta.events.register("after-call-error.s3", _stop_timer)
+            _clients[key] = client
+
+        return _clients[key]
+
+
+# ============================================
+#              close_s3_clients
+# ============================================
+def close_s3_clients() -> None:
+    """
+    Closes the clients returned by :py:func:`get_s3_client`, e.g.,
+    before forking. New ones are created as needed.
+    """
+    with _clientsLock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+
+
+# ============================================
+#                _start_timer
+# ============================================
+def _start_timer(context: dict, **kwargs) -> None:
+    # pylint: disable=unused-argument
+    context["flexseaStart"] = perf_counter()
+
+
+# ============================================
+#                _stop_timer
+# ============================================
+def _stop_timer(context: dict, event_name: str, **kwargs) -> None:
+    # pylint: disable=unused-argument
+    start = context.pop("flexseaStart", None)
+    if start is None:
+        return
+    elapsed = perf_counter() - start
+    # after-call-error isn't given the operation's model, so the name
+    # comes from the event's, e.g., after-call.s3.HeadObject
+    name = event_name.rsplit(".", 1)[-1]
+    with _timingsLock:
+        if name not in _timings:
+            _timings[name] = RunningStats()
+        _timings[name].update(elapsed)
+
+
+# ============================================
+#               get_s3_timings
+# ============================================
+def get_s3_timings() -> Dict[str, dict]:
+    """
+    Returns how long, in seconds, each kind of S3 operation made
+    through :py:func:`get_s3_client`, e.g., ``HeadObject`` or
+    ``GetObject``, has taken so far, as the statistics listed in
+    :py:meth:`~flexsea.utilities.stats.RunningStats.as_dict`.
+
+    An operation is timed from the request being sent, including
+    retries, to the response being received. For ``GetObject``, that
+    excludes reading the body.
+    """
+    with _timingsLock:
+        return {name: stats.as_dict() for name, stats in _timings.items()}
+
+
+# ============================================
+#              reset_s3_timings
+# ============================================
+def reset_s3_timings() -> None:
+    """
+    Forgets every timing returned by :py:func:`get_s3_timings`.
+    """
+    with _timingsLock:
+        _timings.clear()
 
 
 # ============================================
@@ -51,25 +227,12 @@ def s3_download(
         If a connection to S3 cannot be established within the
         allotted time.
     """
-    # https://stackoverflow.com/a/34866092
-    if profile is None:
-        # pylint: disable=duplicate-code
-        client = boto3.client(
-            "s3",
-            config=Config(signature_version=UNSIGNED, connect_timeout=timeout),
-            region_name="us-east-1",
-        )
-    else:
-        try:
-            session = boto3.Session(profile_name=profile)
-        except ProfileNotFound as err:
-            msg = f"Error: invalid AWS profile `{profile}`"
-            raise ValueError(msg) from err
-        client = session.client("s3", config=Config(connect_timeout=timeout))
+    client = get_s3_client(profile, timeout)
+    errors = load_s3_stack().exceptions
 
     try:
         client.download_file(bucket, obj, dest)
-    except ClientError:
+    except errors.ClientError:
         # If the download fails, one possible reason is because we weren't given a
         # valid object path, but, instead, just a base name, e.g., myfirmware.dfu
         # instead of firmwareBucket/major.minor.patch/device/hw/myfirmware.dfu
@@ -77,9 +240,9 @@ def s3_download(
         obj = s3_find_object(obj, bucket, client)
         try:
             client.download_file(bucket, obj, dest)
-        except ConnectTimeoutError as err:
+        except errors.ConnectTimeoutError as err:
             raise RuntimeError("Could not connect to S3. Timeout.") from err
-    except ConnectTimeoutError as err:
+    except errors.ConnectTimeoutError as err:
         raise RuntimeError("Could not connect to S3. Timeout.") from err
     _validate_download(client, bucket, obj, dest)
     print(f"Downloaded {obj} from {bucket} to {dest}")
@@ -89,13 +252,25 @@ def s3_download(
 #              s3_find_object
 # ============================================
 @check_status_code
-def s3_find_object(fileName: str, bucket: str, client: str) -> str:
+def s3_find_object(
+    fileName: str, bucket: str, client: Any = None, prefix: str = ""
+) -> str:
     """
     Searches the given bucket for the given file.
 
     Returns the full object path if there's only one match. If there
     aren't any matches or there's more than one, we fail.
 
+    The search is a lookup in the bucket's manifest (see
+    :py:func:`get_s3_manifest`) rather than a listing of the bucket.
+    ``fileName`` is either an object's base name, e.g.,
+    ``myfirmware.dfu``, or the end of its path, e.g.,
+    ``hw/myfirmware.dfu``. If nothing matches and the keys starting
+    with ``prefix`` were listed more than
+    ``flexsea.utilities.constants.s3ManifestMissRefresh`` seconds ago,
+    they are listed again and searched again, in case the file was
+    uploaded since.
+
     Parameters
     ----------
     fileName : str
@@ -104,8 +279,14 @@ def s3_find_object(fileName: str, bucket: str, client: str) -> str:
     bucket : str
         The name of the S3 bucket to search.
 
-    client : :py:class:`BaseClient`
-        The object responsible for connecting to S3.
+    client : :py:class:`BaseClient`, None, optional
+        The object responsible for connecting to S3. Defaults to the
+        anonymous client returned by :py:func:`get_s3_client`.
+
+    prefix : str, optional
+        Only objects whose key starts with this are searched, and only
+        they need to be in the manifest. The smaller the part of the
+        bucket this covers, the cheaper the listings.
 
     Raises
     ------
@@ -116,19 +297,13 @@ def s3_find_object(fileName: str, bucket: str, client: str) -> str:
     -------
     str
         The full S3 path to the object.
-
-    Notes
-    -----
-    Paginator use: https://tinyurl.com/4scnuk6c
     """
-    paginator = client.get_paginator("list_objects_v2")
-    pageIterator = paginator.paginate(Bucket=bucket)
-    objects = pageIterator.search(f"Contents[?contains(Key, `{fileName}`)][]")
+    manifest = get_s3_manifest(bucket, client, prefix=prefix)
+    items = manifest.find(fileName, prefix)
+    if not items and manifest.age_of(prefix) > fxc.s3ManifestMissRefresh:
+        manifest = get_s3_manifest(bucket, client, refresh=True, prefix=prefix)
+        items = manifest.find(fileName, prefix)
     # There should only be one match
-    # Objects is a generator, so we have to convert it to a list to check length
-    items = []
-    for item in objects:
-        items.append(item["Key"])
     if len(items) == 0:
         raise FileNotFoundError(f"Could not find: {fileName} in {bucket}")
     if len(items) > 1:
@@ -139,9 +314,7 @@ def s3_find_object(fileName: str, bucket: str, client: str) -> str:
 # ============================================
 #             _validate_download
 # ============================================
-def _validate_download(
-    client: BaseClient, bucket: str, fileObj: str, dest: str
-) -> None:
+def _validate_download(client: Any, bucket: str, fileObj: str, dest: str) -> None:
     """
     Compares the AWS md5 hash to the local md5 hash to make sure the
     files are the same.
@@ -224,39 +397,443 @@ def _validate_download(
     assert localHash == etag
 
 
+# ============================================
+#              download_resumable
+# ============================================
+def download_resumable(
+    client: Any, bucket: str, obj: str, dest: Path, verify: bool = True
+) -> str:
+    """
+    Downloads ``obj`` to ``dest``, picking up where a previous,
+    interrupted attempt left off.
+
+    The object is streamed into ``dest`` with a ``.part`` suffix, which
+    is only renamed to ``dest`` once it is complete and its md5 hash
+    matches S3's, so ``dest`` is never a partial file. If ``dest``
+    already exists and ``verify`` is ``True``, it is checked the same
+    way and downloaded again if it doesn't match.
+
+    Parameters
+    ----------
+    client : BaseClient
+        The S3 client to use. Safe to share between threads.
+
+    bucket : str
+        The name of the bucket ``obj`` resides in.
+
+    obj : str
+        The name of the S3 object.
+
+    dest : Path
+        Where to save the object.
+
+    verify : bool, optional
+        Whether or not to check files that already exist.
+
+    Returns
+    -------
+    str
+        ``cached`` if ``dest`` already existed and ``downloaded``
+        otherwise.
+    """
+    if dest.exists():
+        if not verify or is_current(client, bucket, obj, dest):
+            return "cached"
+        dest.unlink()
+
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    part = dest.with_name(dest.name + ".part")
+    size = client.head_object(Bucket=bucket, Key=obj)["ContentLength"]
+
+    # A previous attempt may have left a complete file that failed the
+    # check, so we try at most twice: resuming, then from scratch
+    for attempt in range(2):
+        offset = part.stat().st_size if part.exists() else 0
+        if offset > size:
+            part.unlink()
+            offset = 0
+        if offset < size:
+            response = client.get_object(
+                Bucket=bucket, Key=obj, Range=f"bytes={offset}-"
+            )
+            with open(part, "ab") as fd:
+                for chunk in response["Body"].iter_chunks(_chunkSize):
+                    fd.write(chunk)
+        try:
+            _validate_download(client, bucket, obj, str(part))
+            break
+        except AssertionError as err:
+            part.unlink()
+            if attempt == 1:
+                raise RuntimeError(f"Error: checksum mismatch for: {obj}") from err
+
+    part.replace(dest)
+    return "downloaded"
+
+
+# ============================================
+#                 is_current
+# ============================================
+def is_current(client: Any, bucket: str, obj: str, dest: Path) -> bool:
+    """
+    Returns whether the local file ``dest`` matches ``obj``, warning
+    if it doesn't.
+
+    Parameters
+    ----------
+    client : :py:class:`BaseClient`
+        The object providing an interface to S3.
+
+    bucket : str
+        The name of the bucket ``obj`` is in.
+
+    obj : str
+        The name of the S3 object.
+
+    dest : Path
+        The local copy of ``obj``, which must exist.
+
+    Returns
+    -------
+    bool
+        ``True`` if the md5 hashes match and ``False`` otherwise.
+    """
+    try:
+        _validate_download(client, bucket, obj, str(dest))
+        return True
+    except AssertionError:
+        print(f"Warning: {dest} does not match {obj}; downloading it again.")
+        return False
+
+
+# ============================================
+#                list_s3_keys
+# ============================================
+def list_s3_keys(bucket: str, client: Any = None, prefix: str = "") -> List[str]:
+    """
+    Returns the key of every object in ``bucket`` starting with
+    ``prefix``, leaving out the empty objects that stand in for
+    directories.
+
+    The bucket is listed as a whole rather than one directory at a
+    time, so it takes one request per thousand keys.
+
+    Parameters
+    ----------
+    bucket : str
+        The name of the bucket to list.
+
+    client : :py:class:`BaseClient`, None, optional
+        The object providing an interface to S3. Defaults to the
+        anonymous client returned by :py:func:`get_s3_client`.
+
+    prefix : str, optional
+        Only keys starting with this are returned.
+
+    Returns
+    -------
+    List[str]
+        The keys.
+    """
+    if client is None:
+        client = get_s3_client()
+    # Paginator use: https://tinyurl.com/4scnuk6c
+    paginator = client.get_paginator("list_objects_v2")
+    keys = []
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        keys.extend(item["Key"] for item in page.get("Contents", []))
+    return [key for key in keys if not key.endswith("/")]
+
+
 # ============================================
 #                get_s3_objects
 # ============================================
 @check_status_code
-def get_s3_objects(bucket: str, client: BaseClient, prefix: str = "") -> List:
+def get_s3_objects(bucket: str, client: Any = None, prefix: str = "") -> List:
     """
-    Recursively loops over all directories in a bucket and returns a
-    list of files.
+    Returns a list of the files in a bucket.
 
     Parameters
     ----------
     bucket : str
         The name of the bucket we're getting files from.
 
-    client : :py:class:`BaseClient`
-        The object providing an interface to S3.
+    client : :py:class:`BaseClient`, None, optional
+        The object providing an interface to S3. Defaults to the
+        anonymous client returned by :py:func:`get_s3_client`.
 
     prefix : str
-        The directory we're looping over. If `""`, then we get the
-        top-level directories.
+        Only files whose key starts with this are returned. If ``""``,
+        every file in the bucket is.
 
     Returns
     -------
     List[str]
         A list of all the objects in the bucket.
     """
-    objectList = []
-    objects = client.list_objects_v2(Bucket=bucket, Delimiter="/", Prefix=prefix)
+    return list_s3_keys(bucket, client, prefix)
 
-    if "CommonPrefixes" in objects:
-        for pre in objects["CommonPrefixes"]:
-            objectList += get_s3_objects(bucket, client, pre["Prefix"])
 
-    if "Contents" in objects:
-        return objectList + [obj["Key"] for obj in objects["Contents"][1:]]
-    return objectList
+# ============================================
+#                 S3Manifest
+# ============================================
+class S3Manifest:
+    """
+    The keys of the objects in the listed parts of a bucket, indexed by
+    base name and by firmware version and operating system, so that
+    finding an object is a dictionary lookup rather than a listing of
+    the bucket.
+
+    Normally obtained from :py:func:`get_s3_manifest` rather than
+    created directly.
+
+    Parameters
+    ----------
+    bucket : str
+        The name of the bucket.
+
+    keys : List[str]
+        The key of every object in the listed parts of the bucket.
+
+    listed : Dict[str, float], None, optional
+        When the keys starting with each of these prefixes were last
+        listed, as returned by ``time.time``. ``""`` stands for the
+        whole bucket. Defaults to the whole bucket having been listed
+        now.
+    """
+
+    def __init__(
+        self, bucket: str, keys: List[str], listed: Dict[str, float] | None = None
+    ) -> None:
+        self.bucket = bucket
+        self.keys = list(keys)
+        self.listed = {"": time()} if listed is None else dict(listed)
+
+        self._keySet = set(self.keys)
+        self._byName: Dict[str, List[str]] = {}
+        self._byVersion: Dict[str, List[str]] = {}
+        self._byVersionOs: Dict[Tuple[str, str], List[str]] = {}
+
+        for key in self.keys:
+            parts = key.split("/")
+            self._byName.setdefault(parts[-1], []).append(key)
+            # Objects for a given version are under a directory named after
+            # it, e.g., precompiled_c_libs/12.0.0/linux_64bit/libfx.so
+            for i, part in enumerate(parts[:-1]):
+                if sem.validate(part):
+                    self._byVersion.setdefault(part, []).append(key)
+                    if i + 2 < len(parts) and parts[i + 1] in fxc.libFiles:
+                        versionOs = (part, parts[i + 1])
+                        self._byVersionOs.setdefault(versionOs, []).append(key)
+                    break
+
+    # -----
+    # find
+    # -----
+    def find(self, fileName: str, prefix: str = "") -> List[str]:
+        """
+        Returns the keys starting with ``prefix`` whose base name is
+        ``fileName`` or, if ``fileName`` has a ``/`` in it, that are or
+        end with ``fileName``.
+        """
+        if "/" not in fileName:
+            keys = self._byName.get(fileName, [])
+        elif fileName in self._keySet:
+            keys = [fileName]
+        else:
+            baseName = fileName.rsplit("/", 1)[1]
+            keys = [
+                key
+                for key in self._byName.get(baseName, [])
+                if key.endswith("/" + fileName.lstrip("/"))
+            ]
+        return [key for key in keys if key.startswith(prefix)]
+
+    # -----
+    # for_version
+    # -----
+    def for_version(self, version: str, opSys: str | None = None) -> List[str]:
+        """
+        Returns the keys of the objects for the given firmware version
+        and, if given, operating system, e.g., ``linux_64bit``.
+        """
+        if opSys is None:
+            return list(self._byVersion.get(str(version), []))
+        return list(self._byVersionOs.get((str(version), opSys), []))
+
+    # -----
+    # versions
+    # -----
+    def versions(self, prefix: str = "") -> List[str]:
+        """
+        Returns the firmware versions with objects whose key starts
+        with ``prefix``, e.g., ``precompiled_c_libs``, in order.
+        """
+        versions = [
+            version
+            for version, keys in self._byVersion.items()
+            if any(key.startswith(prefix) for key in keys)
+        ]
+        return sorted(versions, key=sem.Version)
+
+    # -----
+    # age_of
+    # -----
+    def age_of(self, prefix: str = "") -> float:
+        """
+        Time, in seconds, since the keys starting with ``prefix`` were
+        listed, either on their own or as part of a larger listing.
+        Infinite if they never were.
+        """
+        listed = [t for p, t in self.listed.items() if prefix.startswith(p)]
+        return time() - max(listed) if listed else float("inf")
+
+    # -----
+    # with_prefix
+    # -----
+    def with_prefix(self, prefix: str, keys: List[str]) -> "S3Manifest":
+        """
+        Returns a copy of the manifest in which the keys starting with
+        ``prefix`` are replaced by ``keys``, as just listed.
+        """
+        kept = [key for key in self.keys if not key.startswith(prefix)]
+        listed = {p: t for p, t in self.listed.items() if not p.startswith(prefix)}
+        listed[prefix] = time()
+        return S3Manifest(self.bucket, kept + list(keys), listed)
+
+    # -----
+    # save
+    # -----
+    def save(self, fileName: Path) -> None:
+        """
+        Writes the manifest to ``fileName``, atomically, so that another
+        process never reads a half-written manifest.
+        """
+        fileName.parent.mkdir(parents=True, exist_ok=True)
+        tmpFile = fileName.with_suffix(f".{os.getpid()}.tmp")
+        info = {"bucket": self.bucket, "listed": self.listed, "keys": self.keys}
+        try:
+            with open(tmpFile, "w", encoding="utf-8") as fd:
+                json.dump(info, fd)
+            os.replace(tmpFile, fileName)
+        except OSError as err:
+            print(f"Warning: could not save the manifest of {self.bucket}: {err}")
+
+    # -----
+    # load
+    # -----
+    @classmethod
+    def load(cls, fileName: Path) -> "S3Manifest":
+        """
+        Reads a manifest written by :py:meth:`save`.
+        """
+        with open(fileName, "r", encoding="utf-8") as fd:
+            info = json.load(fd)
+        return cls(info["bucket"], info["keys"], info["listed"])
+
+
+# ============================================
+#              get_s3_manifest
+# ============================================
+@check_status_code
+def get_s3_manifest(
+    bucket: str,
+    client: Any = None,
+    maxAge: float = fxc.s3ManifestTtl,
+    refresh: bool = False,
+    prefix: str = "",
+) -> S3Manifest:
+    """
+    Returns the manifest of ``bucket``: an index of its keys, covering
+    at least the ones starting with ``prefix``.
+
+    Manifests are kept in memory and saved in ``~/.dephy``, as JSON
+    rather than YAML since they can hold many keys. Only the keys
+    starting with ``prefix`` are listed, and only if the manifest
+    doesn't have them, if they were listed more than ``maxAge`` seconds
+    ago, or if ``refresh`` is ``True``. Other parts of the bucket are
+    kept as they are. If the bucket can't be reached, out-of-date keys
+    are used, with a warning.
+
+    Parameters
+    ----------
+    bucket : str
+        The name of the bucket.
+
+    client : :py:class:`BaseClient`, None, optional
+        Used to list the bucket. Defaults to the anonymous client
+        returned by :py:func:`get_s3_client`.
+
+    maxAge : float, optional
+        Age, in seconds, after which the keys starting with ``prefix``
+        are listed again.
+
+    refresh : bool, optional
+        If ``True``, the keys starting with ``prefix`` are listed again
+        regardless of their age.
+
+    prefix : str, optional
+        The part of the bucket needed. The whole bucket if ``""``.
+
+    Raises
+    ------
+    EndpointConnectionError, ConnectTimeoutError
+        If the keys starting with ``prefix`` need listing, S3 cannot be
+        reached, and they were never listed before.
+
+    Returns
+    -------
+    S3Manifest
+        The manifest.
+    """
+    fileName = fxc.s3ManifestsPath.joinpath(f"{bucket}.json")
+
+    with _manifestsLock:
+        manifest = _load_manifest(bucket, fileName)
+        age = manifest.age_of(prefix) if manifest is not None else float("inf")
+        if not refresh and age <= maxAge:
+            return manifest
+
+    # Listing can take a while, so other threads can use the manifest
+    # in the meantime
+    errors = load_s3_stack().exceptions
+    try:
+        keys = list_s3_keys(bucket, client, prefix)
+    except (errors.EndpointConnectionError, errors.ConnectTimeoutError) as err:
+        if age == float("inf"):
+            raise err
+        days = int(age // 86400)
+        where = f"{bucket}/{prefix}" if prefix else bucket
+        msg = f"Warning: unable to access S3; using the manifest of {where} "
+        msg += f"from {days} days ago."
+        print(msg)
+        return manifest
+
+    with _manifestsLock:
+        # Another thread may have updated the manifest while we listed
+        manifest = _load_manifest(bucket, fileName)
+        if manifest is None:
+            manifest = S3Manifest(bucket, keys, {prefix: time()})
+        else:
+            manifest = manifest.with_prefix(prefix, keys)
+        manifest.save(fileName)
+        _manifests[bucket] = manifest
+
+    return manifest
+
+
+# ============================================
+#               _load_manifest
+# ============================================
+def _load_manifest(bucket: str, fileName: Path) -> S3Manifest | None:
+    """
+    Returns the manifest of ``bucket`` held in memory or, failing that,
+    saved in ``fileName``, or ``None`` if there's neither. Must be
+    called with ``_manifestsLock`` held.
+    """
+    if bucket not in _manifests:
+        try:
+            _manifests[bucket] = S3Manifest.load(fileName)
+        except (FileNotFoundError, ValueError, KeyError):
+            return None
+    return _manifests[bucket]
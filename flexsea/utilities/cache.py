@@ -0,0 +1,375 @@
+from contextlib import contextmanager
+import os
+from pathlib import Path
+import shutil
+import socket
+import threading
+import zipfile
+from time import sleep, time
+from typing import Any, Iterator, List
+
+import flexsea.utilities.constants as fxc
+from flexsea.utilities.aws import (
+    download_resumable,
+    get_s3_client,
+    is_current,
+    load_s3_stack,
+    s3_find_object,
+)
+from flexsea.utilities.decorators import check_status_code
+
+# The read-only cache looked in before the per-user one, if any
+_sharedCacheDir: Path | None = fxc.sharedCachePath
+
+
+# ============================================
+#            set_shared_cache_dir
+# ============================================
+def set_shared_cache_dir(path: str | Path | None) -> None:
+    """
+    Sets the read-only, system-wide directory that is looked in for
+    libraries and device specs before ``~/.dephy``, overriding the
+    ``FLEXSEA_SHARED_CACHE`` environment variable. ``None`` turns it
+    off.
+
+    The directory is never written to by ``flexsea`` when devices are
+    created. Populate it with ``flexsea prefetch --cache-dir``.
+    """
+    global _sharedCacheDir  # pylint: disable=global-statement
+    _sharedCacheDir = Path(path).expanduser().absolute() if path else None
+
+
+# ============================================
+#                 cache_dirs
+# ============================================
+def cache_dirs() -> List[Path]:
+    """
+    Returns the directories searched for cached files, in order: the
+    shared directory, if set, then ``~/.dephy``.
+    """
+    dirs = [fxc.dephyPath]
+    if _sharedCacheDir is not None and _sharedCacheDir != fxc.dephyPath:
+        dirs.insert(0, _sharedCacheDir)
+    return dirs
+
+
+# ============================================
+#               find_artifact
+# ============================================
+def find_artifact(relativePath: str | Path) -> Path | None:
+    """
+    Returns the first of the :py:func:`cache_dirs` holding
+    ``relativePath``, joined with it, or ``None`` if none of them does.
+    """
+    for cacheDir in cache_dirs():
+        path = cacheDir.joinpath(relativePath)
+        if path.exists():
+            return path
+    return None
+
+
+# ============================================
+#                get_artifact
+# ============================================
+@check_status_code
+def get_artifact(
+    obj: str, relativePath: str | Path, timeout: int = 60, offline: bool = False
+) -> Path:
+    """
+    Returns the path to a cached copy of the given object from the
+    public bucket, downloading it into ``~/.dephy`` if no cache has it.
+
+    The lookup goes through the shared directory (see
+    :py:func:`set_shared_cache_dir`), then ``~/.dephy``, then S3. If
+    ``obj`` isn't in the bucket, e.g., because it's only a base name,
+    the bucket is searched for it (see
+    :py:func:`~flexsea.utilities.aws.s3_find_object`). If
+    several processes miss at the same time, only one downloads the
+    object and the others wait for it (see :py:func:`store_artifact`).
+
+    Parameters
+    ----------
+    obj : str
+        The name of the S3 object.
+
+    relativePath : str, Path
+        Where the object goes, relative to the cache directories.
+
+    timeout : int, optional
+        Time, in seconds, spent trying to connect to S3 before an
+        exception is raised.
+
+    offline : bool, optional
+        If ``True``, S3 is never contacted.
+
+    Raises
+    ------
+    FileNotFoundError
+        If ``offline`` is ``True`` and no cache has the object, or if
+        ``obj`` isn't in the bucket and searching for it finds no
+        single match.
+
+    Returns
+    -------
+    Path
+        The cached file.
+    """
+    path = find_artifact(relativePath)
+    if path is not None:
+        return path
+    if offline:
+        raise FileNotFoundError(f"Error: no cached file: {relativePath}")
+
+    client = get_s3_client(None, timeout)
+    bucket = fxc.dephyPublicFilesBucket
+
+    try:
+        status = store_artifact(client, bucket, obj, relativePath, fxc.dephyPath, False)
+    except load_s3_stack().exceptions.ClientError:
+        # If the download fails, one possible reason is because we weren't given a
+        # valid object path, but, instead, just a base name, e.g., myfirmware.dfu
+        # instead of firmwareBucket/major.minor.patch/device/hw/myfirmware.dfu
+        # In this case we want to search the given bucket for the file
+        obj = s3_find_object(obj, bucket, client)
+        status = store_artifact(client, bucket, obj, relativePath, fxc.dephyPath, False)
+
+    path = fxc.dephyPath.joinpath(relativePath)
+    if status == "downloaded":
+        print(f"Downloaded {obj} from {bucket} to {path}")
+    return path
+
+
+# ============================================
+#               store_artifact
+# ============================================
+def store_artifact(
+    client: Any,
+    bucket: str,
+    obj: str,
+    relativePath: str | Path,
+    cacheDir: Path,
+    verify: bool = True,
+) -> str:
+    """
+    Makes sure ``cacheDir`` holds ``obj`` at ``relativePath``.
+
+    Files are content-addressed: the object is downloaded once into
+    ``cacheDir/objects``, named after its S3 ETag, and ``relativePath``
+    is a hard link to it (or a copy, where links aren't supported).
+    Objects that are identical under several names, e.g., a library
+    shared by several firmware versions, are only downloaded once, and
+    a copy already in the shared cache is reused.
+
+    Every file appears atomically, so a reader never sees a partial
+    file, and a lock file next to ``relativePath`` makes concurrent
+    callers, in this process or others, wait for one download rather
+    than each doing their own.
+
+    Parameters
+    ----------
+    client : BaseClient
+        The S3 client to use.
+
+    bucket : str
+        The name of the bucket ``obj`` resides in.
+
+    obj : str
+        The name of the S3 object.
+
+    relativePath : str, Path
+        Where the object goes, relative to ``cacheDir``.
+
+    cacheDir : Path
+        The cache directory to populate.
+
+    verify : bool, optional
+        Whether or not to check a file that is already present against
+        S3's md5 hash, downloading it again if it doesn't match.
+
+    Returns
+    -------
+    str
+        ``cached`` if nothing had to be downloaded and ``downloaded``
+        otherwise.
+    """
+    dest = cacheDir.joinpath(relativePath)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+
+    with file_lock(dest):
+        # Someone else may have finished while we waited for the lock
+        if dest.exists():
+            if not verify or is_current(client, bucket, obj, dest):
+                return "cached"
+            dest.unlink()
+
+        etag = client.head_object(Bucket=bucket, Key=obj)["ETag"].strip('"')
+        blobName = Path("objects", etag)
+        blob = _find_blob(blobName, cacheDir)
+        status = "cached"
+        if blob is None:
+            blob = cacheDir.joinpath(blobName)
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            with file_lock(blob):
+                status = download_resumable(client, bucket, obj, blob, verify)
+        _link(blob, dest)
+
+    return status
+
+
+# ============================================
+#              extract_artifact
+# ============================================
+def extract_artifact(archive: Path, cacheDir: Path | None = None) -> Path:
+    """
+    Returns the directory ``archive``, a zip file, is extracted to,
+    named after it, extracting it first if need be.
+
+    The archive is extracted next to itself if it's in ``cacheDir``
+    (``~/.dephy`` by default). An archive in another of the
+    :py:func:`cache_dirs`, i.e., the read-only shared one, is extracted
+    into ``cacheDir`` at the same relative path, unless it was already
+    extracted where it is.
+
+    The archive is extracted into a temporary directory that is then
+    renamed, so the directory is either complete or missing.
+    """
+    cacheDir = cacheDir if cacheDir is not None else fxc.dephyPath
+    extractedDest = archive.with_suffix("")
+    if extractedDest.exists():
+        return extractedDest
+
+    for directory in cache_dirs():
+        if directory != cacheDir and archive.is_relative_to(directory):
+            extractedDest = cacheDir.joinpath(archive.relative_to(directory))
+            extractedDest = extractedDest.with_suffix("")
+            break
+    if extractedDest.exists():
+        return extractedDest
+
+    extractedDest.parent.mkdir(parents=True, exist_ok=True)
+    with file_lock(extractedDest):
+        if not extractedDest.exists():
+            tmpDir = extractedDest.with_name(
+                f".{extractedDest.name}.{os.getpid()}.{threading.get_ident()}"
+            )
+            with zipfile.ZipFile(archive, "r") as zipFile:
+                zipFile.extractall(tmpDir)
+            os.replace(tmpDir, extractedDest)
+
+    return extractedDest
+
+
+# ============================================
+#                _find_blob
+# ============================================
+def _find_blob(blobName: Path, cacheDir: Path) -> Path | None:
+    """
+    Returns the copy of the content-addressed file ``blobName`` in
+    ``cacheDir`` or, failing that, any of the :py:func:`cache_dirs`.
+    """
+    for directory in [cacheDir] + cache_dirs():
+        blob = directory.joinpath(blobName)
+        if blob.exists():
+            return blob
+    return None
+
+
+# ============================================
+#                   _link
+# ============================================
+def _link(source: Path, dest: Path) -> None:
+    """
+    Atomically makes ``dest`` a hard link to, or a copy of, ``source``.
+    """
+    tmpFile = dest.with_name(f".{dest.name}.{os.getpid()}.{threading.get_ident()}")
+    try:
+        os.link(source, tmpFile)
+    except OSError:
+        shutil.copyfile(source, tmpFile)
+    os.replace(tmpFile, dest)
+
+
+# ============================================
+#                 file_lock
+# ============================================
+@contextmanager
+def file_lock(
+    path: Path, staleAfter: float = 600.0, pollPeriod: float = 0.05
+) -> Iterator[None]:
+    """
+    Holds an exclusive lock on ``path`` for the duration of the
+    ``with`` block, across threads and processes.
+
+    The lock is a file next to ``path``, created with ``O_EXCL`` so
+    that it works the same on every operating system and file system.
+    It holds the host name and process ID of its owner, and, for as
+    long as it's held, its modification time is refreshed every
+    ``staleAfter / 4`` seconds. A lock that hasn't been refreshed for
+    ``staleAfter`` seconds, or whose owner is a process on this host
+    that no longer exists, was left behind by a process that died and
+    is broken.
+    """
+    lockFile = path.with_name(path.name + ".lock")
+    while True:
+        try:
+            fd = os.open(lockFile, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                stale = time() - lockFile.stat().st_mtime > staleAfter
+                if stale or _lock_owner_died(lockFile):
+                    lockFile.unlink()
+                    continue
+            except FileNotFoundError:
+                continue
+            sleep(pollPeriod)
+    os.write(fd, f"{socket.gethostname()}:{os.getpid()}".encode("utf-8"))
+    os.close(fd)
+
+    # Keeps the lock from looking stale during long downloads
+    released = threading.Event()
+    heartbeat = threading.Thread(
+        target=_refresh_lock, args=(lockFile, staleAfter / 4, released), daemon=True
+    )
+    heartbeat.start()
+    try:
+        yield
+    finally:
+        released.set()
+        heartbeat.join()
+        lockFile.unlink(missing_ok=True)
+
+
+# ============================================
+#               _refresh_lock
+# ============================================
+def _refresh_lock(lockFile: Path, period: float, released: threading.Event) -> None:
+    while not released.wait(period):
+        try:
+            os.utime(lockFile)
+        except OSError:
+            return
+
+
+# ============================================
+#              _lock_owner_died
+# ============================================
+def _lock_owner_died(lockFile: Path) -> bool:
+    """
+    Returns ``True`` if the process that created ``lockFile`` runs on
+    this host and no longer exists. Whether a process exists can only
+    be checked without side effects on POSIX systems, so this is always
+    ``False`` on Windows.
+    """
+    if os.name == "nt":
+        return False
+    host, _, pid = lockFile.read_text(encoding="utf-8").rpartition(":")
+    if host != socket.gethostname() or not pid.isdigit():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        pass
+    return False
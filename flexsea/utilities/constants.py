@@ -1,4 +1,5 @@
 import ctypes as c
+import os
 from pathlib import Path
 
 import semantic_version as sem
@@ -11,8 +12,25 @@ import semantic_version as sem
 # specs, api specs, and bootloading tools)
 dephyPath = Path.home().joinpath(".dephy").expanduser().absolute()
 
+# A read-only directory with the same layout as dephyPath, shared by every
+# user of the machine, that is looked in first. Set with the
+# FLEXSEA_SHARED_CACHE environment variable
+sharedCachePath = (
+    Path(os.environ["FLEXSEA_SHARED_CACHE"]).expanduser().absolute()
+    if os.environ.get("FLEXSEA_SHARED_CACHE")
+    else None
+)
+
 firmwareVersionCacheFile = dephyPath.joinpath("available_versions.yaml")
 
+# Age, in seconds, after which the cached list of available firmware versions
+# is refreshed from S3 when validating a version
+firmwareVersionCacheTtl = 24 * 60 * 60
+
+# The names of the data fields reported by each device, keyed by device
+# name, side, firmware version, and library version
+fieldLabelsCacheFile = dephyPath.joinpath("field_labels.yaml")
+
 # libsDir is the name of the directory (mirrored on S3), whereas
 # libsPath is the full path to that directory on the local file system
 libsDir = "precompiled_c_libs"
@@ -42,6 +60,22 @@ legacyDeviceSpecsPath = dephyPath.joinpath(legacyDeviceSpecsDir)
 # specs, api specs, and bootloader tools
 dephyPublicFilesBucket = "dephy-public-files"
 
+# The number of connections each S3 client keeps open for reuse, which is
+# also the number of requests it can make at once
+s3MaxPoolConnections = 32
+
+# The keys of each bucket we've listed, indexed so that objects can be found
+# without listing the bucket again. See flexsea.utilities.aws.get_s3_manifest
+s3ManifestsPath = dephyPath.joinpath("s3_manifests")
+
+# Age, in seconds, after which a part of a bucket's manifest is listed again
+s3ManifestTtl = 24 * 60 * 60
+
+# If an object isn't in the part of a manifest listed at least this long
+# ago, in seconds, that part is listed again in case the object was
+# uploaded since
+s3ManifestMissRefresh = 5 * 60
+
 # On Windows, several dll files from mingw are needed in order for the
 # library to work correctly
 winDllsDir = "win_dlls"
@@ -81,6 +115,15 @@ controllers = {
     "none": c.c_int(4),
 }
 
+# The field measured by each controller, used to record what the motor
+# actually did while playing a trajectory
+controllerFields = {
+    "position": "mot_ang",
+    "voltage": "mot_volt",
+    "current": "mot_cur",
+    "impedance": "mot_ang",
+}
+
 
 # ============================================
 #              Training States
@@ -1,7 +1,6 @@
 from functools import wraps
 from typing import Any, Callable
 
-from botocore.exceptions import ClientError
 from semantic_version import Version
 
 
@@ -149,6 +148,11 @@ def validate(func: Callable) -> Callable:
         retCode = func(*args, **kwargs)
         # pylint: disable-next=protected-access
         if retCode != args[0]._SUCCESS.value:
+            # Gives devices that track their status locally a chance to
+            # notice that they were disconnected
+            handle_failure = getattr(args[0], "_handle_failure", None)
+            if handle_failure is not None:
+                handle_failure(retCode)
             raise RuntimeError(f"Command: {func.__name__} failed.")
         return retCode
 
@@ -228,6 +232,10 @@ def check_status_code(func: Callable) -> Callable:
 
     @wraps(func)
     def check_status_wrapper(*args, **kwargs) -> Any:
+        # Imported here so that decorating a function doesn't load botocore
+        # pylint: disable-next=import-outside-toplevel
+        from botocore.exceptions import ClientError
+
         try:
             return func(*args, **kwargs)
         # boto3 raises a client error when we either try to download something
@@ -1,18 +1,15 @@
 import ctypes as c
 import sys
-from typing import List
-
-import boto3
-from botocore import UNSIGNED
-from botocore.client import Config
-from botocore.exceptions import ConnectTimeoutError
-from botocore.exceptions import EndpointConnectionError
-import pendulum
+from time import time
+from typing import List, Tuple
+
 from semantic_version import SimpleSpec
 from semantic_version import Version
 import yaml
 
-from flexsea.utilities.aws import get_s3_objects
+from flexsea.utilities.aws import get_s3_client
+from flexsea.utilities.aws import get_s3_manifest
+from flexsea.utilities.aws import load_s3_stack
 import flexsea.utilities.constants as fxc
 
 
@@ -20,12 +17,21 @@ import flexsea.utilities.constants as fxc
 #      validate_given_firmware_version
 # ============================================
 def validate_given_firmware_version(
-    firmwareVersion: str, interactive: bool, timeout=60
+    firmwareVersion: str,
+    interactive: bool,
+    timeout=60,
+    offline: bool = False,
+    cacheTtl: float = fxc.firmwareVersionCacheTtl,
 ) -> Version:
     """
     Makes sure that the given ``firmwareVersion`` is known to
     ``flexsea``.
 
+    The cached list of available versions is consulted first. S3 is
+    only queried if the cache is older than ``cacheTtl``, if a full
+    ``X.Y.Z`` ``firmwareVersion`` isn't in the cache, or if the cache
+    has no version matching a partial one.
+
     Parameters
     ----------
     firmwareVersion : str
@@ -41,6 +47,14 @@ def validate_given_firmware_version(
         Time, in seconds, spent trying to connect to S3 before an
         exception is raised.
 
+    offline : bool, optional
+        If ``True``, only the cached list of versions is used and S3 is
+        never contacted.
+
+    cacheTtl : float, optional
+        Age, in seconds, after which the cached list of versions is
+        considered stale.
+
     Raises
     ------
     ValueError
@@ -57,7 +71,16 @@ def validate_given_firmware_version(
         The Version object representing the valid semantic version
         string.
     """
-    availableVersions = get_available_firmware_versions(timeout)
+    if offline:
+        availableVersions = get_available_firmware_versions(offline=True)
+    else:
+        try:
+            availableVersions, age = _load_cached_firmware_versions()
+        except FileNotFoundError:
+            availableVersions, age = [], None
+        stale = age is None or age > cacheTtl
+        if stale or not _is_resolvable(firmwareVersion, availableVersions):
+            availableVersions = get_available_firmware_versions(timeout)
 
     if firmwareVersion in availableVersions:
         return Version(firmwareVersion)
@@ -85,10 +108,40 @@ def validate_given_firmware_version(
     return latestVer
 
 
+# ============================================
+#               _is_resolvable
+# ============================================
+def _is_resolvable(firmwareVersion: str, versionList: List[str]) -> bool:
+    """
+    Whether or not ``firmwareVersion`` can be matched to a version in
+    ``versionList`` without consulting S3.
+
+    A full ``X.Y.Z`` version is only resolvable if it's in the list,
+    since it may have been released after the list was cached. A partial
+    version, such as ``X`` or ``X.Y``, resolves to the closest cached
+    version.
+    """
+    if firmwareVersion in versionList:
+        return True
+    try:
+        Version(firmwareVersion)
+    except ValueError:
+        pass
+    else:
+        return False
+    try:
+        get_closest_version(Version.coerce(firmwareVersion), versionList)
+    except (RuntimeError, ValueError):
+        return False
+    return True
+
+
 # ============================================
 #       get_available_firmware_versions
 # ============================================
-def get_available_firmware_versions(timeout=60) -> List[str]:
+def get_available_firmware_versions(
+    timeout=60, offline: bool = False, cacheTtl: float = 0
+) -> List[str]:
     """
     Returns a list of firmware versions known to ``flexsea``.
 
@@ -106,6 +159,15 @@ def get_available_firmware_versions(timeout=60) -> List[str]:
         Time, in seconds, spent trying to connect to S3 before an
         exception is raised.
 
+    offline : bool, optional
+        If ``True``, the cached list of versions is returned without
+        contacting S3.
+
+    cacheTtl : float, optional
+        If the cached list of versions is younger than this many
+        seconds, it is returned without contacting S3. The default of
+        0 always refreshes the cache.
+
     Raises
     ------
     FileNotFoundError
@@ -117,43 +179,89 @@ def get_available_firmware_versions(timeout=60) -> List[str]:
     List[str]
         List of known semantic version strings.
     """
-    # pylint: disable=duplicate-code
-    client = boto3.client(
-        "s3",
-        config=Config(signature_version=UNSIGNED, connect_timeout=timeout),
-        region_name="us-east-1",
-    )
+    if offline:
+        libs, _ = _load_cached_firmware_versions(warn=True)
+        return libs
+
+    if cacheTtl > 0:
+        try:
+            libs, age = _load_cached_firmware_versions()
+        except FileNotFoundError:
+            pass
+        else:
+            if age <= cacheTtl:
+                return libs
+
+    # pylint: disable-next=import-outside-toplevel
+    import pendulum
+
+    client = get_s3_client(None, timeout)
+    errors = load_s3_stack().exceptions
 
+    # Only the libraries' part of the bucket's manifest is listed again
+    prefix = f"{fxc.libsDir}/"
     try:
-        objs = get_s3_objects(fxc.dephyPublicFilesBucket, client, prefix=fxc.libsDir)
-    except (EndpointConnectionError, ConnectTimeoutError):
+        manifest = get_s3_manifest(
+            fxc.dephyPublicFilesBucket, client, refresh=True, prefix=prefix
+        )
+    except (errors.EndpointConnectionError, errors.ConnectTimeoutError):
+        # Only raised if the libraries were never listed, otherwise the
+        # older manifest is used
         print("Warning: unable to access S3 to obtain updated available versions.")
-        try:
-            with open(fxc.firmwareVersionCacheFile, "r", encoding="utf-8") as fd:
-                data = yaml.safe_load(fd)
-        except FileNotFoundError as err:
+        libs, age = _load_cached_firmware_versions(warn=True)
+    else:
+        libs = manifest.versions(prefix)
+        # If S3 couldn't be reached, the manifest is an older one
+        age = manifest.age_of(prefix)
+
+        timestamp = time() - age
+        with open(fxc.firmwareVersionCacheFile, "w", encoding="utf-8") as fd:
+            date = str(pendulum.from_timestamp(timestamp))
+            cache = {"date": date, "timestamp": timestamp, "versions": libs}
+            yaml.safe_dump(cache, fd)
+
+    days = int(age // 86400)
+    if days > 7:
+        print(f"Warning: using firmware version information from: {days} days ago.")
+        print("To update, connect to the internet and re-run this function.")
+
+    return libs
+
+
+# ============================================
+#       _load_cached_firmware_versions
+# ============================================
+def _load_cached_firmware_versions(warn: bool = False) -> Tuple[List[str], float]:
+    """
+    Returns the cached list of versions and the age of the cache in
+    seconds. If ``warn`` is ``True``, a missing cache is reported to the
+    user before raising.
+
+    Raises
+    ------
+    FileNotFoundError
+        If there is no cache file.
+    """
+    try:
+        with open(fxc.firmwareVersionCacheFile, "r", encoding="utf-8") as fd:
+            data = yaml.safe_load(fd)
+    except FileNotFoundError as err:
+        if warn:
             msg = "Error: no firmware version cache file found. "
             msg += "Try connecting to the internet and running this function again."
             print(msg)
-            raise err
-        libs = data["versions"]
-        days = (pendulum.today() - pendulum.parse(data["date"])).days
-        if days > 7:
-            print(f"Warning: using firmware version information from: {days} days ago.")
-            print("To update, connect to the internet and re-run this function.")
+        raise err
+
+    if "timestamp" in data:
+        age = time() - data["timestamp"]
     else:
-        libs = set()
-        for obj in objs:
-            lib = obj.split("/")[1]
-            libs.add(lib)
-        libs = sorted(list(libs))
+        # Older caches only store the date, which parses as midnight
+        # pylint: disable-next=import-outside-toplevel
+        import pendulum
 
-        with open(fxc.firmwareVersionCacheFile, "w", encoding="utf-8") as fd:
-            yaml.safe_dump({"date": str(pendulum.today()), "versions": libs}, fd)
-    finally:
-        client.close()
+        age = (pendulum.now() - pendulum.parse(str(data["date"]))).total_seconds()
 
-    return libs
+    return data["versions"], age
 
 
 # ============================================
@@ -0,0 +1,172 @@
+import ctypes as c
+import os
+from threading import Lock
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import yaml
+
+import flexsea.utilities.constants as fxc
+from flexsea.utilities.cache import file_lock
+
+# Labels read this session, on top of those loaded from the cache file
+_labelCache: Dict[str, List[str]] | None = None
+_labelCacheLock = Lock()
+
+
+# ============================================
+#               label_cache_key
+# ============================================
+def label_cache_key(
+    deviceName: str, side: str, firmwareVersion: str, libVersion: str
+) -> str:
+    """
+    Returns the key under which the field labels of a device are cached.
+    A device's labels only depend on these.
+    """
+    return f"{deviceName}/{side}/{firmwareVersion}/{libVersion}"
+
+
+# ============================================
+#                 _load_cache
+# ============================================
+def _load_cache() -> Dict[str, List[str]]:
+    """
+    Returns the in-memory cache, loading it from disk the first time.
+    Must be called with the lock held.
+    """
+    global _labelCache  # pylint: disable=global-statement
+
+    if _labelCache is None:
+        _labelCache = _read_cache_file()
+
+    return _labelCache
+
+
+# ============================================
+#              _read_cache_file
+# ============================================
+def _read_cache_file() -> Dict[str, List[str]]:
+    try:
+        with open(fxc.fieldLabelsCacheFile, "r", encoding="utf-8") as fd:
+            return yaml.safe_load(fd) or {}
+    except (FileNotFoundError, yaml.YAMLError):
+        return {}
+
+
+# ============================================
+#              get_cached_labels
+# ============================================
+def get_cached_labels(key: str) -> List[str] | None:
+    """
+    Returns the field labels cached under ``key`` (see
+    :py:func:`label_cache_key`), or ``None`` if there are none.
+    """
+    with _labelCacheLock:
+        labels = _load_cache().get(key)
+    return list(labels) if labels is not None else None
+
+
+# ============================================
+#                cache_labels
+# ============================================
+def cache_labels(key: str, labels: List[str]) -> None:
+    """
+    Caches ``labels`` under ``key``, both for this session and in
+    ``~/.dephy``, so that later sessions don't have to ask the device.
+    """
+    with _labelCacheLock:
+        cache = _load_cache()
+        if cache.get(key) == labels:
+            return
+        cache[key] = list(labels)
+        _update_cache_file(key, list(labels))
+
+
+# ============================================
+#             clear_label_cache
+# ============================================
+def clear_label_cache(key: str | None = None) -> None:
+    """
+    Forgets the labels cached under ``key``, or every cached label if
+    ``key`` is ``None``, e.g., if a device's firmware was updated
+    without its version changing.
+    """
+    with _labelCacheLock:
+        cache = _load_cache()
+        if key is None:
+            cache.clear()
+        elif cache.pop(key, None) is None:
+            return
+        _update_cache_file(key, None)
+
+
+# ============================================
+#             _update_cache_file
+# ============================================
+def _update_cache_file(key: str | None, labels: List[str] | None) -> None:
+    """
+    Sets the labels cached on disk under ``key``, or removes them if
+    ``labels`` is ``None``, or removes every label if ``key`` is also
+    ``None``.
+
+    Other processes may have cached labels since the file was loaded,
+    so it's read again, under a lock, and only ``key`` is changed.
+    """
+    try:
+        fxc.dephyPath.mkdir(parents=True, exist_ok=True)
+        with file_lock(fxc.fieldLabelsCacheFile):
+            cache = _read_cache_file() if key is not None else {}
+            if labels is not None:
+                cache[key] = labels
+            else:
+                cache.pop(key, None)
+            # Written to a temporary file first so that another process
+            # never reads a half-written cache
+            tmpFile = fxc.fieldLabelsCacheFile.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmpFile, "w", encoding="utf-8") as fd:
+                yaml.safe_dump(cache, fd)
+            os.replace(tmpFile, fxc.fieldLabelsCacheFile)
+    except OSError as err:
+        print(f"Warning: could not cache field labels: {err}")
+
+
+# ============================================
+#            allocate_label_buffer
+# ============================================
+def allocate_label_buffer(maxLabels: int, maxLength: int) -> Tuple[Any, c.Array]:
+    """
+    Allocates the array of string pointers that
+    ``fxGetDataLabelsWrapper`` writes the labels into.
+
+    Rather than one buffer per label, every label points into a single
+    contiguous block, so that :py:func:`decode_labels` can decode them
+    all at once.
+
+    Returns
+    -------
+    Tuple[c.POINTER, c.Array]
+        The pointers, to pass to the library, and the block they point
+        into.
+    """
+    block = c.create_string_buffer(maxLabels * maxLength)
+    start = c.addressof(block)
+    # Filling an array of plain addresses in one go is much faster than
+    # assigning each pointer separately. The cast keeps the array alive
+    addresses = (c.c_void_p * maxLabels)(
+        *range(start, start + maxLabels * maxLength, maxLength)
+    )
+    labels = c.cast(addresses, c.POINTER(c.POINTER(c.c_char)))
+    return labels, block
+
+
+# ============================================
+#               decode_labels
+# ============================================
+def decode_labels(block: c.Array, nLabels: int, maxLength: int) -> List[str]:
+    """
+    Decodes the first ``nLabels`` labels in a block allocated by
+    :py:func:`allocate_label_buffer`, dropping the trailing nulls.
+    """
+    raw = np.frombuffer(block, dtype=f"S{maxLength}", count=nLabels)
+    return [label.decode("utf8").strip("\x00") for label in raw.tolist()]
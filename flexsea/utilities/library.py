@@ -1,24 +1,36 @@
 import ctypes as c
 import os
 from pathlib import Path
-from typing import Tuple
-import zipfile
+from threading import Lock
+from typing import Dict, List, Tuple
 
-from botocore.exceptions import EndpointConnectionError
 from semantic_version import Version
 
 import flexsea.utilities.constants as fxc
 
-from .aws import s3_download
+from .aws import load_s3_stack
+from .cache import extract_artifact
+from .cache import find_artifact
+from .cache import get_artifact
 from .firmware import Firmware
+from .firmware import validate_given_firmware_version
 from .system import get_os
 
 
+# Loaded libraries, with their prototypes set, keyed by the resolved path of
+# the library file and the firmware version the prototypes were set for
+_clibCache: Dict[Tuple[str, str], c.CDLL] = {}
+_clibCacheLock = Lock()
+
+
 # ============================================
 #                get_c_library
 # ============================================
 def get_c_library(
-    firmwareVersion: Version, libFile: Path | None, timeout: int = 60
+    firmwareVersion: Version,
+    libFile: Path | None,
+    timeout: int = 60,
+    offline: bool = False,
 ) -> Tuple:
     """
     Loads the correct C library for interacting with the device.
@@ -28,6 +40,10 @@ def get_c_library(
     on disk corresponding to our firmware version. If we don't have one,
     we try to download it from S3. We then use ctypes to load the library.
 
+    Loaded libraries are cached for the life of the process, so every
+    device that uses the same library file and firmware version shares
+    one ``ctypes.CDLL``. See :py:func:`clear_c_library_cache`.
+
     Parameters
     ----------
     firmwareVersion : Version
@@ -40,12 +56,18 @@ def get_c_library(
         Time, in seconds, spent trying to connect to S3 before an
         exception is raised.
 
+    offline : bool, optional
+        If ``True``, the library is never downloaded from S3.
+
     Raises
     ------
     EndpointConnectionError
         If we cannot connect to the internet in order to download the
         necessary library.
 
+    FileNotFoundError
+        If ``offline`` is ``True`` and there is no cached library.
+
     Returns
     -------
     Tuple
@@ -54,24 +76,84 @@ def get_c_library(
     """
     if libFile is None:
         _os = get_os()
-        libFile = fxc.libsPath.joinpath(str(firmwareVersion), _os, fxc.libFiles[_os])
-        if not libFile.exists():
-            libFile.parent.mkdir(parents=True, exist_ok=True)
-            libObj = f"{fxc.libsDir}/{firmwareVersion}/{_os}/{libFile.name}"
+        libObj = f"{fxc.libsDir}/{firmwareVersion}/{_os}/{fxc.libFiles[_os]}"
+        libFile = find_artifact(libObj)
+        if libFile is None:
+            if offline:
+                raise FileNotFoundError(f"Error: no cached library: {libObj}")
             try:
-                s3_download(
-                    libObj, fxc.dephyPublicFilesBucket, str(libFile), None, timeout
-                )
-            except EndpointConnectionError as err:
+                libFile = get_artifact(libObj, libObj, timeout)
+            except load_s3_stack().exceptions.EndpointConnectionError as err:
                 msg = "Error: could not connect to the internet to download the "
                 msg += "necessary C library file. Please connect to the internet and "
                 msg += "try again."
                 print(msg)
                 raise err
 
-    clib = _load_clib(libFile, timeout)
+    key = (str(libFile.expanduser().resolve()), str(firmwareVersion))
 
-    return (_set_prototypes(clib, firmwareVersion), libFile)
+    with _clibCacheLock:
+        if key not in _clibCache:
+            clib = _load_clib(libFile, timeout)
+            _clibCache[key] = set_prototypes(clib, firmwareVersion)
+
+    return (_clibCache[key], libFile)
+
+
+# ============================================
+#            clear_c_library_cache
+# ============================================
+def clear_c_library_cache() -> None:
+    """
+    Forgets every library loaded by :py:func:`get_c_library`, so the
+    next call loads the library file again. Devices that are already
+    using a library keep their reference to it.
+    """
+    with _clibCacheLock:
+        _clibCache.clear()
+
+
+# ============================================
+#            preload_c_libraries
+# ============================================
+def preload_c_libraries(
+    firmwareVersions: List[str], timeout: int = 60, offline: bool = False
+) -> List[Path]:
+    """
+    Loads the library for each of the given firmware versions into the
+    cache used by :py:func:`get_c_library`, downloading them if
+    necessary. Meant to be called once at start up so that creating
+    devices later on doesn't have to touch the disk or the network.
+
+    Parameters
+    ----------
+    firmwareVersions : List[str]
+        The firmware versions to load libraries for. These are
+        validated the same way as the version given to
+        :py:class:`~flexsea.device.Device`, without prompting.
+
+    timeout : int, optional
+        Time, in seconds, spent trying to connect to S3 before an
+        exception is raised.
+
+    offline : bool, optional
+        If ``True``, S3 is never contacted.
+
+    Returns
+    -------
+    List[Path]
+        The path to each loaded library file.
+    """
+    libFiles = []
+
+    for firmwareVersion in firmwareVersions:
+        version = validate_given_firmware_version(
+            firmwareVersion, False, timeout, offline
+        )
+        _, libFile = get_c_library(version, None, timeout, offline)
+        libFiles.append(libFile)
+
+    return libFiles
 
 
 # ============================================
@@ -107,16 +189,8 @@ def _add_windows_dlls(libFile: str, timeout: int = 60) -> None:
     add them to the PATH.
     """
     opSys = get_os()
-    dllZip = fxc.dephyPath.joinpath("bootloader_tools", opSys, "win_dlls.zip")
-    base = dllZip.name.split(".")[0]
-    extractedDest = Path(os.path.dirname(dllZip)).joinpath(base)
-
-    if not dllZip.exists():
-        obj = str(Path("bootloader_tools").joinpath(opSys, "win_dlls.zip").as_posix())
-        bucket = fxc.dephyPublicFilesBucket
-        s3_download(obj, bucket, str(dllZip), timeout=timeout)
-        with zipfile.ZipFile(dllZip, "r") as archive:
-            archive.extractall(extractedDest)
+    obj = f"bootloader_tools/{opSys}/win_dlls.zip"
+    extractedDest = extract_artifact(get_artifact(obj, obj, timeout))
     os.add_dll_directory(extractedDest.joinpath("git_bash_mingw64", "bin"))
     try:
         os.add_dll_directory(libFile)
@@ -130,9 +204,13 @@ def _add_windows_dlls(libFile: str, timeout: int = 60) -> None:
 
 
 # ============================================
-#               _set_prototypes
+#               set_prototypes
 # ============================================
-def _set_prototypes(clib: c.CDLL, firmwareVersion: Version) -> c.CDLL:
+def set_prototypes(clib: c.CDLL, firmwareVersion: Version) -> c.CDLL:
+    """
+    Sets the argument and return types of the library's functions for
+    the given firmware version.
+    """
     # pylint: disable=too-many-statements
     # Open
     clib.fxOpen.argtypes = [c.c_char_p, c.c_uint, c.c_uint]
@@ -393,7 +471,7 @@ def _set_prototypes(clib: c.CDLL, firmwareVersion: Version) -> c.CDLL:
 # ============================================
 def set_read_functions(
     clib: c.CDLL, deviceName: str, isLegacy: bool, deviceType: c.Structure | None
-) -> c.CDLL:
+) -> Tuple:
     """
     Sets the prototypes for the read and read_all functions.
 
@@ -403,10 +481,15 @@ def set_read_functions(
     We do it here for non-legacy devices because it's easier than
     passing and worrying about the firmware version to set_prototypes
 
+    Since the library object may be shared by several devices (see
+    :py:func:`get_c_library`) and, for legacy devices, the prototypes
+    depend on the device, each call returns its own function objects
+    rather than setting them on the library.
+
     Parameters
     ----------
     clib : CDLL
-        The object on which the prototypes will be set.
+        The library containing the read functions.
 
     deviceName : str
         The name of the device, e.g., actpack. Used to set the correct
@@ -428,44 +511,40 @@ def set_read_functions(
 
     Returns
     -------
-    CDLL
-        The library object with the set prototypes.
+    Tuple
+        The read and read_all functions, with their prototypes set.
     """
     if isLegacy:
         if deviceName == "actpack":
-            readFunc = getattr(clib, "fxReadDevice")
-            readAllFunc = getattr(clib, "fxReadDeviceAll")
+            readFunc = clib["fxReadDevice"]
+            readAllFunc = clib["fxReadDeviceAll"]
         # This also covers XCs, since thoes are reported as exos
         elif deviceName == "exo":
-            readFunc = getattr(clib, "fxReadExoDevice")
-            readAllFunc = getattr(clib, "fxReadExoDeviceAll")
+            readFunc = clib["fxReadExoDevice"]
+            readAllFunc = clib["fxReadExoDeviceAll"]
         elif deviceName == "md":
-            readFunc = getattr(clib, "fxReadMdDevice")
-            readAllFunc = getattr(clib, "fxReadMdDeviceAll")
+            readFunc = clib["fxReadMdDevice"]
+            readAllFunc = clib["fxReadMdDeviceAll"]
         else:
             raise ValueError(f"Unknown device: {deviceName}")
 
         readFunc.argtypes = [c.c_uint, c.POINTER(deviceType)]
         readFunc.restype = c.c_int
-        setattr(clib, "read", readFunc)
 
         readAllFunc.argtypes = [c.c_uint, c.POINTER(deviceType), c.c_uint]
         readAllFunc.restype = c.c_int
-        setattr(clib, "read_all", readAllFunc)
 
     else:
-        readFunc = getattr(clib, "fxReadDevice")
+        readFunc = clib["fxReadDevice"]
         readFunc.argtypes = [c.c_uint, c.POINTER(c.c_int32), c.POINTER(c.c_int)]
         readFunc.restype = c.c_int
-        setattr(clib, "read", readFunc)
 
-        readAllFunc = getattr(clib, "fxReadDeviceAllWrapper")
+        readAllFunc = clib["fxReadDeviceAllWrapper"]
         readAllFunc.argtypes = [
             c.c_uint,
             c.POINTER(c.POINTER(c.c_int32)),
             c.POINTER(c.c_int),
         ]
         readAllFunc.restype = None
-        setattr(clib, "read_all", readAllFunc)
 
-    return clib
+    return (readFunc, readAllFunc)
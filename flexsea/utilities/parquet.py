@@ -0,0 +1,31 @@
+from typing import Tuple
+
+
+# ============================================
+#               import_pyarrow
+# ============================================
+def import_pyarrow() -> Tuple:
+    """
+    Imports pyarrow, which is an optional dependency, only when it's
+    actually needed, i.e., to read or write Parquet files.
+
+    Raises
+    ------
+    ImportError
+        If pyarrow isn't installed, with instructions for installing it.
+
+    Returns
+    -------
+    Tuple
+        The ``pyarrow`` and ``pyarrow.parquet`` modules.
+    """
+    try:
+        # pylint: disable=import-outside-toplevel
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as err:
+        msg = "Error: reading and writing Parquet files requires pyarrow. "
+        msg += "Install it with: pip install flexsea[parquet]"
+        raise ImportError(msg) from err
+
+    return pa, pq
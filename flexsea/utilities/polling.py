@@ -0,0 +1,135 @@
+from time import perf_counter
+from time import sleep
+from typing import Any, Callable, Tuple
+
+
+# ============================================
+#          async_request_and_wait
+# ============================================
+async def async_request_and_wait(
+    request: Callable,
+    getter: Callable,
+    timeout: float,
+    initialDelay: float = 0.001,
+    maxDelay: float = 0.05,
+) -> Tuple[Any, float, bool]:
+    """
+    Sends a request to the device and waits, without blocking the event
+    loop, for the corresponding response to arrive.
+
+    Several of the C library's functions come in pairs: one that asks
+    the device for a value (e.g., ``fxRequestUVLO``) and one that
+    returns the last value the device sent back (e.g.,
+    ``fxGetLastReceivedUVLO``). There is no notification when the
+    response arrives, so we poll the getter, with an exponentially
+    growing delay between polls, until its value differs from what it
+    was before the request or until ``timeout`` expires. An answer that
+    is the same as the previous one can't be told apart from no answer,
+    so callers that know about how long the device takes to answer
+    should pass a correspondingly short ``timeout``.
+
+    Parameters
+    ----------
+    request : Callable
+        Sends the request to the device.
+
+    getter : Callable
+        Returns the last received value. The values it returns must be
+        comparable with ``!=``.
+
+    timeout : float
+        Time, in seconds, to wait for the value to change.
+
+    initialDelay : float, optional
+        Time, in seconds, between the first two polls.
+
+    maxDelay : float, optional
+        The longest time, in seconds, between two polls.
+
+    Returns
+    -------
+    Tuple[Any, float, bool]
+        The last value returned by ``getter``, the time in seconds
+        between sending the request and receiving that value, and
+        whether or not the value changed. If the value didn't change,
+        either the device didn't answer in time or its answer is the
+        same as the previous one.
+    """
+    # Imported here because Device uses the blocking version and asyncio
+    # is slow to import
+    # pylint: disable-next=import-outside-toplevel
+    import asyncio
+
+    poll = _Poll(request, getter, timeout, initialDelay, maxDelay)
+    delay = poll.next_delay()
+    while delay is not None:
+        await asyncio.sleep(delay)
+        delay = poll.next_delay()
+    return poll.result
+
+
+# ============================================
+#              request_and_wait
+# ============================================
+def request_and_wait(
+    request: Callable,
+    getter: Callable,
+    timeout: float,
+    initialDelay: float = 0.001,
+    maxDelay: float = 0.05,
+) -> Tuple[Any, float, bool]:
+    """
+    Blocking version of :py:func:`async_request_and_wait`. See there for
+    a description of the parameters and return values.
+    """
+    poll = _Poll(request, getter, timeout, initialDelay, maxDelay)
+    delay = poll.next_delay()
+    while delay is not None:
+        sleep(delay)
+        delay = poll.next_delay()
+    return poll.result
+
+
+# ============================================
+#                   _Poll
+# ============================================
+class _Poll:
+    """
+    Sends the request and then, each time :py:meth:`next_delay` is
+    called, polls the getter once, so that the blocking and awaitable
+    versions only differ in how they sleep between polls.
+    """
+
+    def __init__(
+        self,
+        request: Callable,
+        getter: Callable,
+        timeout: float,
+        initialDelay: float,
+        maxDelay: float,
+    ) -> None:
+        self._getter = getter
+        self._timeout = timeout
+        self._delay = initialDelay
+        self._maxDelay = maxDelay
+        self._baseline = getter()
+        self._start = perf_counter()
+        request()
+        self.result: Tuple[Any, float, bool] = (self._baseline, 0.0, False)
+
+    # -----
+    # next_delay
+    # -----
+    def next_delay(self) -> float | None:
+        """
+        Returns how long to sleep before polling again, or ``None`` once
+        polling is over and :py:attr:`result` is set.
+        """
+        value = self._getter()
+        elapsed = perf_counter() - self._start
+        if value != self._baseline or elapsed >= self._timeout:
+            self.result = (value, elapsed, value != self._baseline)
+            return None
+        delay = min(self._delay, self._timeout - elapsed)
+        self._delay = min(2 * self._delay, self._maxDelay)
+        return delay
@@ -0,0 +1,177 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, List, Tuple
+
+from semantic_version import Version
+
+import flexsea.utilities.constants as fxc
+from flexsea.utilities.aws import get_s3_client, get_s3_manifest
+from flexsea.utilities.cache import extract_artifact, store_artifact
+from flexsea.utilities.firmware import validate_given_firmware_version
+from flexsea.utilities.system import get_os
+
+
+# ============================================
+#               prefetch_targets
+# ============================================
+def prefetch_targets(
+    firmwareVersions: List[str],
+    operatingSystems: List[str] | None = None,
+    client: Any = None,
+    timeout: int = 60,
+) -> List[Tuple[str, str]]:
+    """
+    Returns the S3 objects needed to use the given firmware versions on
+    the given operating systems, along with where each one goes,
+    relative to the cache directory.
+
+    These are the C library for each version and operating system, the
+    device specs for each legacy version, and, for Windows, the DLLs
+    the libraries depend on.
+
+    Parameters
+    ----------
+    firmwareVersions : List[str]
+        The firmware versions. These are validated the same way as the
+        version given to :py:class:`~flexsea.device.Device`, without
+        prompting.
+
+    operatingSystems : List[str], None, optional
+        Any of the keys of ``flexsea.utilities.constants.libFiles``,
+        e.g., ``linux_64bit``. Defaults to the current one.
+
+    client : BaseClient, None, optional
+        Used to list the bucket if its manifest is out of date (see
+        :py:func:`~flexsea.utilities.aws.get_s3_manifest`).
+
+    timeout : int, optional
+        Time, in seconds, spent trying to connect to S3 before an
+        exception is raised.
+
+    Returns
+    -------
+    List[Tuple[str, str]]
+        The S3 object and the relative path of each file.
+    """
+    if operatingSystems is None:
+        operatingSystems = [get_os()]
+    unknown = set(operatingSystems) - set(fxc.libFiles)
+    if unknown:
+        raise ValueError(f"Error: unknown operating systems: {', '.join(unknown)}")
+
+    targets = []
+
+    for firmwareVersion in firmwareVersions:
+        version = validate_given_firmware_version(firmwareVersion, False, timeout)
+        for opSys in operatingSystems:
+            obj = f"{fxc.libsDir}/{version}/{opSys}/{fxc.libFiles[opSys]}"
+            targets.append((obj, obj))
+
+        if Version(str(version)) < fxc.legacyCutoff:
+            if client is None:
+                client = get_s3_client(None, timeout)
+            prefix = f"{fxc.legacyDeviceSpecsDir}/{version}/"
+            manifest = get_s3_manifest(
+                fxc.dephyPublicFilesBucket, client, prefix=prefix
+            )
+            for key in manifest.for_version(str(version)):
+                if key.startswith(prefix) and key.endswith(".yaml"):
+                    targets.append((key, key))
+
+    for opSys in operatingSystems:
+        if "windows" in opSys:
+            obj = f"bootloader_tools/{opSys}/win_dlls.zip"
+            targets.append((obj, obj))
+
+    return list(dict.fromkeys(targets))
+
+
+# ============================================
+#                  prefetch
+# ============================================
+def prefetch(
+    firmwareVersions: List[str],
+    operatingSystems: List[str] | None = None,
+    cacheDir: str | Path | None = None,
+    nWorkers: int = 8,
+    timeout: int = 60,
+    verify: bool = True,
+) -> List[dict]:
+    """
+    Downloads everything needed to use the given firmware versions, so
+    that creating a :py:class:`~flexsea.device.Device` later on doesn't
+    have to, e.g., when building an image for many machines.
+
+    Files are downloaded concurrently through the shared client (see
+    :py:func:`~flexsea.utilities.aws.get_s3_client`). Files already
+    present are verified against S3 and skipped, and interrupted
+    downloads are resumed rather than restarted (see
+    :py:func:`~flexsea.utilities.aws.download_resumable`). Files are
+    stored the same way as when a device downloads them (see
+    :py:func:`~flexsea.utilities.cache.store_artifact`), so
+    ``cacheDir`` can be used as the shared cache (see
+    :py:func:`~flexsea.utilities.cache.set_shared_cache_dir`). See
+    :py:func:`prefetch_targets` for what is downloaded.
+
+    Parameters
+    ----------
+    firmwareVersions : List[str]
+        The firmware versions to download files for.
+
+    operatingSystems : List[str], None, optional
+        Any of the keys of ``flexsea.utilities.constants.libFiles``,
+        e.g., ``linux_64bit``. Defaults to the current one.
+
+    cacheDir : str, Path, None, optional
+        The directory to populate. Defaults to ``~/.dephy``, which is
+        where :py:class:`~flexsea.device.Device` looks.
+
+    nWorkers : int, optional
+        The number of files downloaded at the same time. The client
+        makes at most ``flexsea.utilities.constants.s3MaxPoolConnections``
+        requests at once, so more workers than that don't help.
+
+    timeout : int, optional
+        Time, in seconds, spent trying to connect to S3 before an
+        exception is raised.
+
+    verify : bool, optional
+        Whether or not to check files that are already present.
+
+    Returns
+    -------
+    List[dict]
+        For each file: the S3 ``object``, its local ``path``, its
+        ``status``, which is ``downloaded``, ``cached``, or ``failed``,
+        and, if it failed, the ``error``.
+    """
+    if nWorkers <= 0:
+        raise ValueError("Error: number of workers must be positive.")
+
+    cacheDir = Path(cacheDir).expanduser() if cacheDir else fxc.dephyPath
+    client = get_s3_client(None, timeout)
+    bucket = fxc.dephyPublicFilesBucket
+
+    targets = prefetch_targets(firmwareVersions, operatingSystems, client, timeout)
+
+    def fetch(target: Tuple[str, str]) -> dict:
+        obj, relativePath = target
+        dest = cacheDir.joinpath(relativePath)
+        result = {"object": obj, "path": dest, "status": "failed", "error": None}
+        try:
+            result["status"] = store_artifact(
+                client, bucket, obj, relativePath, cacheDir, verify
+            )
+            if dest.suffix == ".zip":
+                # The DLLs are used from where they're extracted to
+                extract_artifact(dest, cacheDir)
+        # One failed file shouldn't stop the others, so errors are
+        # reported rather than raised
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            result["error"] = err
+        return result
+
+    with ThreadPoolExecutor(max_workers=nWorkers) as executor:
+        results = list(executor.map(fetch, targets))
+
+    return results
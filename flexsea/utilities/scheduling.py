@@ -0,0 +1,110 @@
+import os
+import sys
+from time import perf_counter
+from time import sleep
+
+
+# ============================================
+#                 wait_until
+# ============================================
+def wait_until(deadline: float, spin: float = 0.0005) -> float:
+    """
+    Waits until ``perf_counter()`` reaches ``deadline``.
+
+    Most of the wait is spent sleeping. Since the operating system may
+    wake us up late, the last ``spin`` seconds are spent polling the
+    clock instead, which trades a little CPU for much lower jitter.
+
+    Parameters
+    ----------
+    deadline : float
+        The time to wait until, as given by ``time.perf_counter``.
+
+    spin : float, optional
+        Time, in seconds, before the deadline at which to stop sleeping
+        and start polling. If 0, the whole wait is spent sleeping.
+
+    Returns
+    -------
+    float
+        The time at which the wait ended, which is at or after
+        ``deadline``.
+    """
+    now = perf_counter()
+    if deadline - now > spin:
+        sleep(deadline - now - spin)
+        now = perf_counter()
+    while now < deadline:
+        now = perf_counter()
+    return now
+
+
+# ============================================
+#           set_realtime_priority
+# ============================================
+def set_realtime_priority(priority: int) -> bool:
+    """
+    Switches the calling thread to the ``SCHED_FIFO`` real-time
+    scheduling policy with the given priority.
+
+    This is only possible on Linux and usually requires either root
+    or the ``CAP_SYS_NICE`` capability, e.g., through an ``rtprio``
+    limit in ``/etc/security/limits.conf``. When it isn't possible, a
+    warning is printed and the thread keeps its current policy.
+
+    Parameters
+    ----------
+    priority : int
+        Between 1 (lowest) and 99 (highest).
+
+    Returns
+    -------
+    bool
+        ``True`` if the policy was changed.
+    """
+    if sys.platform != "linux":
+        print("Warning: real-time scheduling is only supported on Linux.")
+        return False
+
+    try:
+        # On Linux, a pid of 0 refers to the calling thread
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+    except (OSError, ValueError) as err:
+        print(f"Warning: could not set real-time priority: {err}")
+        return False
+
+    return True
+
+
+# ============================================
+#                 pin_to_cpu
+# ============================================
+def pin_to_cpu(cpu: int) -> bool:
+    """
+    Restricts the calling thread to running on the given CPU core, so
+    that it isn't migrated between cores and doesn't lose its cache.
+
+    This is only possible on Linux. When it isn't possible, a warning
+    is printed and the thread keeps its current affinity.
+
+    Parameters
+    ----------
+    cpu : int
+        The index of the core, starting at 0.
+
+    Returns
+    -------
+    bool
+        ``True`` if the affinity was changed.
+    """
+    if sys.platform != "linux":
+        print("Warning: CPU pinning is only supported on Linux.")
+        return False
+
+    try:
+        os.sched_setaffinity(0, {cpu})
+    except (OSError, ValueError) as err:
+        print(f"Warning: could not pin to CPU {cpu}: {err}")
+        return False
+
+    return True
@@ -0,0 +1,771 @@
+import ctypes as c
+from collections import deque
+import math
+import random
+from time import perf_counter
+from typing import Any, Callable, Dict, List
+
+import flexsea.utilities.constants as fxc
+from flexsea.utilities.firmware import Firmware
+
+
+# Fields streamed by the simulated device, in order. These mirror those of an
+# actpack running v12 firmware
+simulatedFields = [
+    "state_time",
+    "accl_x",
+    "accl_y",
+    "accl_z",
+    "gyro_x",
+    "gyro_y",
+    "gyro_z",
+    "mot_ang",
+    "mot_vel",
+    "mot_acc",
+    "mot_cur",
+    "mot_volt",
+    "batt_volt",
+    "batt_curr",
+    "temperature",
+    "status_mn",
+    "status_ex",
+    "status_re",
+]
+
+
+# ============================================
+#             SimulatedFunction
+# ============================================
+class SimulatedFunction:
+    """
+    Stands in for a function exported by a ``ctypes.CDLL``.
+
+    ``argtypes`` and ``restype`` can be set, as is done by
+    :py:func:`~flexsea.utilities.library.set_read_functions`, but are
+    not used.
+    """
+
+    def __init__(self, func: Callable) -> None:
+        self.func = func
+        self.argtypes: List | None = None
+        self.restype: Any = c.c_int
+
+    # -----
+    # __call__
+    # -----
+    def __call__(self, *args) -> Any:
+        return self.func(*args)
+
+
+# ============================================
+#               SimulatedMotor
+# ============================================
+class SimulatedMotor:
+    """
+    A brushless DC motor driving a pure inertia with viscous friction.
+
+    The controllers mimic those of the firmware: the current and
+    impedance controllers track a current with a first-order lag, while
+    voltage mode and the position controller apply a voltage to the
+    windings. The position and impedance controllers use the gains set
+    with ``fxSetGains``. The state is advanced with semi-implicit Euler
+    steps of at most :py:attr:`maxStep` seconds.
+
+    Parameters
+    ----------
+    kt : float, optional
+        Torque constant, in Nm/A. Also used as the back-emf constant,
+        in V s/rad.
+
+    resistance : float, optional
+        Phase resistance, in Ohms.
+
+    inertia : float, optional
+        Rotor inertia, in kg m^2.
+
+    friction : float, optional
+        Viscous friction, in Nm s/rad.
+
+    batteryVoltage : float, optional
+        Supply voltage, in V.
+
+    maxCurrent : float, optional
+        Largest current, in mA, the motor can draw.
+
+    ticksPerRev : int, optional
+        Encoder ticks per revolution.
+    """
+
+    # Scale the integer gains sent to the device into mV per encoder tick for
+    # the position controller and mA per encoder tick for the impedance
+    # controller
+    positionGainScale = 0.1
+    impedanceGainScale = 0.01
+
+    # Time constant, in seconds, of the current loop
+    currentTimeConstant = 0.0002
+
+    # Longest time, in seconds, the model is advanced by in one step. The
+    # controllers are run on every step, like the firmware's control loop
+    maxStep = 0.0001
+
+    def __init__(
+        self,
+        kt: float = 0.14,
+        resistance: float = 0.186,
+        inertia: float = 1.2e-4,
+        friction: float = 1e-4,
+        batteryVoltage: float = 24.0,
+        maxCurrent: float = 20000.0,
+        ticksPerRev: int = 16384,
+    ) -> None:
+        self.kt = kt
+        self.resistance = resistance
+        self.inertia = inertia
+        self.friction = friction
+        self.batteryVoltage = batteryVoltage
+        self.maxCurrent = maxCurrent
+        self.ticksPerRad = ticksPerRev / (2.0 * math.pi)
+
+        self.mode = fxc.controllers["none"].value
+        self.setpoint = 0
+        self.gains = {"kp": 0, "ki": 0, "kd": 0, "k": 0, "b": 0, "ff": 0}
+
+        self.angle: float = 0.0
+        self.velocity: float = 0.0
+        self.acceleration: float = 0.0
+        self.current: float = 0.0
+        self.voltage: float = 0.0
+        self._integral: float = 0.0
+
+    # -----
+    # command
+    # -----
+    def command(self, mode: int, value: int) -> None:
+        """
+        Sets the controller and its setpoint.
+        """
+        if mode != self.mode:
+            self._integral = 0.0
+        self.mode = mode
+        self.setpoint = value
+
+    # -----
+    # step
+    # -----
+    def step(self, dt: float) -> None:
+        """
+        Advances the motor by ``dt`` seconds.
+        """
+        nSteps = max(1, math.ceil(dt / self.maxStep))
+        for _ in range(nSteps):
+            self._step(dt / nSteps)
+
+    # -----
+    # _step
+    # -----
+    def _step(self, dt: float) -> None:
+        # The position controller and voltage mode drive the windings with a
+        # voltage, so the current follows from the back-emf, while the
+        # current and impedance controllers track a current
+        voltage = self._target_voltage(dt)
+
+        if voltage is None:
+            target = self._target_current()
+            alpha = 1.0 - math.exp(-dt / self.currentTimeConstant)
+            current = self.current + alpha * (target - self.current)
+            self.current = max(-self.maxCurrent, min(self.maxCurrent, current))
+            self.voltage = (
+                self.resistance * self.current / 1000.0 + self.kt * self.velocity
+            )
+        else:
+            self.voltage = max(-self.batteryVoltage, min(self.batteryVoltage, voltage))
+            current = (self.voltage - self.kt * self.velocity) / self.resistance
+            self.current = max(-self.maxCurrent, min(self.maxCurrent, current * 1000.0))
+
+        torque = self.kt * self.current / 1000.0 - self.friction * self.velocity
+        self.acceleration = torque / self.inertia
+        self.velocity += self.acceleration * dt
+        self.angle += self.velocity * dt
+
+    # -----
+    # _target_voltage
+    # -----
+    def _target_voltage(self, dt: float) -> float | None:
+        controllers = fxc.controllers
+
+        if self.mode == controllers["voltage"].value:
+            return self.setpoint / 1000.0
+
+        if self.mode == controllers["position"].value:
+            error = self.setpoint - self.angle * self.ticksPerRad
+            # The firmware's controllers run at 1 kHz, so the derivative
+            # terms are per millisecond
+            self._integral += error * dt
+            velocity = self.velocity * self.ticksPerRad * 0.001
+            target = self.gains["kp"] * error + self.gains["ki"] * self._integral
+            target -= self.gains["kd"] * velocity
+            return target * self.positionGainScale / 1000.0
+
+        return None
+
+    # -----
+    # _target_current
+    # -----
+    def _target_current(self) -> float:
+        controllers = fxc.controllers
+
+        if self.mode == controllers["current"].value:
+            return float(self.setpoint)
+
+        if self.mode == controllers["impedance"].value:
+            error = self.setpoint - self.angle * self.ticksPerRad
+            velocity = self.velocity * self.ticksPerRad * 0.001
+            target = self.gains["k"] * error - self.gains["b"] * velocity
+            return target * self.impedanceGainScale
+
+        return 0.0
+
+
+# ============================================
+#              SimulatedLibrary
+# ============================================
+class SimulatedLibrary:
+    """
+    A pure-Python stand-in for the pre-compiled C library that talks to
+    a simulated device instead of a physical one.
+
+    It exports the same ``fx*`` functions as the real library for
+    non-legacy firmware (v10 and later), so it can be passed to
+    :py:class:`~flexsea.device.Device` via its ``clib`` argument in
+    order to exercise, benchmark, or load-test the Python layer without
+    hardware. While streaming, samples are generated at the streaming
+    frequency from a :py:class:`SimulatedMotor`, based on the time that
+    has elapsed since streaming started, and queued just like the real
+    library queues the data it receives.
+
+    Parameters
+    ----------
+    deviceName : str, optional
+        The name reported by the device.
+
+    side : str, optional
+        The side reported by the device.
+
+    fields : List[str], optional
+        The fields streamed by the device. Fields the simulation does
+        not know about are always zero. Defaults to
+        :py:data:`simulatedFields`.
+
+    queueSize : int, optional
+        The most samples the data queue holds. Older samples are
+        dropped when it is full.
+
+    firmwareVersion : str, optional
+        The firmware version reported for every MCU.
+
+    libVersion : str, optional
+        The version reported for the library itself.
+
+    responseDelay : float, optional
+        Time, in seconds, between requesting a value (e.g., with
+        ``fxRequestUVLO``) and the answer arriving.
+
+    noise : float, optional
+        Standard deviation, in mA, of the noise added to the reported
+        motor current.
+
+    seed : int, optional
+        Seed for the noise.
+
+    motor : SimulatedMotor, optional
+        The motor model. A default one is created if not given.
+
+    Examples
+    --------
+    >>> from flexsea.device import Device
+    >>> from flexsea.utilities.simulator import SimulatedLibrary
+    >>> device = Device("12.0.0", "sim", clib=SimulatedLibrary())
+    >>> device.open()
+    >>> device.start_streaming(1000)
+    >>> device.command_motor_current(1000)
+    """
+
+    # Arguments passed with byref are written to through their _obj attribute
+    # pylint: disable=invalid-name,unused-argument,too-many-public-methods
+    # pylint: disable=protected-access
+
+    deviceId = 1
+    maxDataLabelLength = 32
+    maxDeviceNameLength = 32
+    nUtts = 15
+
+    def __init__(
+        self,
+        deviceName: str = "actpack",
+        side: str = "",
+        fields: List[str] | None = None,
+        queueSize: int = 1000,
+        firmwareVersion: str = "12.0.0",
+        libVersion: str = "12.0.0",
+        responseDelay: float = 0.005,
+        noise: float = 20.0,
+        seed: int | None = None,
+        motor: SimulatedMotor | None = None,
+    ) -> None:
+        self.deviceName = deviceName
+        self.side = side
+        self.fields = list(simulatedFields if fields is None else fields)
+        self.firmwareVersion = firmwareVersion
+        self.libVersion = libVersion
+        self.responseDelay = responseDelay
+        self.noise = noise
+        self.motor = SimulatedMotor() if motor is None else motor
+
+        self.queue: deque = deque(maxlen=queueSize)
+        self.isOpen = False
+        self.isStreaming = False
+        self.frequency = 0
+        self.nSamples = 0
+        self.commandCount = 0
+
+        self._functions: Dict[str, SimulatedFunction] = {}
+        self._latest: List[int] = [0] * len(self.fields)
+        self._random = random.Random(seed)
+        self._start: float = 0.0
+        self._pending: List = []
+        self._uvlo = 0
+        self._lastUvlo = 0
+        self._utts = [0] * self.nUtts
+        self._lastUtts = [0] * self.nUtts
+        self._lastFirmware = Firmware()
+
+    # -----
+    # __getattr__
+    # -----
+    def __getattr__(self, name: str) -> SimulatedFunction:
+        # Like a CDLL, the same function object is returned every time so
+        # that prototypes set on it stick
+        if not name.startswith("fx"):
+            raise AttributeError(name)
+        functions = self.__dict__["_functions"]
+        if name not in functions:
+            functions[name] = self[name]
+        return functions[name]
+
+    # -----
+    # __getitem__
+    # -----
+    def __getitem__(self, name: str) -> SimulatedFunction:
+        # Like a CDLL, a new function object is returned every time
+        try:
+            return SimulatedFunction(getattr(self, f"_{name}"))
+        except AttributeError as err:
+            raise AttributeError(f"function '{name}' not found") from err
+
+    # -----
+    # _generate
+    # -----
+    def _generate(self) -> None:
+        """
+        Queues every sample that is due since the last call.
+        """
+        if not self.isStreaming:
+            return
+
+        nDue = int((perf_counter() - self._start) * self.frequency) - self.nSamples
+        dt = 1.0 / self.frequency
+
+        for _ in range(nDue):
+            self.motor.step(dt)
+            self.nSamples += 1
+            self._latest = self._sample()
+            self.queue.append(self._latest)
+
+    # -----
+    # _sample
+    # -----
+    def _sample(self) -> List[int]:
+        motor = self.motor
+        current = motor.current + self._random.gauss(0.0, self.noise)
+        battCurrent = motor.voltage * motor.current / motor.batteryVoltage
+
+        values = {
+            "state_time": int(self.nSamples * 1000 / self.frequency),
+            "accl_z": 8192,
+            "mot_ang": int(motor.angle * motor.ticksPerRad),
+            "mot_vel": int(math.degrees(motor.velocity)),
+            "mot_acc": int(motor.acceleration),
+            "mot_cur": int(current),
+            "mot_volt": int(motor.voltage * 1000),
+            "batt_volt": int(motor.batteryVoltage * 1000 - 0.05 * abs(battCurrent)),
+            "batt_curr": int(battCurrent),
+            "temperature": 30,
+        }
+
+        return [values.get(field, 0) for field in self.fields]
+
+    # -----
+    # _respond
+    # -----
+    def _respond(self, apply: Callable) -> None:
+        """
+        Delivers the answer to a request after ``responseDelay``.
+        """
+        self._pending.append((perf_counter() + self.responseDelay, apply))
+
+    # -----
+    # _deliver
+    # -----
+    def _deliver(self) -> None:
+        now = perf_counter()
+        due = [apply for (t, apply) in self._pending if t <= now]
+        self._pending = [(t, apply) for (t, apply) in self._pending if t > now]
+        for apply in due:
+            apply()
+
+    # -----
+    # _encode_firmware
+    # -----
+    def _encode_firmware(self) -> int:
+        major, minor, patch = (int(v) for v in self.firmwareVersion.split("."))
+        return 2**major * 3**minor * 5**patch
+
+    # -----
+    # _fxOpen
+    # -----
+    def _fxOpen(self, port: bytes, baudRate: int, logLevel: int) -> int:
+        self.isOpen = True
+        return self.deviceId
+
+    # -----
+    # _fxOpenLimited
+    # -----
+    def _fxOpenLimited(self, port: bytes) -> int:
+        return self._fxOpen(port, 0, 0)
+
+    # -----
+    # _fxIsOpen
+    # -----
+    def _fxIsOpen(self, devId: int) -> bool:
+        return self.isOpen
+
+    # -----
+    # _fxClose
+    # -----
+    def _fxClose(self, devId: int) -> int:
+        self.isOpen = False
+        self.isStreaming = False
+        return fxc.deviceErrorCodes["SUCCESS"].value
+
+    # -----
+    # _fxStartStreaming
+    # -----
+    def _fxStartStreaming(self, devId: int, frequency: int, log: bool) -> int:
+        if not self.isOpen or frequency <= 0:
+            return fxc.deviceErrorCodes["FAILURE"].value
+        self.frequency = frequency
+        self.isStreaming = True
+        self.nSamples = 0
+        self._start = perf_counter()
+        return fxc.deviceErrorCodes["SUCCESS"].value
+
+    # -----
+    # _fxStartStreamingWithSafety
+    # -----
+    def _fxStartStreamingWithSafety(
+        self, devId: int, frequency: int, log: bool, heartbeat: int
+    ) -> int:
+        return self._fxStartStreaming(devId, frequency, log)
+
+    # -----
+    # _fxIsStreaming
+    # -----
+    def _fxIsStreaming(self, devId: int) -> bool:
+        return self.isStreaming
+
+    # -----
+    # _fxStopStreaming
+    # -----
+    def _fxStopStreaming(self, devId: int) -> int:
+        self.isStreaming = False
+        return fxc.deviceErrorCodes["SUCCESS"].value
+
+    # -----
+    # _fxSetDataLogName
+    # -----
+    def _fxSetDataLogName(self, name: bytes, devId: int) -> None:
+        return None
+
+    # -----
+    # _fxSetLogFileSize
+    # -----
+    def _fxSetLogFileSize(self, size: int, devId: int) -> None:
+        return None
+
+    # -----
+    # _fxSetLogDirectory
+    # -----
+    def _fxSetLogDirectory(self, path: bytes, devId: int) -> None:
+        return None
+
+    # -----
+    # _fxGetMaxDataElements
+    # -----
+    def _fxGetMaxDataElements(self) -> int:
+        return len(self.fields)
+
+    # -----
+    # _fxGetMaxDataLabelLength
+    # -----
+    def _fxGetMaxDataLabelLength(self) -> int:
+        return self.maxDataLabelLength
+
+    # -----
+    # _fxGetDataLabelsWrapper
+    # -----
+    def _fxGetDataLabelsWrapper(self, devId: int, labels: c.Array, nLabels) -> int:
+        for i, field in enumerate(self.fields):
+            label = field.encode("utf-8")[: self.maxDataLabelLength - 1]
+            c.memmove(labels[i], label, len(label))
+        nLabels._obj.value = len(self.fields)
+        return fxc.deviceErrorCodes["SUCCESS"].value
+
+    # -----
+    # _fxGetReadDataQueueSize
+    # -----
+    def _fxGetReadDataQueueSize(self, devId: int) -> int:
+        self._generate()
+        return len(self.queue)
+
+    # -----
+    # _fxReadDevice
+    # -----
+    def _fxReadDevice(self, devId: int, data: c.Array, nFields) -> int:
+        if not self.isStreaming:
+            return fxc.deviceErrorCodes["NOT_STREAMING"].value
+        self._generate()
+        for i, value in enumerate(self._latest):
+            data[i] = value
+        nFields._obj.value = len(self.fields)
+        return fxc.deviceErrorCodes["SUCCESS"].value
+
+    # -----
+    # _fxReadDeviceAllWrapper
+    # -----
+    def _fxReadDeviceAllWrapper(self, devId: int, data: c.Array, nFields) -> None:
+        # Unlike the other functions, no new samples are generated here so
+        # that the number of rows read matches the queue size the caller
+        # just got from fxGetReadDataQueueSize
+        for row in range(min(len(self.queue), len(data))):
+            for i, value in enumerate(self.queue.popleft()):
+                data[row][i] = value
+        nFields._obj.value = len(self.fields)
+
+    # -----
+    # _fxSendMotorCommand
+    # -----
+    def _fxSendMotorCommand(self, devId: int, controller, value: int) -> int:
+        self._generate()
+        self.motor.command(getattr(controller, "value", controller), value)
+        self.commandCount += 1
+        return fxc.deviceErrorCodes["SUCCESS"].value
+
+    # -----
+    # _fxSetGains
+    # -----
+    def _fxSetGains(
+        self, devId: int, kp: int, ki: int, kd: int, k: int, b: int, ff: int
+    ) -> int:
+        self.motor.gains = {"kp": kp, "ki": ki, "kd": kd, "k": k, "b": b, "ff": ff}
+        return fxc.deviceErrorCodes["SUCCESS"].value
+
+    # -----
+    # _fxFindPoles
+    # -----
+    def _fxFindPoles(self, devId: int) -> int:
+        return fxc.deviceErrorCodes["SUCCESS"].value
+
+    # -----
+    # _fxSetImuCalibration
+    # -----
+    def _fxSetImuCalibration(self, devId: int) -> int:
+        return fxc.deviceErrorCodes["SUCCESS"].value
+
+    # -----
+    # _fxGetMaxDeviceNameLength
+    # -----
+    def _fxGetMaxDeviceNameLength(self) -> int:
+        return self.maxDeviceNameLength
+
+    # -----
+    # _fxGetDeviceTypeNameWrapper
+    # -----
+    def _fxGetDeviceTypeNameWrapper(self, devId: int, name: c.Array) -> int:
+        name.value = self.deviceName.encode("utf-8")
+        return fxc.deviceErrorCodes["SUCCESS"].value
+
+    # -----
+    # _fxGetMaxDeviceSideNameLength
+    # -----
+    def _fxGetMaxDeviceSideNameLength(self) -> int:
+        return self.maxDeviceNameLength
+
+    # -----
+    # _fxGetDeviceSideNameWrapper
+    # -----
+    def _fxGetDeviceSideNameWrapper(self, devId: int, side: c.Array) -> int:
+        side.value = self.side.encode("utf-8")
+        return fxc.deviceErrorCodes["SUCCESS"].value
+
+    # -----
+    # _fxGetLibsVersion
+    # -----
+    def _fxGetLibsVersion(self, major, minor, patch) -> int:
+        versions = (int(v) for v in self.libVersion.split("."))
+        for ref, value in zip((major, minor, patch), versions):
+            ref._obj.value = value
+        return fxc.deviceErrorCodes["SUCCESS"].value
+
+    # -----
+    # _fxRequestFirmwareVersion
+    # -----
+    def _fxRequestFirmwareVersion(self, devId: int) -> int:
+        def apply() -> None:
+            encoded = self._encode_firmware()
+            self._lastFirmware = Firmware(encoded, encoded, encoded, encoded)
+
+        self._respond(apply)
+        return fxc.deviceErrorCodes["SUCCESS"].value
+
+    # -----
+    # _fxGetLastReceivedFirmwareVersion
+    # -----
+    def _fxGetLastReceivedFirmwareVersion(self, devId: int) -> Firmware:
+        self._deliver()
+        return self._lastFirmware
+
+    # -----
+    # _fxSetUVLO
+    # -----
+    def _fxSetUVLO(self, devId: int, value: int) -> int:
+        self._uvlo = value
+        return fxc.deviceErrorCodes["SUCCESS"].value
+
+    # -----
+    # _fxRequestUVLO
+    # -----
+    def _fxRequestUVLO(self, devId: int) -> int:
+        uvlo = self._uvlo
+        self._respond(lambda: setattr(self, "_lastUvlo", uvlo))
+        return fxc.deviceErrorCodes["SUCCESS"].value
+
+    # -----
+    # _fxGetLastReceivedUVLO
+    # -----
+    def _fxGetLastReceivedUVLO(self, devId: int) -> int:
+        self._deliver()
+        return self._lastUvlo
+
+    # -----
+    # _fxGetNumUtts
+    # -----
+    def _fxGetNumUtts(self) -> int:
+        return self.nUtts
+
+    # -----
+    # _fxSetUTT
+    # -----
+    def _fxSetUTT(self, devId: int, data: c.Array, nVals: int, index) -> int:
+        index = getattr(index, "value", index)
+        if index == -1:
+            self._utts[:nVals] = data[:nVals]
+        else:
+            self._utts[index] = data[index]
+        return fxc.deviceErrorCodes["SUCCESS"].value
+
+    # -----
+    # _fxSetUTTsToDefault
+    # -----
+    def _fxSetUTTsToDefault(self, devId: int) -> int:
+        self._utts = [0] * self.nUtts
+        return fxc.deviceErrorCodes["SUCCESS"].value
+
+    # -----
+    # _fxSaveUTTToMemory
+    # -----
+    def _fxSaveUTTToMemory(self, devId: int) -> int:
+        return fxc.deviceErrorCodes["SUCCESS"].value
+
+    # -----
+    # _fxRequestUTT
+    # -----
+    def _fxRequestUTT(self, devId: int) -> int:
+        utts = list(self._utts)
+        self._respond(lambda: setattr(self, "_lastUtts", utts))
+        return fxc.deviceErrorCodes["SUCCESS"].value
+
+    # -----
+    # _fxGetLastReceivedUTT
+    # -----
+    def _fxGetLastReceivedUTT(self, devId: int, data: c.Array, nVals: int) -> int:
+        self._deliver()
+        data[:nVals] = self._lastUtts[:nVals]
+        return fxc.deviceErrorCodes["SUCCESS"].value
+
+    # -----
+    # _fxStartTraining
+    # -----
+    def _fxStartTraining(self, devId: int) -> int:
+        return fxc.deviceErrorCodes["SUCCESS"].value
+
+    # -----
+    # _fxUseSavedTraining
+    # -----
+    def _fxUseSavedTraining(self, devId: int) -> int:
+        return fxc.deviceErrorCodes["SUCCESS"].value
+
+    # -----
+    # _fxDoNotUseSaveTraining
+    # -----
+    def _fxDoNotUseSaveTraining(self, devId: int) -> int:
+        return fxc.deviceErrorCodes["SUCCESS"].value
+
+    # -----
+    # _fxIsUsingSavedTrainingData
+    # -----
+    def _fxIsUsingSavedTrainingData(self, devId: int, singleUser) -> int:
+        singleUser._obj.value = False
+        return fxc.deviceErrorCodes["SUCCESS"].value
+
+    # -----
+    # _fxUpdateTrainingData
+    # -----
+    def _fxUpdateTrainingData(self, devId: int) -> int:
+        return fxc.deviceErrorCodes["SUCCESS"].value
+
+    # -----
+    # _fxGetStepsRemaining
+    # -----
+    def _fxGetStepsRemaining(self, devId: int, steps) -> int:
+        steps._obj.value = 0
+        return fxc.deviceErrorCodes["SUCCESS"].value
+
+    # -----
+    # _fxGetTrainingState
+    # -----
+    def _fxGetTrainingState(self, devId: int, state) -> int:
+        state._obj.value = 2
+        return fxc.deviceErrorCodes["SUCCESS"].value
+
+    # -----
+    # _fxActivateBootloader
+    # -----
+    def _fxActivateBootloader(self, devId: int, target: int) -> int:
+        return fxc.deviceErrorCodes["SUCCESS"].value
+
+    # -----
+    # _fxIsBootloaderActivated
+    # -----
+    def _fxIsBootloaderActivated(self, devId: int) -> int:
+        return fxc.deviceErrorCodes["SUCCESS"].value
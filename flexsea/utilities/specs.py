@@ -1,15 +1,17 @@
-from botocore.exceptions import EndpointConnectionError
 import yaml
 from semantic_version import Version
 
 import flexsea.utilities.constants as fxc
-from flexsea.utilities.aws import s3_download
+from flexsea.utilities.aws import load_s3_stack
+from flexsea.utilities.cache import find_artifact, get_artifact
 
 
 # ============================================
 #               get_device_spec
 # ============================================
-def get_device_spec(deviceName: str, firmwareVersion: Version) -> dict:
+def get_device_spec(
+    deviceName: str, firmwareVersion: Version, timeout: int = 60, offline: bool = False
+) -> dict:
     """
     Loads the correct device specification for legacy devices.
 
@@ -24,30 +26,35 @@ def get_device_spec(deviceName: str, firmwareVersion: Version) -> dict:
         Semantic version string so that the correct spec file can be
         loaded.
 
+    timeout : int, optional
+        Time, in seconds, spent trying to connect to S3 before an
+        exception is raised.
+
+    offline : bool, optional
+        If ``True``, the spec file is never downloaded from S3.
+
     Raises
     ------
     EndpointConnectionError
         If we cannot connect to the internet to search for the file.
 
+    FileNotFoundError
+        If ``offline`` is ``True`` and there is no cached spec file.
+
     Returns
     -------
     Dict
         A dictionary containing the field names and data types.
     """
-    deviceSpecFile = fxc.legacyDeviceSpecsPath.joinpath(
-        str(firmwareVersion), f"{deviceName}.yaml"
-    )
-
-    if not deviceSpecFile.exists():
-        deviceSpecFile.parent.mkdir(parents=True, exist_ok=True)
-        deviceSpecObj = (
-            f"{fxc.legacyDeviceSpecsDir}/{firmwareVersion}/{deviceSpecFile.name}"
-        )
+    deviceSpecObj = f"{fxc.legacyDeviceSpecsDir}/{firmwareVersion}/{deviceName}.yaml"
+    deviceSpecFile = find_artifact(deviceSpecObj)
+
+    if deviceSpecFile is None:
+        if offline:
+            raise FileNotFoundError(f"Error: no cached device spec: {deviceSpecObj}")
         try:
-            s3_download(
-                deviceSpecObj, fxc.dephyPublicFilesBucket, str(deviceSpecFile), None
-            )
-        except EndpointConnectionError as err:
+            deviceSpecFile = get_artifact(deviceSpecObj, deviceSpecObj, timeout)
+        except load_s3_stack().exceptions.EndpointConnectionError as err:
             msg = "Error: could not connect to the internet to download the "
             msg += "necessary device spec file. Please connect to the internet and "
             msg += "try again."
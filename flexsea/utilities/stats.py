@@ -0,0 +1,190 @@
+import math
+from typing import List
+
+
+# ============================================
+#                RunningStats
+# ============================================
+class RunningStats:
+    """
+    Keeps a running count, mean, standard deviation, minimum, and
+    maximum of a stream of values without storing them.
+
+    The mean and variance are updated with Welford's algorithm, so
+    ``update`` is constant time and numerically stable.
+    """
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.mean: float = 0.0
+        self.min: float = math.inf
+        self.max: float = -math.inf
+        self._m2: float = 0.0
+
+    # -----
+    # reset
+    # -----
+    def reset(self) -> None:
+        """
+        Forgets every value seen so far.
+        """
+        self.count = 0
+        self.mean = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._m2 = 0.0
+
+    # -----
+    # update
+    # -----
+    def update(self, value: float) -> None:
+        """
+        Adds ``value`` to the statistics.
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    # -----
+    # std
+    # -----
+    @property
+    def std(self) -> float:
+        """
+        The sample standard deviation of the values seen so far.
+        """
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(self._m2 / (self.count - 1))
+
+    # -----
+    # as_dict
+    # -----
+    def as_dict(self) -> dict:
+        """
+        Returns the statistics as a dictionary.
+        """
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "std": self.std,
+            "min": self.min if self.count else 0.0,
+            "max": self.max if self.count else 0.0,
+        }
+
+
+# ============================================
+#                 Histogram
+# ============================================
+class Histogram:
+    """
+    Counts a stream of values into fixed-width bins without storing
+    them.
+
+    Values below ``low`` or at or above ``high`` are counted in
+    :py:attr:`underflow` and :py:attr:`overflow` rather than in a bin.
+
+    Parameters
+    ----------
+    low : float
+        The lower edge of the first bin.
+
+    high : float
+        The upper edge of the last bin.
+
+    nBins : int
+        The number of bins.
+    """
+
+    def __init__(self, low: float, high: float, nBins: int) -> None:
+        if high <= low or nBins <= 0:
+            raise ValueError("Error: invalid histogram range or number of bins.")
+
+        self.low = low
+        self.high = high
+        self.counts: List[int] = [0] * nBins
+        self.underflow: int = 0
+        self.overflow: int = 0
+        self._width = (high - low) / nBins
+
+    # -----
+    # reset
+    # -----
+    def reset(self) -> None:
+        """
+        Forgets every value seen so far.
+        """
+        self.counts = [0] * len(self.counts)
+        self.underflow = 0
+        self.overflow = 0
+
+    # -----
+    # update
+    # -----
+    def update(self, value: float) -> None:
+        """
+        Counts ``value`` in its bin.
+        """
+        if value < self.low:
+            self.underflow += 1
+        elif value >= self.high:
+            self.overflow += 1
+        else:
+            self.counts[int((value - self.low) / self._width)] += 1
+
+    # -----
+    # edges
+    # -----
+    @property
+    def edges(self) -> List[float]:
+        """
+        The edges of the bins, from ``low`` to ``high``.
+        """
+        return [self.low + i * self._width for i in range(len(self.counts) + 1)]
+
+    # -----
+    # total
+    # -----
+    @property
+    def total(self) -> int:
+        """
+        The number of values seen so far, including those out of range.
+        """
+        return sum(self.counts) + self.underflow + self.overflow
+
+    # -----
+    # percentile
+    # -----
+    def percentile(self, q: float) -> float:
+        """
+        Returns an estimate of the ``q``-th percentile, with ``q``
+        between 0 and 100, given as the upper edge of the bin it falls
+        in. Returns ``low`` if it falls in the underflow and ``inf`` if
+        it falls in the overflow.
+        """
+        target = self.total * q / 100.0
+        seen = self.underflow
+        if seen >= target:
+            return self.low
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return self.low + (i + 1) * self._width
+        return math.inf
+
+    # -----
+    # as_dict
+    # -----
+    def as_dict(self) -> dict:
+        """
+        Returns the histogram as a dictionary.
+        """
+        return {
+            "edges": self.edges,
+            "counts": list(self.counts),
+            "underflow": self.underflow,
+            "overflow": self.overflow,
+        }
@@ -0,0 +1,128 @@
+from threading import Event
+from threading import Thread
+from typing import Callable
+
+
+# ============================================
+#              BackgroundWorker
+# ============================================
+class BackgroundWorker:
+    """
+    Base for the classes that do their work on a background thread,
+    e.g., :py:class:`~flexsea.acquisition.Acquisition`.
+
+    Subclasses call ``_start_worker`` with the function to run on the
+    thread, which should return soon after ``_stopEvent`` is set. An
+    exception raised by that function ends the thread and is raised
+    again, as the cause of a ``RuntimeError``, from :py:meth:`wait` and
+    :py:meth:`stop`.
+
+    Parameters
+    ----------
+    name : str
+        The name of the thread.
+
+    errorMessage : str
+        The message of the ``RuntimeError`` raised when the thread
+        failed.
+    """
+
+    def __init__(self, name: str, errorMessage: str) -> None:
+        self._workerName = name
+        self._errorMessage = errorMessage
+        self._stopEvent = Event()
+        self._thread: Thread | None = None
+        self._error: Exception | None = None
+
+    # -----
+    # _start_worker
+    # -----
+    def _start_worker(self, work: Callable, *args) -> None:
+        self._stopEvent.clear()
+        self._error = None
+        self._thread = Thread(
+            target=self._run_worker, args=(work,) + args, name=self._workerName
+        )
+        self._thread.daemon = True
+        self._thread.start()
+
+    # -----
+    # _run_worker
+    # -----
+    def _run_worker(self, work: Callable, *args) -> None:
+        # We can't raise from here, so we hold on to the error and
+        # re-raise it from wait
+        try:
+            work(*args)
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            self._error = err
+
+    # -----
+    # _raise_if_failed
+    # -----
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise RuntimeError(self._errorMessage) from self._error
+
+    # -----
+    # stop
+    # -----
+    def stop(self) -> None:
+        """
+        Asks the background thread to stop and waits for it to finish.
+
+        Raises
+        ------
+        RuntimeError
+            If the background thread stopped because of an error.
+        """
+        self._stopEvent.set()
+        self.wait()
+
+    # -----
+    # wait
+    # -----
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        Waits for the background thread to finish.
+
+        Parameters
+        ----------
+        timeout : float, None, optional
+            The longest time, in seconds, to wait. Waits for as long as
+            it takes if ``None``.
+
+        Raises
+        ------
+        RuntimeError
+            If the background thread stopped because of an error.
+
+        Returns
+        -------
+        bool
+            ``True`` if the thread has finished.
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                return False
+            self._thread = None
+        self._raise_if_failed()
+        return True
+
+    # -----
+    # running
+    # -----
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    # -----
+    # error
+    # -----
+    @property
+    def error(self) -> Exception | None:
+        """
+        The exception that stopped the background thread, if any.
+        """
+        return self._error
@@ -0,0 +1,294 @@
+import argparse
+import json
+from pathlib import Path
+import sys
+from time import perf_counter_ns
+import tracemalloc
+from typing import Callable, Dict
+
+import numpy as np
+from semantic_version import Version
+
+from flexsea.device import Device
+import flexsea.utilities.constants as fxc
+from flexsea.utilities.decorators import minimum_required_version
+from flexsea.utilities.decorators import requires_status
+from flexsea.utilities.decorators import validate
+from flexsea.utilities.simulator import SimulatedLibrary
+
+baselinesFile = Path(__file__).parent.joinpath("baselines.json")
+
+
+# ============================================
+#               DecoratorTarget
+# ============================================
+class DecoratorTarget:
+    """
+    The smallest object the decorators used by ``Device`` work on, so
+    that their overhead can be measured on its own.
+    """
+
+    # pylint: disable=missing-function-docstring
+
+    def __init__(self) -> None:
+        self.connected = True
+        self.firmwareVersion = Version("12.0.0")
+        self._SUCCESS = fxc.deviceErrorCodes["SUCCESS"]
+
+    def bare(self) -> int:
+        return self._SUCCESS.value
+
+    @requires_status("connected")
+    def status(self) -> int:
+        return self._SUCCESS.value
+
+    @validate
+    def validated(self) -> int:
+        return self._SUCCESS.value
+
+    @minimum_required_version("10.0.0")
+    def versioned(self) -> int:
+        return self._SUCCESS.value
+
+    @minimum_required_version("10.0.0")
+    @requires_status("connected")
+    @validate
+    def stacked(self) -> int:
+        return self._SUCCESS.value
+
+
+# ============================================
+#                  measure
+# ============================================
+def measure(func: Callable, nCalls: int, nWarmup: int = 10) -> Dict[str, float]:
+    """
+    Calls ``func`` ``nCalls`` times and returns the median and 99th
+    percentile latency, in microseconds, the throughput, in calls per
+    second, and the median number of bytes allocated per call.
+    """
+    for _ in range(nWarmup):
+        func()
+
+    times = np.zeros(nCalls, dtype=np.int64)
+    for i in range(nCalls):
+        start = perf_counter_ns()
+        func()
+        times[i] = perf_counter_ns() - start
+
+    # Measured separately since tracing slows every allocation down
+    nTraced = min(nCalls, 200)
+    allocated = np.zeros(nTraced, dtype=np.int64)
+    tracemalloc.start()
+    for i in range(nTraced):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        func()
+        allocated[i] = tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+
+    return {
+        "p50": float(np.percentile(times, 50)) / 1000.0,
+        "p99": float(np.percentile(times, 99)) / 1000.0,
+        "throughput": 1e9 / float(np.mean(times)),
+        "bytes": float(np.median(allocated)),
+    }
+
+
+# ============================================
+#              run_benchmarks
+# ============================================
+def run_benchmarks(nCalls: int, frequency: int) -> Dict[str, Dict[str, float]]:
+    device = Device("12.0.0", "sim", clib=SimulatedLibrary(seed=0), debug=True)
+    device.open()
+    device.start_streaming(frequency)
+
+    tracked = Device(
+        "12.0.0", "sim", clib=SimulatedLibrary(seed=0), debug=True, trackStatus=True
+    )
+    tracked.open()
+    tracked.start_streaming(frequency)
+
+    target = DecoratorTarget()
+    send = device.fast_commander("current")
+    trajectory = np.zeros(100, dtype=np.int64)
+
+    benchmarks = {
+        "read": (device.read, nCalls),
+        "read_allData": (lambda: device.read(allData=True), nCalls),
+        "read_array": (device.read_array, nCalls),
+        "read_all_array": (device.read_all_array, nCalls),
+        "command_motor_current": (lambda: device.command_motor_current(0), nCalls),
+        "command_motor_position": (lambda: device.command_motor_position(0), nCalls),
+        "command_motor_impedance": (
+            lambda: device.command_motor_impedance(0),
+            nCalls,
+        ),
+        "fast_commander": (lambda: send(0), nCalls),
+        # Sends 100 commands per call
+        "fast_commander_send_many": (
+            lambda: send.send_many(trajectory, 0),
+            nCalls // 100,
+        ),
+        "read_tracked": (tracked.read, nCalls),
+        "command_motor_current_tracked": (
+            lambda: tracked.command_motor_current(0),
+            nCalls,
+        ),
+        # set_gains sleeps between its retries, so it gets fewer calls
+        "set_gains": (lambda: device.set_gains(40, 400, 0, 600, 300, 128), 50),
+        "decorator_none": (target.bare, nCalls),
+        "decorator_requires_status": (target.status, nCalls),
+        "decorator_validate": (target.validated, nCalls),
+        "decorator_minimum_required_version": (target.versioned, nCalls),
+        "decorator_stack": (target.stacked, nCalls),
+    }
+
+    # A pure-Python workload, timed right before each benchmark, used to
+    # correct for the speed of the machine (and its current clock speed)
+    # when comparing against the baselines
+    results = {}
+    for name, (func, n) in benchmarks.items():
+        reference = measure(lambda: sum(range(100)), nCalls)
+        results[name] = measure(func, n)
+        results[name]["reference"] = reference["p50"]
+
+    for dev in (device, tracked):
+        dev.stop_motor()
+        dev.close()
+
+    return results
+
+
+# ============================================
+#                  compare
+# ============================================
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baselines: Dict[str, Dict[str, float]],
+    tolerance: float,
+    tailTolerance: float | None,
+) -> bool:
+    """
+    Prints the results next to their baselines and returns ``True`` if
+    the median latency or the allocations are worse than ``tolerance``
+    times their baseline. The 99th percentile latency is much noisier,
+    so it is only checked if ``tailTolerance`` is given.
+    """
+    tolerances = {"p50": tolerance, "bytes": tolerance}
+    if tailTolerance is not None:
+        tolerances["p99"] = tailTolerance
+
+    failed = False
+
+    header = f"{'benchmark':36} {'p50 (us)':>10} {'p99 (us)':>10} "
+    header += f"{'calls/s':>10} {'bytes':>8}  status"
+    print(header)
+
+    for name, result in results.items():
+        status = "new"
+        if name in baselines:
+            status = "ok"
+            # Latencies are compared after scaling the baselines by how much
+            # slower or faster the reference workload ran this time
+            speed = result["reference"] / baselines[name].get(
+                "reference", result["reference"]
+            )
+            for key, keyTolerance in tolerances.items():
+                # Allow a little slack so that zero-byte baselines don't fail
+                # on a single stray allocation
+                limit = baselines[name][key] * keyTolerance
+                if key == "bytes":
+                    limit += 64
+                else:
+                    limit *= speed
+                if result[key] > limit:
+                    status = f"REGRESSED ({key})"
+                    failed = True
+
+        line = f"{name:36} {result['p50']:10.2f} {result['p99']:10.2f} "
+        line += f"{result['throughput']:10.0f} {result['bytes']:8.0f}  {status}"
+        print(line)
+
+    return failed
+
+
+# ============================================
+#                    main
+# ============================================
+def main(
+    nCalls: int,
+    frequency: int,
+    tolerance: float,
+    tailTolerance: float | None,
+    update: bool,
+) -> int:
+    results = run_benchmarks(nCalls, frequency)
+
+    baselines = {}
+    if baselinesFile.exists():
+        with open(baselinesFile, "r", encoding="utf-8") as fd:
+            baselines = json.load(fd)
+
+    failed = compare(results, baselines, tolerance, tailTolerance)
+
+    if update:
+        with open(baselinesFile, "w", encoding="utf-8") as fd:
+            json.dump(results, fd, indent=4, sort_keys=True)
+            fd.write("\n")
+        print(f"Baselines written to: {baselinesFile}")
+        return 0
+
+    return int(failed)
+
+
+# ============================================
+#                  Run Main
+# ============================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-n",
+        "--calls",
+        dest="nCalls",
+        type=int,
+        default=5000,
+        help="Number of times each benchmarked function is called.",
+    )
+    parser.add_argument(
+        "-f",
+        "--frequency",
+        dest="frequency",
+        type=int,
+        default=1000,
+        help="Streaming frequency of the simulated device, in Hz.",
+    )
+    parser.add_argument(
+        "-t",
+        "--tolerance",
+        dest="tolerance",
+        type=float,
+        default=2.0,
+        help="Largest allowed ratio between a median latency or allocation "
+        + "and its baseline.",
+    )
+    parser.add_argument(
+        "--tail-tolerance",
+        dest="tailTolerance",
+        type=float,
+        default=None,
+        help="Largest allowed ratio between a 99th percentile latency and its "
+        + "baseline. Not checked by default.",
+    )
+    parser.add_argument(
+        "-u",
+        "--update",
+        dest="update",
+        action="store_true",
+        help="Store the results as the new baselines.",
+    )
+    args = parser.parse_args()
+    sys.exit(
+        main(
+            args.nCalls, args.frequency, args.tolerance, args.tailTolerance, args.update
+        )
+    )
@@ -0,0 +1,88 @@
+import argparse
+import json
+import statistics
+import subprocess as sub
+import sys
+
+# Modules that must only be loaded when something has to be fetched from S3
+lazyModules = ["boto3", "botocore", "pendulum"]
+
+# Run in a fresh interpreter so that nothing is already cached in sys.modules
+importScript = f"""
+import json
+import sys
+from time import perf_counter
+
+start = perf_counter()
+import flexsea.device
+elapsed = perf_counter() - start
+
+loaded = [m for m in {lazyModules!r} if m in sys.modules]
+print(json.dumps({{"elapsed": elapsed, "loaded": loaded}}))
+"""
+
+
+# ============================================
+#                time_import
+# ============================================
+def time_import() -> dict:
+    result = sub.run(
+        [sys.executable, "-c", importScript], capture_output=True, check=True, text=True
+    )
+    return json.loads(result.stdout)
+
+
+# ============================================
+#                    main
+# ============================================
+def main(nRuns: int, budget: float) -> int:
+    results = [time_import() for _ in range(nRuns)]
+    times = [result["elapsed"] for result in results]
+    median = statistics.median(times)
+
+    print(f"import flexsea.device over {nRuns} runs:")
+    print(f"\tmedian: {median * 1000:.1f} ms")
+    print(f"\tmin: {min(times) * 1000:.1f} ms")
+    print(f"\tmax: {max(times) * 1000:.1f} ms")
+    print(f"\tbudget: {budget * 1000:.1f} ms")
+
+    failed = False
+
+    loaded = results[0]["loaded"]
+    if loaded:
+        print(f"FAIL: eagerly imported: {', '.join(loaded)}")
+        failed = True
+
+    if median > budget:
+        print("FAIL: median import time is over budget.")
+        failed = True
+
+    if not failed:
+        print("PASS")
+
+    return int(failed)
+
+
+# ============================================
+#                  Run Main
+# ============================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-n",
+        "--runs",
+        dest="nRuns",
+        type=int,
+        default=10,
+        help="Number of times to import flexsea.device.",
+    )
+    parser.add_argument(
+        "-b",
+        "--budget",
+        dest="budget",
+        type=float,
+        default=0.5,
+        help="Largest allowed median import time, in seconds.",
+    )
+    args = parser.parse_args()
+    sys.exit(main(args.nRuns, args.budget))
@@ -0,0 +1,159 @@
+import hashlib
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterator, List
+
+import pytest
+
+from flexsea.device import Device
+from flexsea.utilities import aws
+from flexsea.utilities import cache
+from flexsea.utilities import labels
+from flexsea.utilities.aws import load_s3_stack
+import flexsea.utilities.constants as fxc
+from flexsea.utilities.simulator import SimulatedLibrary
+
+
+# ============================================
+#                  dephy_dir
+# ============================================
+@pytest.fixture
+def dephy_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """
+    Points ``~/.dephy`` at a temporary directory, with nothing cached in
+    memory, so that tests never read or write the real cache.
+    """
+    dephyPath = tmp_path.joinpath(".dephy")
+    monkeypatch.setattr(fxc, "dephyPath", dephyPath)
+    monkeypatch.setattr(
+        fxc, "fieldLabelsCacheFile", dephyPath.joinpath("field_labels.yaml")
+    )
+    monkeypatch.setattr(fxc, "s3ManifestsPath", dephyPath.joinpath("s3_manifests"))
+    monkeypatch.setattr(
+        fxc, "firmwareVersionCacheFile", dephyPath.joinpath("available_versions.yaml")
+    )
+    monkeypatch.setattr(cache, "_sharedCacheDir", None)
+    monkeypatch.setattr(labels, "_labelCache", None)
+    monkeypatch.setattr(aws, "_manifests", {})
+    return dephyPath
+
+
+# ============================================
+#                   device
+# ============================================
+@pytest.fixture
+def device(dephy_dir: Path) -> Iterator[Device]:
+    """
+    An open simulated device streaming at 1 kHz.
+    """
+    # The device creates ~/.dephy, so it has to be the temporary one
+    # pylint: disable=redefined-outer-name,unused-argument
+    dev = Device("12.0.0", "sim", clib=SimulatedLibrary(seed=0), debug=True)
+    dev.open()
+    dev.start_streaming(1000)
+    yield dev
+    dev.close()
+
+
+# ============================================
+#                 FakeBody
+# ============================================
+class FakeBody:
+    def __init__(self, data: bytes) -> None:
+        self._data = data
+
+    # -----
+    # iter_chunks
+    # -----
+    def iter_chunks(self, chunkSize: int) -> Iterator[bytes]:
+        for i in range(0, len(self._data), chunkSize):
+            yield self._data[i : i + chunkSize]
+
+
+# ============================================
+#               FakePaginator
+# ============================================
+class FakePaginator:
+    def __init__(self, client: "FakeS3Client") -> None:
+        self._client = client
+
+    # -----
+    # paginate
+    # -----
+    def paginate(self, Bucket: str, Prefix: str = "") -> Iterator[dict]:
+        # pylint: disable=invalid-name,unused-argument
+        self._client.listed.append(Prefix)
+        keys = [key for key in self._client.objects if key.startswith(Prefix)]
+        # Two keys per page, so that listing takes several requests
+        for i in range(0, len(keys), 2):
+            yield {"Contents": [{"Key": key} for key in keys[i : i + 2]]}
+
+
+# ============================================
+#                FakeS3Client
+# ============================================
+class FakeS3Client:
+    """
+    Stands in for a boto3 S3 client, serving ``objects`` from memory
+    and recording the downloads and listings made.
+    """
+
+    def __init__(self, objects: Dict[str, bytes]) -> None:
+        self.objects = dict(objects)
+        self.downloads: List[str] = []
+        self.listed: List[str] = []
+        self._lock = Lock()
+
+    # -----
+    # head_object
+    # -----
+    def head_object(self, Bucket: str, Key: str) -> dict:
+        # pylint: disable=invalid-name,unused-argument
+        if Key not in self.objects:
+            error = {"Error": {"Code": "404", "Message": "Not Found"}}
+            raise load_s3_stack().exceptions.ClientError(error, "HeadObject")
+        data = self.objects[Key]
+        return {
+            "ETag": f'"{hashlib.md5(data).hexdigest()}"',
+            "ContentLength": len(data),
+        }
+
+    # -----
+    # get_object
+    # -----
+    def get_object(self, Bucket: str, Key: str, Range: str = "bytes=0-") -> dict:
+        # pylint: disable=invalid-name,unused-argument
+        with self._lock:
+            self.downloads.append(Key)
+        offset = int(Range.split("=")[1].rstrip("-"))
+        return {"Body": FakeBody(self.objects[Key][offset:])}
+
+    # -----
+    # get_paginator
+    # -----
+    def get_paginator(self, name: str) -> FakePaginator:
+        assert name == "list_objects_v2"
+        return FakePaginator(self)
+
+
+# ============================================
+#                 s3_client
+# ============================================
+@pytest.fixture
+def s3_client() -> FakeS3Client:
+    """
+    A fake client for a bucket laid out like the public one, in which
+    two versions share the same library.
+    """
+    library = bytes(range(256)) * 10
+    return FakeS3Client(
+        {
+            "precompiled_c_libs/12.0.0/linux_64bit/libfx_plan_stack.so": library,
+            "precompiled_c_libs/12.1.0/linux_64bit/libfx_plan_stack.so": library,
+            "precompiled_c_libs/12.1.0/windows_64bit/libfx_plan_stack.dll": b"dll",
+            "precompiled_c_libs/9.1.0/linux_64bit/libfx_plan_stack.so": b"old",
+            "legacy_device_specs/9.1.0/actpack.yaml": b"specs",
+            "firmware/12.0.0/actpack/mn.dfu": b"mn",
+            "firmware/12.1.0/actpack/mn.dfu": b"mn2",
+        }
+    )
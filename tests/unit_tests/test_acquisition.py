@@ -0,0 +1,143 @@
+from time import sleep
+from typing import Tuple
+
+import numpy as np
+import pytest
+
+from flexsea.acquisition import Acquisition
+from flexsea.acquisition import RingBuffer
+from flexsea.device import Device
+
+
+# ============================================
+#         test_ring_buffer_wraparound
+# ============================================
+def test_ring_buffer_wraparound() -> None:
+    buffer = RingBuffer(5, (2,), np.int32)
+    rows = np.arange(16, dtype=np.int32).reshape(8, 2)
+
+    buffer.write(rows[:3])
+    buffer.write(rows[3:])
+
+    assert buffer.written == 8
+    assert buffer.oldest == 3
+    np.testing.assert_array_equal(buffer.snapshot(), rows[3:])
+    np.testing.assert_array_equal(buffer.latest(2), rows[6:])
+    # Rows that were overwritten are left out
+    np.testing.assert_array_equal(buffer.read(0, 5), rows[3:5])
+
+
+# ============================================
+#      test_ring_buffer_write_more_than_fits
+# ============================================
+def test_ring_buffer_write_more_than_fits() -> None:
+    buffer = RingBuffer(4, (), np.int64)
+    buffer.write(np.arange(3))
+    buffer.write(np.arange(3, 13))
+
+    assert buffer.written == 13
+    np.testing.assert_array_equal(buffer.snapshot(), np.arange(9, 13))
+
+
+# ============================================
+#            test_ring_buffer_empty
+# ============================================
+def test_ring_buffer_empty() -> None:
+    buffer = RingBuffer(3, (2,), np.int32)
+
+    assert buffer.snapshot().shape == (0, 2)
+    with pytest.raises(ValueError):
+        RingBuffer(0, (2,), np.int32)
+
+
+# ============================================
+#              FakeReader
+# ============================================
+class FakeReader:
+    """
+    Stands in for ``Device.read_all_array``, returning the given
+    batches of ``(state_time, value)`` rows one at a time.
+    """
+
+    def __init__(self, batches: list) -> None:
+        self._batches = list(batches)
+
+    # -----
+    # __call__
+    # -----
+    def __call__(self) -> Tuple[np.ndarray, int]:
+        if not self._batches:
+            return np.zeros((0, 2), dtype=np.int32), 0
+        batch = np.asarray(self._batches.pop(0), dtype=np.int32)
+        return batch, len(batch)
+
+
+# ============================================
+#              run_acquisition
+# ============================================
+def run_acquisition(batches: list, capacity: int) -> Acquisition:
+    acquisition = Acquisition(
+        FakeReader(batches), capacity, (2,), np.int32, 0, 0.001, samplePeriod=1.0
+    )
+    acquisition.start()
+    while acquisition.nSamples < sum(len(batch) for batch in batches):
+        acquisition.wait(0.001)
+    acquisition.stop()
+    return acquisition
+
+
+# ============================================
+#            test_acquisition_since
+# ============================================
+def test_acquisition_since() -> None:
+    batches = [[[t, 10 * t] for t in range(1, 5)], [[t, 10 * t] for t in range(5, 9)]]
+    acquisition = run_acquisition(batches, 16)
+
+    since = acquisition.since(5)
+    np.testing.assert_array_equal(since[:, 0], [6, 7, 8])
+    np.testing.assert_array_equal(since[:, 1], [60, 70, 80])
+    assert len(acquisition.since(8)) == 0
+    assert len(acquisition.since(0)) == 8
+    np.testing.assert_array_equal(acquisition.latest(), [8, 80])
+
+
+# ============================================
+#       test_acquisition_since_wraparound
+# ============================================
+def test_acquisition_since_wraparound() -> None:
+    batches = [[[t, t] for t in range(i, i + 3)] for i in range(1, 10, 3)]
+    acquisition = run_acquisition(batches, 4)
+
+    # Only the last four samples are still held
+    np.testing.assert_array_equal(acquisition.since(0)[:, 0], [6, 7, 8, 9])
+    np.testing.assert_array_equal(acquisition.since(7)[:, 0], [8, 9])
+    assert acquisition.overruns == 0
+
+
+# ============================================
+#           test_acquisition_overruns
+# ============================================
+def test_acquisition_overruns() -> None:
+    batches = [[[1, 0], [2, 0]], [[5, 0], [6, 0]], [[10, 0]]]
+    acquisition = run_acquisition(batches, 16)
+
+    # 3 and 4, then 7, 8, and 9 never arrived
+    assert acquisition.overruns == 5
+
+
+# ============================================
+#         test_device_acquisition
+# ============================================
+def test_device_acquisition(device: Device) -> None:
+    acquisition = device.start_acquisition(bufferSeconds=1.0)
+    sleep(0.1)
+    with pytest.raises(RuntimeError):
+        device.start_acquisition()
+    device.stop_acquisition()
+
+    rows = acquisition.snapshot()
+    assert len(rows) == acquisition.nSamples > 50
+    times = rows[:, device.fieldIndex["state_time"]]
+    assert np.all(np.diff(times) > 0)
+    np.testing.assert_array_equal(acquisition.since(times[-3]), rows[-2:])
+    assert acquisition.overruns == 0
@@ -0,0 +1,96 @@
+import asyncio
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from flexsea.async_device import AsyncDevice
+from flexsea.utilities.simulator import SimulatedLibrary
+
+
+# ============================================
+#                create_device
+# ============================================
+async def create_device(**kwargs) -> AsyncDevice:
+    clib = SimulatedLibrary(seed=0, **kwargs)
+    return await AsyncDevice.create("12.0.0", "sim", clib=clib, debug=True)
+
+
+# ============================================
+#                test_stream
+# ============================================
+@pytest.mark.parametrize("asArray", [False, True])
+def test_stream(dephy_dir: Path, asArray: bool) -> None:
+    # pylint: disable=unused-argument
+    async def main() -> list:
+        samples = []
+        async with await create_device() as device:
+            await device.start_streaming(1000)
+            async for sample in device.stream(asArray):
+                samples.append(sample)
+                if len(samples) == 20:
+                    break
+            await device.stop_streaming()
+            # Attributes of the wrapped device are forwarded
+            assert device.streaming is False
+        assert not device.connected
+        return samples
+
+    samples = asyncio.run(main())
+
+    if asArray:
+        times = [int(sample[0]) for sample in samples]
+        assert all(isinstance(sample, np.ndarray) for sample in samples)
+    else:
+        times = [sample["state_time"] for sample in samples]
+    assert len(times) == 20
+    assert times == sorted(times)
+
+
+# ============================================
+#               test_commands
+# ============================================
+def test_commands(dephy_dir: Path) -> None:
+    # pylint: disable=unused-argument
+    async def main() -> None:
+        clib = SimulatedLibrary(seed=0)
+        dev = await AsyncDevice.create("12.0.0", "sim", clib=clib, debug=True)
+        async with dev as device:
+            await device.command_motor_current(700)
+            assert clib.motor.setpoint == 700
+            await device.command_motor_voltage(-300)
+            assert clib.motor.setpoint == -300
+            await device.stop_motor()
+            assert clib.motor.setpoint == 0
+
+    asyncio.run(main())
+
+
+# ============================================
+#       test_requests_dont_block_the_loop
+# ============================================
+def test_requests_dont_block_the_loop(dephy_dir: Path) -> None:
+    # pylint: disable=unused-argument
+    async def tick(ticks: list, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            ticks.append(1)
+            await asyncio.sleep(0.001)
+
+    async def main() -> tuple:
+        ticks = []
+        stop = asyncio.Event()
+        async with await create_device(responseDelay=0.05) as device:
+            device.set_uvlo(18000)
+            ticker = asyncio.create_task(tick(ticks, stop))
+            uvlo = await device.get_uvlo(timeout=1.0)
+            firmware = await device.firmware_version(timeout=1.0)
+            stop.set()
+            await ticker
+        return uvlo, firmware, len(ticks)
+
+    uvlo, firmware, nTicks = asyncio.run(main())
+
+    assert uvlo == 18000
+    assert firmware["mn"] == "12.0.0"
+    # The loop kept running while waiting for both answers
+    assert nTicks > 20
@@ -0,0 +1,311 @@
+from pathlib import Path
+from typing import List
+
+from botocore.awsrequest import AWSResponse
+from botocore.exceptions import EndpointConnectionError
+import pytest
+
+from flexsea.utilities import aws
+from flexsea.utilities import firmware
+from flexsea.utilities.aws import S3Manifest
+from flexsea.utilities.aws import close_s3_clients
+from flexsea.utilities.aws import get_s3_client
+from flexsea.utilities.aws import get_s3_manifest
+from flexsea.utilities.aws import get_s3_timings
+from flexsea.utilities.aws import reset_s3_timings
+from flexsea.utilities.aws import s3_find_object
+import flexsea.utilities.constants as fxc
+
+_bucket = "bucket"
+
+
+# ============================================
+#                  clients
+# ============================================
+@pytest.fixture
+def clients(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Starts with no shared clients and no timings.
+    """
+    monkeypatch.setattr(aws, "_clients", {})
+    monkeypatch.setattr(aws, "_timings", {})
+
+
+# ============================================
+#             test_shared_client
+# ============================================
+def test_shared_client(clients) -> None:
+    # pylint: disable=redefined-outer-name,unused-argument
+    client = get_s3_client()
+    assert get_s3_client(None, 60) is client
+    assert get_s3_client(None, 5) is not client
+    assert client.meta.config.max_pool_connections == fxc.s3MaxPoolConnections
+
+    close_s3_clients()
+    assert get_s3_client() is not client
+    close_s3_clients()
+
+
+# ============================================
+#               test_timings
+# ============================================
+def test_timings(clients) -> None:
+    # pylint: disable=redefined-outer-name,unused-argument
+    client = get_s3_client(None, 1)
+
+    class Body:
+        def stream(self, **kwargs):
+            # pylint: disable=unused-argument
+            yield b""
+
+    # Answers every request without going over the network
+    def respond(request, **kwargs):
+        # pylint: disable=unused-argument
+        headers = {"Content-Length": "3", "ETag": '"abc"'}
+        return AWSResponse(request.url, 200, headers, Body())
+
+    client.meta.events.register("before-send.s3", respond)
+    for _ in range(2):
+        assert client.head_object(Bucket=_bucket, Key="a")["ContentLength"] == 3
+    client.meta.events.unregister("before-send.s3", respond)
+
+    timings = get_s3_timings()
+    assert list(timings) == ["HeadObject"]
+    assert timings["HeadObject"]["count"] == 2
+    assert timings["HeadObject"]["min"] >= 0
+
+    # Requests that fail before getting a response are timed too
+    def fail(**kwargs) -> None:
+        # pylint: disable=unused-argument
+        raise ValueError("unreachable")
+
+    client.meta.events.register("before-send.s3", fail)
+    with pytest.raises(ValueError):
+        client.get_object(Bucket=_bucket, Key="a")
+    client.meta.events.unregister("before-send.s3", fail)
+    assert get_s3_timings()["GetObject"]["count"] == 1
+
+    reset_s3_timings()
+    assert not get_s3_timings()
+    close_s3_clients()
+
+
+# ============================================
+#                test_find
+# ============================================
+def test_find(s3_client) -> None:
+    manifest = S3Manifest(_bucket, list(s3_client.objects))
+
+    assert manifest.find("mn.dfu") == [
+        "firmware/12.0.0/actpack/mn.dfu",
+        "firmware/12.1.0/actpack/mn.dfu",
+    ]
+    assert manifest.find("12.1.0/actpack/mn.dfu") == ["firmware/12.1.0/actpack/mn.dfu"]
+    assert manifest.find("firmware/12.0.0/actpack/mn.dfu") == [
+        "firmware/12.0.0/actpack/mn.dfu"
+    ]
+    assert manifest.find("mn.dfu", prefix="firmware/12.0.0/") == [
+        "firmware/12.0.0/actpack/mn.dfu"
+    ]
+    # Only whole path components match
+    assert manifest.find("2.0.0/actpack/mn.dfu") == []
+    assert manifest.find("missing.dfu") == []
+
+
+# ============================================
+#           test_versions_and_for_version
+# ============================================
+def test_versions_and_for_version(s3_client) -> None:
+    manifest = S3Manifest(_bucket, list(s3_client.objects))
+
+    assert manifest.versions(fxc.libsDir) == ["9.1.0", "12.0.0", "12.1.0"]
+    assert manifest.versions(fxc.legacyDeviceSpecsDir) == ["9.1.0"]
+    assert manifest.for_version("12.1.0", "windows_64bit") == [
+        "precompiled_c_libs/12.1.0/windows_64bit/libfx_plan_stack.dll"
+    ]
+    assert len(manifest.for_version("12.1.0")) == 3
+
+
+# ============================================
+#              test_save_and_load
+# ============================================
+def test_save_and_load(tmp_path: Path, s3_client) -> None:
+    manifest = S3Manifest(_bucket, list(s3_client.objects), {"": 10.0})
+    manifest = manifest.with_prefix("firmware/", ["firmware/13.0.0/actpack/mn.dfu"])
+    fileName = tmp_path.joinpath("manifest.json")
+    manifest.save(fileName)
+
+    loaded = S3Manifest.load(fileName)
+    assert loaded.keys == manifest.keys
+    assert loaded.listed == manifest.listed
+    assert loaded.listed[""] == 10.0
+    assert loaded.find("mn.dfu") == ["firmware/13.0.0/actpack/mn.dfu"]
+    assert loaded.age_of("firmware/13.0.0/") < loaded.age_of(fxc.libsDir)
+    assert S3Manifest(_bucket, [], {"firmware/": 10.0}).age_of("") == float("inf")
+
+
+# ============================================
+#          test_get_s3_manifest_prefix
+# ============================================
+def test_get_s3_manifest_prefix(dephy_dir: Path, s3_client) -> None:
+    # Only the part of the bucket asked for is listed
+    manifest = get_s3_manifest(_bucket, s3_client, prefix="firmware/")
+    assert s3_client.listed == ["firmware/"]
+    assert manifest.find("mn.dfu", "firmware/12.1.0/")
+    assert not manifest.for_version("9.1.0")
+    assert dephy_dir.joinpath("s3_manifests", f"{_bucket}.json").exists()
+
+    # Which covers the parts within it
+    assert get_s3_manifest(_bucket, s3_client, prefix="firmware/12.0.0/") is manifest
+    assert s3_client.listed == ["firmware/"]
+
+    # Other parts are listed on their own and added to the manifest
+    manifest = get_s3_manifest(_bucket, s3_client, prefix=f"{fxc.libsDir}/")
+    assert s3_client.listed == ["firmware/", f"{fxc.libsDir}/"]
+    assert manifest.versions(fxc.libsDir) == ["9.1.0", "12.0.0", "12.1.0"]
+    assert manifest.find("mn.dfu", "firmware/12.1.0/")
+
+    # Out-of-date parts are listed again
+    manifest.listed["firmware/"] -= 2 * fxc.s3ManifestTtl
+    get_s3_manifest(_bucket, s3_client, prefix="firmware/12.0.0/")
+    assert s3_client.listed[2:] == ["firmware/12.0.0/"]
+    get_s3_manifest(_bucket, s3_client, prefix=f"{fxc.libsDir}/")
+    assert len(s3_client.listed) == 3
+
+    # The manifest is shared with other processes through ~/.dephy
+    aws._manifests.clear()  # pylint: disable=protected-access
+    manifest = get_s3_manifest(_bucket, s3_client, prefix=f"{fxc.libsDir}/")
+    assert len(s3_client.listed) == 3
+    assert manifest.find("mn.dfu", "firmware/12.0.0/")
+
+
+# ============================================
+#          test_listing_outside_lock
+# ============================================
+def test_listing_outside_lock(
+    dephy_dir: Path, s3_client, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # pylint: disable=unused-argument,protected-access
+    listKeys = aws.list_s3_keys
+    locked: List[bool] = []
+
+    def list_keys(*args) -> List[str]:
+        locked.append(aws._manifestsLock.locked())
+        return listKeys(*args)
+
+    monkeypatch.setattr(aws, "list_s3_keys", list_keys)
+    get_s3_manifest(_bucket, s3_client, prefix="firmware/")
+    get_s3_manifest(_bucket, s3_client, refresh=True, prefix="firmware/")
+    assert locked == [False, False]
+
+
+# ============================================
+#          test_get_s3_manifest_offline
+# ============================================
+def test_get_s3_manifest_offline(
+    dephy_dir: Path, s3_client, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # pylint: disable=unused-argument
+    manifest = get_s3_manifest(_bucket, s3_client, prefix="firmware/")
+
+    def unreachable(*args) -> List[str]:
+        raise EndpointConnectionError(endpoint_url="https://s3.amazonaws.com")
+
+    monkeypatch.setattr(aws, "list_s3_keys", unreachable)
+
+    # Out-of-date keys are better than none
+    manifest.listed["firmware/"] -= 2 * fxc.s3ManifestTtl
+    assert get_s3_manifest(_bucket, s3_client, prefix="firmware/") is manifest
+
+    # But keys that were never listed can't be made up
+    with pytest.raises(EndpointConnectionError):
+        get_s3_manifest(_bucket, s3_client, prefix=f"{fxc.libsDir}/")
+
+
+# ============================================
+#        test_find_object_miss_refresh
+# ============================================
+def test_find_object_miss_refresh(dephy_dir: Path, s3_client) -> None:
+    # pylint: disable=unused-argument
+    key = s3_find_object("mn.dfu", _bucket, s3_client, prefix="firmware/12.0.0/")
+    assert key == "firmware/12.0.0/actpack/mn.dfu"
+    assert s3_client.listed == ["firmware/12.0.0/"]
+    s3_client.objects["firmware/12.0.0/actpack/re.dfu"] = b"re"
+
+    # The manifest is too recent to be listed again
+    with pytest.raises(FileNotFoundError):
+        s3_find_object("re.dfu", _bucket, s3_client, prefix="firmware/12.0.0/")
+    assert s3_client.listed == ["firmware/12.0.0/"]
+
+    # Only the part that missed is listed again
+    manifest = get_s3_manifest(_bucket, s3_client, prefix="firmware/12.0.0/")
+    manifest.listed["firmware/12.0.0/"] -= 2 * fxc.s3ManifestMissRefresh
+    key = s3_find_object("re.dfu", _bucket, s3_client, prefix="firmware/12.0.0/")
+    assert key == "firmware/12.0.0/actpack/re.dfu"
+    assert s3_client.listed == ["firmware/12.0.0/"] * 2
+
+    # Another miss in the same part isn't listed again right away
+    with pytest.raises(FileNotFoundError):
+        s3_find_object("missing.dfu", _bucket, s3_client, prefix="firmware/12.0.0/")
+    assert s3_client.listed == ["firmware/12.0.0/"] * 2
+
+
+# ============================================
+#     test_get_available_firmware_versions
+# ============================================
+def test_get_available_firmware_versions(
+    dephy_dir: Path, s3_client, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(firmware, "get_s3_client", lambda *args: s3_client)
+    monkeypatch.setattr(fxc, "dephyPublicFilesBucket", _bucket)
+    dephy_dir.mkdir(parents=True)
+    prefix = f"{fxc.libsDir}/"
+
+    # Even without a manifest, only the libraries are listed
+    versions = firmware.get_available_firmware_versions()
+    assert versions == ["9.1.0", "12.0.0", "12.1.0"]
+    assert s3_client.listed == [prefix]
+
+    s3_client.objects["precompiled_c_libs/13.0.0/linux_64bit/libfx.so"] = b"new"
+    versions = firmware.get_available_firmware_versions()
+    assert versions[-1] == "13.0.0"
+    assert s3_client.listed == [prefix, prefix]
+
+    # Cached for offline use
+    assert firmware.get_available_firmware_versions(offline=True) == versions
+
+
+# ============================================
+#   test_available_firmware_versions_offline
+# ============================================
+def test_available_firmware_versions_offline(
+    dephy_dir: Path,
+    s3_client,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture,
+) -> None:
+    monkeypatch.setattr(firmware, "get_s3_client", lambda *args: s3_client)
+    monkeypatch.setattr(fxc, "dephyPublicFilesBucket", _bucket)
+    dephy_dir.mkdir(parents=True)
+    prefix = f"{fxc.libsDir}/"
+    versions = firmware.get_available_firmware_versions()
+    manifest = get_s3_manifest(_bucket, s3_client, prefix=prefix)
+    manifest.listed[prefix] -= 10 * 86400
+
+    def unreachable(*args) -> List[str]:
+        raise EndpointConnectionError(endpoint_url="https://s3.amazonaws.com")
+
+    monkeypatch.setattr(aws, "list_s3_keys", unreachable)
+    capsys.readouterr()
+
+    # The older manifest is used, with a warning about its age
+    assert firmware.get_available_firmware_versions() == versions
+    out = capsys.readouterr().out
+    assert "from 10 days ago" in out
+    assert "information from: 10 days ago" in out
+
+    # Without one, the cached list of versions is
+    aws._manifests.clear()  # pylint: disable=protected-access
+    fxc.s3ManifestsPath.joinpath(f"{_bucket}.json").unlink()
+    assert firmware.get_available_firmware_versions() == versions
+    assert "unable to access S3 to obtain" in capsys.readouterr().out
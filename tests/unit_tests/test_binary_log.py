@@ -0,0 +1,140 @@
+from pathlib import Path
+from time import sleep
+
+import numpy as np
+import pytest
+
+from flexsea.binary_log import BinaryLog
+from flexsea.binary_log import BinaryLogWriter
+from flexsea.device import Device
+from flexsea.utilities.simulator import simulatedFields
+
+
+# ============================================
+#                 write_log
+# ============================================
+def write_log(fileName: Path, times: np.ndarray) -> np.ndarray:
+    rows = np.column_stack((times, 2 * times)).astype(np.int32)
+    with BinaryLogWriter(fileName, ["state_time", "mot_cur"], {"side": "left"}) as log:
+        # Written in several pieces, as an acquisition would
+        for chunk in np.array_split(rows, 7):
+            log.write(chunk)
+    return rows
+
+
+# ============================================
+#              test_round_trip
+# ============================================
+def test_round_trip(tmp_path: Path) -> None:
+    fileName = tmp_path.joinpath("session.fxlog")
+    rows = write_log(fileName, np.arange(100))
+
+    with BinaryLog(fileName) as log:
+        assert len(log) == 100
+        assert log.fields == ["state_time", "mot_cur"]
+        assert log.metadata == {"side": "left"}
+        np.testing.assert_array_equal(log.data, rows)
+        np.testing.assert_array_equal(log.column("mot_cur"), rows[:, 1])
+
+
+# ============================================
+#                 test_seek
+# ============================================
+@pytest.mark.parametrize("indexStride", [1, 4, 1024])
+def test_seek(tmp_path: Path, indexStride: int) -> None:
+    fileName = tmp_path.joinpath("session.fxlog")
+    # Every other time stamp, with a repeat, so not every one is present
+    times = np.array(sorted(list(range(0, 200, 2)) + [50]))
+    write_log(fileName, times)
+
+    with BinaryLog(fileName, indexStride=indexStride) as log:
+        for timestamp in [-5, 0, 1, 49, 50, 51, 197, 198, 199, 500]:
+            expected = int(np.searchsorted(times, timestamp, "left"))
+            assert log.seek(timestamp) == expected
+
+
+# ============================================
+#                test_between
+# ============================================
+def test_between(tmp_path: Path) -> None:
+    fileName = tmp_path.joinpath("session.fxlog")
+    write_log(fileName, np.arange(0, 3000, 3))
+
+    with BinaryLog(fileName, indexStride=16) as log:
+        rows = log.between(100, 200)
+        np.testing.assert_array_equal(rows[:, 0], np.arange(102, 201, 3))
+        # Both ends are included
+        np.testing.assert_array_equal(log.between(99, 105)[:, 0], [99, 102, 105])
+        assert len(log.between(5000, 6000)) == 0
+
+
+# ============================================
+#           test_partial_row_ignored
+# ============================================
+def test_partial_row_ignored(tmp_path: Path) -> None:
+    fileName = tmp_path.joinpath("session.fxlog")
+    write_log(fileName, np.arange(10))
+    with open(fileName, "ab") as fd:
+        fd.write(b"\x01\x02\x03")
+
+    with BinaryLog(fileName) as log:
+        assert len(log) == 10
+
+
+# ============================================
+#             test_no_time_field
+# ============================================
+def test_no_time_field(tmp_path: Path) -> None:
+    fileName = tmp_path.joinpath("session.fxlog")
+    write_log(fileName, np.arange(10))
+
+    with BinaryLog(fileName, timeField=None) as log:
+        with pytest.raises(RuntimeError):
+            log.seek(5)
+
+
+# ============================================
+#           test_device_binary_log
+# ============================================
+def test_device_binary_log(device: Device, tmp_path: Path) -> None:
+    fileName = tmp_path.joinpath("device.fxlog")
+    writer = device.start_binary_log(fileName)
+    sleep(0.05)
+    device.stop_binary_log()
+    device.stop_acquisition()
+
+    with BinaryLog(fileName) as log:
+        assert len(log) == writer.nRows > 0
+        assert log.fields == simulatedFields
+        assert (np.diff(log.column("state_time")) == 1).all()
+
+
+# ============================================
+#          test_sink_shape_is_checked
+# ============================================
+def test_sink_shape_is_checked(device: Device, tmp_path: Path) -> None:
+    acquisition = device.start_acquisition()
+    with BinaryLogWriter(tmp_path.joinpath("x.fxlog"), ["a", "b"]) as log:
+        with pytest.raises(ValueError):
+            acquisition.add_sink(log.write, (log.nFields,))
+    device.stop_acquisition()
+
+
+# ============================================
+#          test_failed_sink_is_reported
+# ============================================
+def test_failed_sink_is_reported(device: Device, tmp_path: Path) -> None:
+    acquisition = device.start_acquisition()
+    log = BinaryLogWriter(tmp_path.joinpath("x.fxlog"), ["a", "b"])
+    acquisition.add_sink(log.write)
+    sleep(0.05)
+    assert not acquisition.running
+
+    # The error is raised by the next read rather than leaving the
+    # acquisition silently stopped
+    with pytest.raises(RuntimeError):
+        acquisition.latest()
+    with pytest.raises(RuntimeError):
+        device.stop_acquisition()
+    assert isinstance(acquisition.error, ValueError)
+    log.close()
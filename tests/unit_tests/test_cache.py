@@ -0,0 +1,224 @@
+from concurrent.futures import ThreadPoolExecutor
+import io
+import os
+from pathlib import Path
+import socket
+from threading import Event
+from threading import Thread
+from time import sleep
+import zipfile
+
+import pytest
+from semantic_version import Version
+
+from flexsea.utilities import cache
+from flexsea.utilities import specs
+from flexsea.utilities.cache import extract_artifact
+from flexsea.utilities.cache import file_lock
+from flexsea.utilities.cache import find_artifact
+from flexsea.utilities.cache import get_artifact
+from flexsea.utilities.cache import set_shared_cache_dir
+from flexsea.utilities.cache import store_artifact
+from flexsea.utilities.specs import get_device_spec
+
+_bucket = "bucket"
+_lib12 = "precompiled_c_libs/12.0.0/linux_64bit/libfx_plan_stack.so"
+_lib121 = "precompiled_c_libs/12.1.0/linux_64bit/libfx_plan_stack.so"
+
+
+# ============================================
+#            test_store_artifact
+# ============================================
+def test_store_artifact(dephy_dir: Path, s3_client) -> None:
+    status = store_artifact(s3_client, _bucket, _lib12, _lib12, dephy_dir)
+
+    assert status == "downloaded"
+    dest = dephy_dir.joinpath(_lib12)
+    assert dest.read_bytes() == s3_client.objects[_lib12]
+    assert find_artifact(_lib12) == dest
+
+    # Already there
+    assert store_artifact(s3_client, _bucket, _lib12, _lib12, dephy_dir) == "cached"
+    # Identical content under another name isn't downloaded again
+    status = store_artifact(s3_client, _bucket, _lib121, _lib121, dephy_dir)
+    assert status == "cached"
+    assert dephy_dir.joinpath(_lib121).read_bytes() == dest.read_bytes()
+    assert s3_client.downloads == [_lib12]
+
+
+# ============================================
+#       test_store_artifact_concurrently
+# ============================================
+def test_store_artifact_concurrently(dephy_dir: Path, s3_client) -> None:
+    def store(_) -> str:
+        return store_artifact(s3_client, _bucket, _lib12, _lib12, dephy_dir, False)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        statuses = list(executor.map(store, range(8)))
+
+    assert statuses.count("downloaded") == 1
+    assert s3_client.downloads == [_lib12]
+    assert not list(dephy_dir.rglob("*.lock"))
+
+
+# ============================================
+#       test_store_artifact_corrupt_file
+# ============================================
+def test_store_artifact_corrupt_file(dephy_dir: Path, s3_client) -> None:
+    dest = dephy_dir.joinpath(_lib12)
+    dest.parent.mkdir(parents=True)
+    dest.write_bytes(b"corrupt")
+
+    status = store_artifact(s3_client, _bucket, _lib12, _lib12, dephy_dir)
+
+    assert status == "downloaded"
+    assert dest.read_bytes() == s3_client.objects[_lib12]
+
+
+# ============================================
+#              test_get_artifact
+# ============================================
+def test_get_artifact(
+    dephy_dir: Path, s3_client, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    timeouts = []
+
+    def get_client(profile=None, timeout=60):
+        # pylint: disable=unused-argument
+        timeouts.append(timeout)
+        return s3_client
+
+    monkeypatch.setattr(cache, "get_s3_client", get_client)
+
+    path = get_artifact(_lib12, _lib12, 5)
+    assert path == dephy_dir.joinpath(_lib12)
+    assert path.read_bytes() == s3_client.objects[_lib12]
+    assert timeouts == [5]
+
+    # Only a base name: the bucket is searched for the object
+    specsObj = "legacy_device_specs/9.1.0/actpack.yaml"
+    path = get_artifact("actpack.yaml", specsObj)
+    assert path.read_bytes() == b"specs"
+    assert s3_client.downloads[-1] == specsObj
+
+    with pytest.raises(FileNotFoundError):
+        get_artifact("missing.yaml", "missing.yaml")
+    with pytest.raises(FileNotFoundError):
+        get_artifact(_lib121, _lib121, offline=True)
+
+
+# ============================================
+#         test_device_spec_timeout
+# ============================================
+def test_device_spec_timeout(dephy_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    timeouts = []
+
+    def fetch(obj: str, relativePath: str, timeout: int = 60) -> Path:
+        # pylint: disable=unused-argument
+        timeouts.append(timeout)
+        path = dephy_dir.joinpath(relativePath)
+        path.parent.mkdir(parents=True)
+        path.write_text("state_time: c_int32\n", encoding="utf-8")
+        return path
+
+    monkeypatch.setattr(specs, "get_artifact", fetch)
+
+    spec = get_device_spec("actpack", Version("9.1.0"), 7)
+    assert spec == {"state_time": "c_int32"}
+    assert timeouts == [7]
+
+
+# ============================================
+#        test_extract_from_shared_cache
+# ============================================
+def test_extract_from_shared_cache(dephy_dir: Path, tmp_path: Path) -> None:
+    sharedDir = tmp_path.joinpath("shared")
+    archive = sharedDir.joinpath("tools", "dlls.zip")
+    archive.parent.mkdir(parents=True)
+    data = io.BytesIO()
+    with zipfile.ZipFile(data, "w") as zipFile:
+        zipFile.writestr("bin/a.dll", "a")
+    archive.write_bytes(data.getvalue())
+    set_shared_cache_dir(sharedDir)
+
+    # The shared cache is read-only, so it goes in ~/.dephy instead
+    extracted = extract_artifact(archive)
+    assert extracted == dephy_dir.joinpath("tools", "dlls")
+    assert extracted.joinpath("bin", "a.dll").read_text() == "a"
+    assert not sharedDir.joinpath("tools", "dlls").exists()
+
+    # Populating the shared cache extracts it there
+    extracted = extract_artifact(archive, sharedDir)
+    assert extracted == sharedDir.joinpath("tools", "dlls")
+    assert extract_artifact(archive) == extracted
+
+
+# ============================================
+#              test_file_lock
+# ============================================
+def test_file_lock(tmp_path: Path) -> None:
+    path = tmp_path.joinpath("file")
+    lockFile = tmp_path.joinpath("file.lock")
+    acquired = Event()
+
+    def hold() -> None:
+        with file_lock(path):
+            acquired.set()
+            sleep(0.2)
+
+    thread = Thread(target=hold)
+    thread.start()
+    acquired.wait()
+    owner = lockFile.read_text(encoding="utf-8")
+    assert owner == f"{socket.gethostname()}:{os.getpid()}"
+
+    # Waits for the other thread to let go
+    with file_lock(path, pollPeriod=0.01):
+        assert not thread.is_alive()
+    thread.join()
+    assert not lockFile.exists()
+
+
+# ============================================
+#          test_file_lock_heartbeat
+# ============================================
+def test_file_lock_heartbeat(tmp_path: Path) -> None:
+    path = tmp_path.joinpath("file")
+    acquired = Event()
+    done = Event()
+
+    def hold() -> None:
+        with file_lock(path, staleAfter=0.2):
+            acquired.set()
+            sleep(0.6)
+            done.set()
+
+    thread = Thread(target=hold)
+    thread.start()
+    acquired.wait()
+
+    # Held longer than staleAfter, but kept fresh, so it isn't broken
+    with file_lock(path, staleAfter=0.2, pollPeriod=0.01):
+        assert done.is_set()
+    thread.join()
+
+
+# ============================================
+#          test_file_lock_stale
+# ============================================
+def test_file_lock_stale(tmp_path: Path) -> None:
+    path = tmp_path.joinpath("file")
+    lockFile = tmp_path.joinpath("file.lock")
+
+    # Left behind by a process on another host that stopped refreshing it
+    lockFile.write_text("elsewhere:1", encoding="utf-8")
+    os.utime(lockFile, (0, 0))
+    with file_lock(path, pollPeriod=0.01):
+        assert lockFile.read_text(encoding="utf-8").endswith(f":{os.getpid()}")
+
+    # Left behind by a process on this host that no longer exists
+    if os.name != "nt":
+        lockFile.write_text(f"{socket.gethostname()}:{2**22 + 1}", encoding="utf-8")
+        with file_lock(path, pollPeriod=0.01):
+            pass
+    assert not lockFile.exists()
@@ -0,0 +1,75 @@
+from time import perf_counter
+from typing import List
+
+import numpy as np
+import pytest
+
+from flexsea.commander import FastCommander
+from flexsea.device import Device
+import flexsea.utilities.constants as fxc
+
+
+# ============================================
+#            test_fast_commander
+# ============================================
+def test_fast_commander(device: Device) -> None:
+    send = device.fast_commander("voltage")
+    # pylint: disable-next=protected-access
+    clib = device._clib
+
+    assert send(1500) == device.success
+    assert clib.motor.mode == fxc.controllers["voltage"].value
+    assert clib.motor.setpoint == 1500
+    assert send.mode == "voltage"
+
+
+# ============================================
+#           test_unknown_controller
+# ============================================
+@pytest.mark.parametrize("mode", ["none", "torque"])
+def test_unknown_controller(device: Device, mode: str) -> None:
+    with pytest.raises(ValueError):
+        device.fast_commander(mode)
+
+
+# ============================================
+#              test_send_many
+# ============================================
+def test_send_many(device: Device) -> None:
+    send = device.fast_commander("current")
+    # pylint: disable-next=protected-access
+    clib = device._clib
+    nCommands = clib.commandCount
+
+    t0 = perf_counter()
+    retCodes = send.send_many(np.arange(10) * 100, 0.01)
+
+    # Commands are scheduled against the first one, so the whole batch
+    # takes (n - 1) periods
+    assert 0.09 <= perf_counter() - t0 < 0.5
+    assert (retCodes == device.success).all()
+    assert clib.commandCount - nCommands == 10
+    assert clib.motor.setpoint == 900
+
+
+# ============================================
+#           test_send_many_failure
+# ============================================
+@pytest.mark.parametrize("stopOnFailure", [True, False])
+def test_send_many_failure(stopOnFailure: bool) -> None:
+    sent: List[int] = []
+
+    def send(devId: int, controller: int, value: int) -> int:
+        # pylint: disable=unused-argument
+        sent.append(value)
+        return 0 if value == 2 else 1
+
+    commander = FastCommander(send, 1, 2, "current", 1)
+    retCodes = commander.send_many([1, 2, 3], 0, stopOnFailure)
+
+    if stopOnFailure:
+        assert sent == [1, 2]
+        assert retCodes.tolist() == [1, 0, -1]
+    else:
+        assert sent == [1, 2, 3]
+        assert retCodes.tolist() == [1, 0, 1]
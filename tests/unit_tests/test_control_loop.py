@@ -0,0 +1,107 @@
+from time import sleep
+from typing import List
+
+import numpy as np
+import pytest
+
+from flexsea.control_loop import ControlLoop
+from flexsea.device import Device
+
+
+# ============================================
+#               test_run_ticks
+# ============================================
+def test_run_ticks(device: Device) -> None:
+    iAngle = device.fieldIndex["mot_ang"]
+    angles: List[int] = []
+
+    def controller(sample: np.ndarray, tick: int) -> None:
+        # pylint: disable=unused-argument
+        angles.append(int(sample[iAngle]))
+        device.command_motor_current(1000)
+
+    loop = device.control_loop(controller, 200)
+    loop.run(nTicks=20)
+
+    assert loop.ticks == 20
+    assert len(angles) == 20
+    # The motor is driven by the loop's commands
+    assert angles[-1] > angles[0]
+    stats = loop.stats
+    assert stats["ticks"] == 20
+    assert stats["period"]["mean"] == pytest.approx(0.005, abs=0.002)
+
+
+# ============================================
+#             test_callback_stops
+# ============================================
+def test_callback_stops() -> None:
+    ticks: List[int] = []
+
+    def callback(sample: np.ndarray, tick: int) -> bool:
+        # pylint: disable=unused-argument
+        ticks.append(tick)
+        return tick < 4
+
+    loop = ControlLoop(lambda: np.ones(3), callback, 1000, np.zeros(3))
+    loop.run(duration=5)
+
+    assert ticks == [0, 1, 2, 3, 4]
+    assert loop.ticks == 5
+
+
+# ============================================
+#               test_overruns
+# ============================================
+def test_overruns() -> None:
+    period = 0.01
+
+    def callback(sample: np.ndarray, tick: int) -> None:
+        # pylint: disable=unused-argument
+        # The third tick runs past the next two deadlines
+        if tick == 2:
+            sleep(2.5 * period)
+
+    loop = ControlLoop(lambda: np.ones(3), callback, 1 / period, np.zeros(3))
+    loop.run(duration=10 * period)
+
+    # The skipped ticks aren't run back-to-back to catch up
+    assert loop.overruns >= 2
+    assert loop.ticks <= 8
+    assert loop.ticks + loop.overruns >= 10
+
+
+# ============================================
+#              test_background
+# ============================================
+def test_background() -> None:
+    samples: List[float] = []
+
+    def callback(sample: np.ndarray, tick: int) -> None:
+        # pylint: disable=unused-argument
+        samples.append(float(sample[0]))
+
+    loop = ControlLoop(lambda: np.full(3, 7.0), callback, 500, np.zeros(3))
+    loop.start()
+    sleep(0.05)
+    assert loop.running
+    loop.stop()
+
+    assert not loop.running
+    assert loop.ticks > 0
+    assert set(samples) == {7.0}
+
+
+# ============================================
+#             test_callback_error
+# ============================================
+def test_callback_error() -> None:
+    def callback(sample: np.ndarray, tick: int) -> None:
+        raise ValueError("boom")
+
+    loop = ControlLoop(lambda: np.ones(3), callback, 500, np.zeros(3))
+    loop.start(nTicks=5)
+
+    with pytest.raises(RuntimeError):
+        loop.wait(5)
+    assert isinstance(loop.error, ValueError)
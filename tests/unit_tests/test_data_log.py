@@ -0,0 +1,93 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from flexsea.data_log import DataLogReader
+from flexsea.data_log import data_log_files
+from flexsea.data_log import read_data_log
+
+
+# ============================================
+#              write_rotated_logs
+# ============================================
+def write_rotated_logs(logDir: Path) -> np.ndarray:
+    """
+    Writes 30 rows of ``state_time, mot_cur, mot_volt`` split across
+    files numbered 1, 2, and 10, as the C library does when a log
+    reaches its maximum size. Only the first file has column names.
+    """
+    logDir.mkdir()
+    rows = np.column_stack((np.arange(30) * 10, np.arange(30) - 15, np.arange(30)))
+    for i, (number, part) in enumerate(zip([1, 2, 10], np.split(rows, 3))):
+        lines = [",".join(str(value) for value in row) for row in part]
+        if i == 0:
+            lines.insert(0, "state_time,mot_cur,mot_volt,")
+        logDir.joinpath(f"DataLog_{number}.csv").write_text("\n".join(lines) + "\n")
+    return rows
+
+
+# ============================================
+#            test_data_log_files
+# ============================================
+def test_data_log_files(tmp_path: Path) -> None:
+    logDir = tmp_path.joinpath("logs")
+    write_rotated_logs(logDir)
+
+    files = data_log_files(logDir)
+    assert [file.name for file in files] == [
+        "DataLog_1.csv",
+        "DataLog_2.csv",
+        "DataLog_10.csv",
+    ]
+    assert data_log_files(files[0]) == [files[0]]
+
+
+# ============================================
+#            test_read_rotated_logs
+# ============================================
+@pytest.mark.parametrize("chunkRows", [1, 4, 100])
+def test_read_rotated_logs(tmp_path: Path, chunkRows: int) -> None:
+    logDir = tmp_path.joinpath("logs")
+    rows = write_rotated_logs(logDir)
+
+    reader = DataLogReader(logDir, chunkRows=chunkRows)
+    assert reader.fields == ["state_time", "mot_cur", "mot_volt"]
+
+    data = reader.read(nWorkers=1)
+    np.testing.assert_array_equal(data["state_time"], rows[:, 0])
+    np.testing.assert_array_equal(data["mot_cur"], rows[:, 1])
+    assert data["mot_cur"].dtype == np.float64
+
+    chunks = list(reader)
+    assert sum(len(chunk["mot_volt"]) for chunk in chunks) == len(rows)
+
+
+# ============================================
+#              test_time_range
+# ============================================
+def test_time_range(tmp_path: Path) -> None:
+    logDir = tmp_path.joinpath("logs")
+    rows = write_rotated_logs(logDir)
+
+    # The range spans the first two files
+    data = read_data_log(logDir, ["mot_cur"], start=55, stop=120, nWorkers=2)
+    assert list(data) == ["mot_cur"]
+    np.testing.assert_array_equal(data["mot_cur"], rows[6:13, 1])
+
+
+# ============================================
+#                test_dtypes
+# ============================================
+def test_dtypes(tmp_path: Path) -> None:
+    logDir = tmp_path.joinpath("logs")
+    write_rotated_logs(logDir)
+
+    data = read_data_log(logDir, dtypes={"state_time": np.int64}, nWorkers=1)
+    assert data["state_time"].dtype == np.int64
+    assert data["mot_volt"].dtype == np.float64
+
+    with pytest.raises(ValueError):
+        DataLogReader(logDir, dtypes={"nope": np.int32})
+    with pytest.raises(ValueError):
+        DataLogReader(logDir, columns=["nope"])
@@ -0,0 +1,87 @@
+from time import sleep
+
+import numpy as np
+
+from flexsea.device import Device
+from flexsea.utilities.simulator import simulatedFields
+
+
+# ============================================
+#              test_read_array
+# ============================================
+def test_read_array(device: Device) -> None:
+    sleep(0.05)
+    data = device.read_array()
+
+    assert data.shape == (len(simulatedFields),)
+    assert data.dtype == np.int32
+    assert list(device.fieldIndex) == simulatedFields
+    assert data[device.fieldIndex["state_time"]] > 0
+
+    # The array is a view onto a buffer that is re-used by every read
+    sleep(0.01)
+    assert device.read_array() is data
+
+
+# ============================================
+#                 test_read
+# ============================================
+def test_read(device: Device) -> None:
+    sleep(0.05)
+    data = device.read()
+
+    assert list(data) == simulatedFields
+    assert all(isinstance(value, int) for value in data.values())
+    # The dictionary is a copy, so a later read doesn't change it
+    stateTime = data["state_time"]
+    sleep(0.01)
+    device.read_array()
+    assert data["state_time"] == stateTime
+
+
+# ============================================
+#            test_read_all_array
+# ============================================
+def test_read_all_array(device: Device) -> None:
+    sleep(0.05)
+    data, nRows = device.read_all_array()
+
+    assert nRows > 1
+    assert data.shape == (nRows, len(simulatedFields))
+    times = data[:, device.fieldIndex["state_time"]]
+    assert np.all(np.diff(times) > 0)
+
+    # The queue was drained, so the next read picks up right after the
+    # last row, at 1 kHz
+    data, nRows = device.read_all_array()
+    if nRows:
+        assert data[0, device.fieldIndex["state_time"]] == times[-1] + 1
+
+
+# ============================================
+#       test_read_all_array_structured
+# ============================================
+def test_read_all_array_structured(device: Device) -> None:
+    sleep(0.05)
+    records, nRows = device.read_all_array(structured=True)
+
+    assert records.shape == (nRows,)
+    assert records.dtype.names == tuple(simulatedFields)
+    assert np.all(np.diff(records["state_time"]) > 0)
+
+    # Both are views of the same memory
+    data, _ = device.read_all_array()
+    assert np.shares_memory(records, data)
+
+
+# ============================================
+#            test_read_all_data
+# ============================================
+def test_read_all_data(device: Device) -> None:
+    sleep(0.05)
+    rows = device.read(allData=True)
+
+    assert len(rows) > 1
+    assert all(list(row) == simulatedFields for row in rows)
+    times = [row["state_time"] for row in rows]
+    assert times == sorted(times)
@@ -0,0 +1,90 @@
+from pathlib import Path
+from time import sleep
+
+import numpy as np
+import pytest
+
+from flexsea.device import Device
+from flexsea.device_group import DeviceGroup
+from flexsea.utilities.simulator import SimulatedLibrary
+
+
+# ============================================
+#                 make_group
+# ============================================
+def make_group(nDevices: int) -> DeviceGroup:
+    ports = [f"sim{i}" for i in range(nDevices)]
+    group = DeviceGroup("12.0.0", ports, clib=SimulatedLibrary(), debug=True)
+    # Each member gets its own simulated device rather than sharing one
+    group.devices = [
+        Device("12.0.0", f"sim{i}", clib=SimulatedLibrary(seed=i), debug=True)
+        for i in range(nDevices)
+    ]
+    return group
+
+
+# ============================================
+#                 test_read
+# ============================================
+def test_read(dephy_dir: Path) -> None:
+    # pylint: disable=unused-argument
+    group = make_group(2)
+    with pytest.raises(RuntimeError):
+        group.read()
+
+    group.open()
+    group.start_streaming(1000)
+    sleep(0.05)
+    data, times = group.read()
+
+    assert data.shape == (2, len(group[0].fieldIndex))
+    assert data.dtype == np.int32
+    assert np.all(data[:, group[0].fieldIndex["state_time"]] > 0)
+    assert times[0] <= times[1]
+    assert group.stats["readSkew"]["count"] == 1
+    group.close()
+    assert not any(device.connected for device in group)
+
+
+# ============================================
+#                test_command
+# ============================================
+def test_command(dephy_dir: Path) -> None:
+    # pylint: disable=unused-argument
+    group = make_group(2)
+    group.open()
+    group.command_motor_current([500, -500])
+
+    # pylint: disable-next=protected-access
+    setpoints = [device._clib.motor.setpoint for device in group]
+    assert setpoints == [500, -500]
+    group.command_motor_voltage(1000)
+    # pylint: disable-next=protected-access
+    assert all(device._clib.motor.setpoint == 1000 for device in group)
+    with pytest.raises(ValueError):
+        group.command_motor_current([1, 2, 3])
+    group.close()
+
+    with pytest.raises(RuntimeError):
+        group.command_motor_current(0)
+
+
+# ============================================
+#        test_open_failure_closes_others
+# ============================================
+def test_open_failure_closes_others(
+    dephy_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # pylint: disable=unused-argument
+    group = make_group(3)
+
+    def fail() -> None:
+        raise RuntimeError("Error: could not open port.")
+
+    monkeypatch.setattr(group[1], "open", fail)
+    with pytest.raises(RuntimeError, match="could not open"):
+        group.open()
+
+    assert not any(device.connected for device in group)
+    # pylint: disable-next=protected-access
+    assert not group[0]._clib.isOpen
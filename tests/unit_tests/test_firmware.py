@@ -0,0 +1,57 @@
+from pathlib import Path
+from time import time
+from typing import List
+
+import pytest
+from semantic_version import Version
+import yaml
+
+from flexsea.utilities import firmware
+import flexsea.utilities.constants as fxc
+
+
+# ============================================
+#               cached_versions
+# ============================================
+@pytest.fixture
+def cached_versions(dephy_dir: Path, monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    """
+    Writes a fresh cache holding only 10.4.0 and records every listing
+    of S3, which finds 10.5.0 as well.
+    """
+    dephy_dir.mkdir(parents=True)
+    with open(fxc.firmwareVersionCacheFile, "w", encoding="utf-8") as fd:
+        yaml.safe_dump({"timestamp": time(), "versions": ["10.4.0"]}, fd)
+
+    listings = []
+
+    def list_s3(timeout=60, offline=False, cacheTtl=0):
+        # pylint: disable=unused-argument
+        listings.append(timeout)
+        return ["10.4.0", "10.5.0"]
+
+    monkeypatch.setattr(firmware, "get_available_firmware_versions", list_s3)
+    return listings
+
+
+# ============================================
+#          test_cached_version_is_used
+# ============================================
+@pytest.mark.parametrize("version", ["10.4.0", "10", "10.4"])
+def test_cached_version_is_used(cached_versions: List[str], version: str) -> None:
+    # pylint: disable=redefined-outer-name
+    result = firmware.validate_given_firmware_version(version, False)
+
+    assert result == Version("10.4.0")
+    assert not cached_versions
+
+
+# ============================================
+#        test_new_version_refreshes_cache
+# ============================================
+def test_new_version_refreshes_cache(cached_versions: List[str]) -> None:
+    # pylint: disable=redefined-outer-name
+    result = firmware.validate_given_firmware_version("10.5.0", False, timeout=5)
+
+    assert result == Version("10.5.0")
+    assert cached_versions == [5]
@@ -0,0 +1,140 @@
+from pathlib import Path
+from time import sleep
+
+import pytest
+import yaml
+
+from flexsea.device import Device
+from flexsea.utilities import labels
+from flexsea.utilities.labels import allocate_label_buffer
+from flexsea.utilities.labels import cache_labels
+from flexsea.utilities.labels import clear_label_cache
+from flexsea.utilities.labels import decode_labels
+from flexsea.utilities.labels import get_cached_labels
+from flexsea.utilities.simulator import SimulatedLibrary
+from flexsea.utilities.simulator import simulatedFields
+
+
+# ============================================
+#             test_decode_labels
+# ============================================
+def test_decode_labels() -> None:
+    maxLength = 8
+    pointers, block = allocate_label_buffer(4, maxLength)
+    for i, name in enumerate([b"state_ti", b"mot_cur", b"x"]):
+        for j, char in enumerate(name):
+            pointers[i][j] = bytes([char])
+
+    # A label as long as the maximum has no terminating null
+    assert decode_labels(block, 3, maxLength) == ["state_ti", "mot_cur", "x"]
+    assert decode_labels(block, 0, maxLength) == []
+    assert decode_labels(block, 4, maxLength)[-1] == ""
+
+
+# ============================================
+#             test_label_cache
+# ============================================
+def test_label_cache(dephy_dir: Path) -> None:
+    assert get_cached_labels("a") is None
+
+    cache_labels("a", ["x", "y"])
+    assert get_cached_labels("a") == ["x", "y"]
+    with open(dephy_dir.joinpath("field_labels.yaml"), "r", encoding="utf-8") as fd:
+        assert yaml.safe_load(fd) == {"a": ["x", "y"]}
+
+    clear_label_cache("a")
+    assert get_cached_labels("a") is None
+
+
+# ============================================
+#       test_label_cache_keeps_other_writers
+# ============================================
+def test_label_cache_keeps_other_writers(dephy_dir: Path) -> None:
+    cache_labels("a", ["x"])
+
+    # Another process caches labels after this one loaded the file
+    cacheFile = dephy_dir.joinpath("field_labels.yaml")
+    with open(cacheFile, "w", encoding="utf-8") as fd:
+        yaml.safe_dump({"a": ["x"], "b": ["y"]}, fd)
+
+    cache_labels("c", ["z"])
+    clear_label_cache("a")
+
+    with open(cacheFile, "r", encoding="utf-8") as fd:
+        assert yaml.safe_load(fd) == {"b": ["y"], "c": ["z"]}
+
+    # A new session sees every label
+    labels._labelCache = None  # pylint: disable=protected-access
+    assert get_cached_labels("b") == ["y"]
+
+
+# ============================================
+#           open_with_stale_labels
+# ============================================
+def open_with_stale_labels(stale: list) -> Device:
+    """
+    Opens a simulated device whose cached labels are ``stale``.
+    """
+    device = Device("12.0.0", "sim", clib=SimulatedLibrary(seed=0), debug=True)
+    # Caching is off by default when the library is given
+    device.cacheLabels = True
+    device.open()
+    # pylint: disable-next=protected-access
+    cache_labels(device._label_cache_key(), stale)
+    device.close()
+
+    device.open()
+    assert device.fieldIndex == {field: i for i, field in enumerate(stale)}
+    device.start_streaming(1000)
+    sleep(0.02)
+    return device
+
+
+# ============================================
+#           test_stale_labels_read
+# ============================================
+@pytest.mark.parametrize("stale", [simulatedFields[:-2], simulatedFields + ["x"]])
+def test_stale_labels_read(dephy_dir: Path, stale: list) -> None:
+    # pylint: disable=unused-argument
+    device = open_with_stale_labels(stale)
+
+    data = device.read()
+    assert list(data) == simulatedFields
+    # pylint: disable-next=protected-access
+    assert get_cached_labels(device._label_cache_key()) == simulatedFields
+    device.close()
+
+
+# ============================================
+#         test_stale_labels_read_all
+# ============================================
+@pytest.mark.parametrize("stale", [simulatedFields[:-2], simulatedFields + ["x"]])
+def test_stale_labels_read_all(dephy_dir: Path, stale: list) -> None:
+    # pylint: disable=unused-argument
+    device = open_with_stale_labels(stale)
+
+    # The labels are fixed before the queue is drained, so no samples
+    # are lost
+    data, nRows = device.read_all_array()
+    assert nRows >= 10
+    assert data.shape == (nRows, len(simulatedFields))
+    times = data[:, device.fieldIndex["state_time"]]
+    assert times[0] == 1 and (times == range(1, nRows + 1)).all()
+    device.close()
+
+
+# ============================================
+#          test_unchanged_labels_raise
+# ============================================
+def test_unchanged_labels_raise(
+    dephy_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # pylint: disable=unused-argument
+    device = open_with_stale_labels(simulatedFields[:-1])
+    # The device's labels match the cached ones, but it sends a different
+    # number of fields, so something else is wrong
+    monkeypatch.setattr(device, "_read_labels", lambda: simulatedFields[:-1])
+
+    with pytest.raises(AssertionError):
+        device.read()
+    device.close()
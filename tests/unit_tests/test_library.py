@@ -0,0 +1,161 @@
+import ctypes as c
+from pathlib import Path
+from time import time
+from types import SimpleNamespace
+from typing import Iterator, List
+
+import pytest
+from semantic_version import Version
+import yaml
+
+from flexsea.utilities import library
+import flexsea.utilities.constants as fxc
+from flexsea.utilities.system import get_os
+
+
+# ============================================
+#                  FakeCDLL
+# ============================================
+class FakeCDLL:
+    """
+    Stands in for a ``ctypes.CDLL``: attribute access returns the same
+    function object every time, whereas indexing returns a new one, as
+    ctypes does.
+    """
+
+    def __init__(self, libFile: Path) -> None:
+        self.libFile = libFile
+
+    def __getattr__(self, name: str) -> SimpleNamespace:
+        func = SimpleNamespace(name=name)
+        setattr(self, name, func)
+        return func
+
+    def __getitem__(self, name: str) -> SimpleNamespace:
+        return SimpleNamespace(name=name)
+
+
+# ============================================
+#                   loads
+# ============================================
+@pytest.fixture
+def loads(dephy_dir: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[List[Path]]:
+    """
+    Records every library file loaded, starting from an empty cache.
+    """
+    # pylint: disable=unused-argument
+    loaded = []
+
+    def load(libFile: Path, timeout: int = 60) -> FakeCDLL:
+        loaded.append(libFile)
+        return FakeCDLL(libFile)
+
+    monkeypatch.setattr(library, "_load_clib", load)
+    library.clear_c_library_cache()
+    yield loaded
+    library.clear_c_library_cache()
+
+
+# ============================================
+#                 make_lib
+# ============================================
+def make_lib(version: str) -> Path:
+    _os = get_os()
+    libFile = fxc.dephyPath.joinpath(fxc.libsDir, version, _os, fxc.libFiles[_os])
+    libFile.parent.mkdir(parents=True)
+    libFile.touch()
+    return libFile
+
+
+# ============================================
+#            test_library_is_shared
+# ============================================
+def test_library_is_shared(loads: List[Path]) -> None:
+    # pylint: disable=redefined-outer-name
+    libFile = make_lib("12.0.0")
+
+    clib1, path1 = library.get_c_library(Version("12.0.0"), libFile)
+    clib2, path2 = library.get_c_library(Version("12.0.0"), None, offline=True)
+
+    assert clib1 is clib2
+    assert path1 == path2 == libFile
+    assert loads == [libFile]
+    # Prototypes are only set once, when the library is loaded
+    assert clib1.fxOpen.restype is c.c_int
+
+
+# ============================================
+#        test_versions_are_cached_apart
+# ============================================
+def test_versions_are_cached_apart(loads: List[Path]) -> None:
+    # pylint: disable=redefined-outer-name
+    libFile = make_lib("12.0.0")
+
+    clib1, _ = library.get_c_library(Version("12.0.0"), libFile)
+    clib2, _ = library.get_c_library(Version("11.0.0"), libFile)
+
+    assert clib1 is not clib2
+    assert len(loads) == 2
+
+
+# ============================================
+#               test_clear_cache
+# ============================================
+def test_clear_cache(loads: List[Path]) -> None:
+    # pylint: disable=redefined-outer-name
+    libFile = make_lib("12.0.0")
+
+    clib1, _ = library.get_c_library(Version("12.0.0"), libFile)
+    library.clear_c_library_cache()
+    clib2, _ = library.get_c_library(Version("12.0.0"), libFile)
+
+    assert clib1 is not clib2
+    assert len(loads) == 2
+
+
+# ============================================
+#           test_offline_missing_library
+# ============================================
+def test_offline_missing_library(loads: List[Path]) -> None:
+    # pylint: disable=redefined-outer-name
+    with pytest.raises(FileNotFoundError):
+        library.get_c_library(Version("12.0.0"), None, offline=True)
+    assert not loads
+
+
+# ============================================
+#           test_preload_c_libraries
+# ============================================
+def test_preload_c_libraries(loads: List[Path]) -> None:
+    # pylint: disable=redefined-outer-name
+    libFiles = [make_lib("11.0.0"), make_lib("12.0.0")]
+    with open(fxc.firmwareVersionCacheFile, "w", encoding="utf-8") as fd:
+        yaml.safe_dump({"timestamp": time(), "versions": ["11.0.0", "12.0.0"]}, fd)
+
+    assert library.preload_c_libraries(["11.0.0", "12"], offline=True) == libFiles
+    assert loads == libFiles
+
+    # Devices created afterwards find the libraries already loaded
+    library.get_c_library(Version("12.0.0"), None, offline=True)
+    assert len(loads) == 2
+
+
+# ============================================
+#       test_read_functions_are_per_device
+# ============================================
+def test_read_functions_are_per_device() -> None:
+    clib = FakeCDLL(Path("lib"))
+
+    class ActPack(c.Structure):
+        _fields_ = [("a", c.c_int)]
+
+    class OtherActPack(c.Structure):
+        _fields_ = [("b", c.c_float)]
+
+    read1, _ = library.set_read_functions(clib, "actpack", True, ActPack)
+    read2, _ = library.set_read_functions(clib, "actpack", True, OtherActPack)
+
+    assert read1 is not read2
+    assert read1.argtypes[1] is not read2.argtypes[1]
+    # The shared library itself is left alone
+    assert not hasattr(clib.fxReadDevice, "argtypes")
@@ -0,0 +1,105 @@
+import asyncio
+from pathlib import Path
+from time import perf_counter
+
+from flexsea.device import Device
+from flexsea.utilities.polling import async_request_and_wait
+from flexsea.utilities.polling import request_and_wait
+from flexsea.utilities.simulator import SimulatedLibrary
+
+
+# ============================================
+#                 FakeDevice
+# ============================================
+class FakeDevice:
+    """
+    Answers a request with ``answer`` ``delay`` seconds after receiving it.
+    """
+
+    def __init__(self, value: int, answer: int, delay: float) -> None:
+        self.value = value
+        self.answer = answer
+        self.delay = delay
+        self.requestTime: float | None = None
+
+    def request(self) -> None:
+        self.requestTime = perf_counter()
+
+    def get(self) -> int:
+        if self.requestTime is not None:
+            if perf_counter() - self.requestTime >= self.delay:
+                self.value = self.answer
+        return self.value
+
+
+# ============================================
+#            test_request_and_wait
+# ============================================
+def test_request_and_wait() -> None:
+    fake = FakeDevice(0, 5, 0.02)
+    t0 = perf_counter()
+    value, roundTripTime, changed = request_and_wait(fake.request, fake.get, 1.0)
+
+    assert (value, changed) == (5, True)
+    assert 0.02 <= roundTripTime < 0.5
+    assert perf_counter() - t0 < 0.5
+
+
+# ============================================
+#       test_request_and_wait_unchanged
+# ============================================
+def test_request_and_wait_unchanged() -> None:
+    fake = FakeDevice(5, 5, 0.0)
+    t0 = perf_counter()
+    value, roundTripTime, changed = request_and_wait(fake.request, fake.get, 0.1)
+
+    assert (value, changed) == (5, False)
+    assert roundTripTime >= 0.1
+    assert perf_counter() - t0 >= 0.1
+
+
+# ============================================
+#         test_async_request_and_wait
+# ============================================
+def test_async_request_and_wait() -> None:
+    fake = FakeDevice(0, 5, 0.02)
+    value, roundTripTime, changed = asyncio.run(
+        async_request_and_wait(fake.request, fake.get, 1.0)
+    )
+
+    assert (value, changed) == (5, True)
+    assert 0.02 <= roundTripTime < 0.5
+
+
+# ============================================
+#             test_device_requests
+# ============================================
+def test_device_requests(dephy_dir: Path) -> None:
+    # pylint: disable=unused-argument
+    clib = SimulatedLibrary(seed=0, responseDelay=0.01)
+    device = Device("12.0.0", "sim", clib=clib, debug=True)
+    device.open()
+
+    try:
+        # A new value comes back as soon as the device answers
+        device.set_uvlo(1000)
+        t0 = perf_counter()
+        assert device.get_uvlo(timeout=1.0) == 1000
+        assert perf_counter() - t0 < 0.5
+        assert device.lastRoundTripTime is not None
+
+        # An answer that's slower than the previous one must still be
+        # waited for rather than mistaken for an unchanged value
+        clib.responseDelay = 0.3
+        device.set_uvlo(2000)
+        assert device.get_uvlo(timeout=1.0) == 2000
+        assert device.lastRoundTripTime >= 0.3
+
+        # An unchanged value can't be told apart from no answer, so it
+        # takes the full timeout and has no round trip time
+        t0 = perf_counter()
+        assert device.get_uvlo(timeout=0.5) == 2000
+        assert perf_counter() - t0 >= 0.5
+        assert device.lastRoundTripTime is None
+    finally:
+        device.close()
@@ -0,0 +1,130 @@
+import io
+from pathlib import Path
+import zipfile
+
+import pytest
+
+from flexsea import cli
+from flexsea.utilities import firmware
+from flexsea.utilities import prefetch as prefetcher
+from flexsea.utilities.aws import load_s3_stack
+from flexsea.utilities.prefetch import prefetch
+from flexsea.utilities.prefetch import prefetch_targets
+
+_lib12 = "precompiled_c_libs/12.0.0/linux_64bit/libfx_plan_stack.so"
+_lib121 = "precompiled_c_libs/12.1.0/linux_64bit/libfx_plan_stack.so"
+_dll121 = "precompiled_c_libs/12.1.0/windows_64bit/libfx_plan_stack.dll"
+_lib91 = "precompiled_c_libs/9.1.0/linux_64bit/libfx_plan_stack.so"
+_specs91 = "legacy_device_specs/9.1.0/actpack.yaml"
+_dlls = "bootloader_tools/windows_64bit/win_dlls.zip"
+
+
+# ============================================
+#                   bucket
+# ============================================
+@pytest.fixture
+def bucket(dephy_dir: Path, s3_client, monkeypatch: pytest.MonkeyPatch):
+    """
+    Serves the fake bucket, with the Windows DLLs added, to the
+    prefetcher, and makes every version in it a known one.
+    """
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zipFile:
+        zipFile.writestr("msvcp140.dll", b"dll")
+    s3_client.objects[_dlls] = archive.getvalue()
+
+    def list_s3(timeout=60, offline=False, cacheTtl=0):
+        # pylint: disable=unused-argument
+        return ["9.1.0", "12.0.0", "12.1.0"]
+
+    monkeypatch.setattr(firmware, "get_available_firmware_versions", list_s3)
+    monkeypatch.setattr(prefetcher, "get_s3_client", lambda *args: s3_client)
+    dephy_dir.mkdir(parents=True)
+    return s3_client
+
+
+# ============================================
+#             test_prefetch_targets
+# ============================================
+def test_prefetch_targets(bucket) -> None:
+    # pylint: disable=redefined-outer-name
+    targets = prefetch_targets(["12.1.0"], ["linux_64bit"], bucket)
+    assert targets == [(_lib121, _lib121)]
+    # Current versions don't need the bucket to be listed
+    assert not bucket.listed
+
+    # Legacy versions also need their device specs, and Windows the DLLs
+    targets = prefetch_targets(["9.1.0", "12.1.0"], ["linux_64bit", "windows_64bit"])
+    objects = [obj for obj, _ in targets]
+    assert objects[0] == _lib91
+    assert _specs91 in objects
+    assert _dll121 in objects and _dlls in objects
+    assert len(objects) == len(set(objects))
+
+    with pytest.raises(ValueError):
+        prefetch_targets(["12.1.0"], ["amiga"])
+
+
+# ============================================
+#                test_prefetch
+# ============================================
+def test_prefetch(bucket, tmp_path: Path) -> None:
+    # pylint: disable=redefined-outer-name
+    cacheDir = tmp_path.joinpath("image")
+    results = prefetch(["12.0.0", "12.1.0"], ["linux_64bit"], cacheDir, 4)
+
+    statuses = sorted(result["status"] for result in results)
+    assert statuses == ["cached", "downloaded"]
+    assert cacheDir.joinpath(_lib121).read_bytes() == bucket.objects[_lib12]
+    # Both versions share the same library, so it's only downloaded once,
+    # for whichever version gets there first
+    assert len(bucket.downloads) == 1
+    assert bucket.downloads[0] in (_lib12, _lib121)
+
+    # Nothing is downloaded again
+    results = prefetch(["12.0.0", "12.1.0"], ["linux_64bit"], cacheDir)
+    assert {result["status"] for result in results} == {"cached"}
+    assert len(bucket.downloads) == 1
+
+    # The DLLs are extracted where the device looks for them
+    results = prefetch(["12.1.0"], ["windows_64bit"], cacheDir)
+    assert {result["error"] for result in results} == {None}
+    assert cacheDir.joinpath(_dlls).with_suffix("").joinpath("msvcp140.dll").exists()
+
+
+# ============================================
+#            test_prefetch_failure
+# ============================================
+def test_prefetch_failure(bucket, tmp_path: Path) -> None:
+    # pylint: disable=redefined-outer-name
+    # The 9.1.0 library fails, but the other files are still downloaded
+    del bucket.objects[_lib91]
+    results = prefetch(["9.1.0"], ["linux_64bit"], tmp_path)
+
+    failed = [result for result in results if result["status"] == "failed"]
+    assert [result["object"] for result in failed] == [_lib91]
+    assert isinstance(failed[0]["error"], load_s3_stack().exceptions.ClientError)
+    assert tmp_path.joinpath(_specs91).read_bytes() == b"specs"
+
+    with pytest.raises(ValueError):
+        prefetch(["12.1.0"], nWorkers=0)
+
+
+# ============================================
+#                 test_cli
+# ============================================
+def test_cli(bucket, tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    # pylint: disable=redefined-outer-name
+    argv = ["prefetch", "12.1.0", "-o", "linux_64bit", "-d", str(tmp_path), "-j", "2"]
+    assert cli.main(argv) == 0
+    out = capsys.readouterr().out
+    assert "downloaded" in out and "1 of 1 files ready." in out
+
+    assert cli.main(argv + ["--no-verify"]) == 0
+    assert "cached" in capsys.readouterr().out
+
+    del bucket.objects[_lib12]
+    argv = ["prefetch", "12.0.0", "-o", "linux_64bit", "-d", str(tmp_path)]
+    assert cli.main(argv) == 1
+    out = capsys.readouterr().out
+    assert f"failed      {_lib12}" in out and "0 of 1 files ready." in out
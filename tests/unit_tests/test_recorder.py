@@ -0,0 +1,115 @@
+from pathlib import Path
+from time import sleep
+from typing import List
+
+import numpy as np
+import pytest
+
+from flexsea.device import Device
+from flexsea.recorder import Recorder
+from flexsea.recorder import read_recording
+from flexsea.recorder import read_recording_metadata
+from flexsea.utilities.simulator import simulatedFields
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+# ============================================
+#               make_recording
+# ============================================
+def make_recording(fileName: Path) -> np.ndarray:
+    """
+    Records 1000 rows, in chunks of 100, whose time stamps are their
+    index.
+    """
+    rows = np.zeros((1000, 3), dtype=np.int32)
+    rows[:, 0] = np.arange(1000)
+    rows[:, 1] = 2 * np.arange(1000)
+
+    recorder = Recorder(
+        fileName, ["state_time", "a", "b"], (3,), np.int32, 100, metadata={"x": 1}
+    )
+    # Writes that straddle chunk boundaries
+    for i in range(0, 1000, 150):
+        recorder.write(rows[i : i + 150])
+    recorder.close()
+
+    assert recorder.nRows == 1000
+    assert recorder.nChunks == 10
+    return rows
+
+
+# ============================================
+#             test_read_recording
+# ============================================
+def test_read_recording(tmp_path: Path) -> None:
+    fileName = tmp_path.joinpath("rec.parquet")
+    rows = make_recording(fileName)
+
+    data = read_recording(fileName)
+    assert list(data) == ["state_time", "a", "b"]
+    assert (data["state_time"] == rows[:, 0]).all()
+    assert (data["a"] == rows[:, 1]).all()
+    assert read_recording_metadata(fileName) == {"x": 1}
+
+    data = read_recording(fileName, 250, 420, columns=["a"])
+    assert list(data) == ["a"]
+    assert (data["a"] == 2 * np.arange(250, 421)).all()
+
+
+# ============================================
+#          test_read_recording_pruning
+# ============================================
+def test_read_recording_pruning(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    fileName = tmp_path.joinpath("rec.parquet")
+    make_recording(fileName)
+
+    readGroups: List[int] = []
+    readRowGroups = pq.ParquetFile.read_row_groups
+
+    def record(self, rowGroups, *args, **kwargs):
+        readGroups.extend(rowGroups)
+        return readRowGroups(self, rowGroups, *args, **kwargs)
+
+    monkeypatch.setattr(pq.ParquetFile, "read_row_groups", record)
+
+    # Only the chunks covering the range are read from disk
+    data = read_recording(fileName, 250, 420)
+    assert readGroups == [2, 3, 4]
+    assert data["state_time"][0] == 250 and data["state_time"][-1] == 420
+
+    readGroups.clear()
+    read_recording(fileName, stop=50)
+    assert readGroups == [0]
+
+
+# ============================================
+#             test_unknown_time_field
+# ============================================
+def test_unknown_time_field(tmp_path: Path) -> None:
+    fileName = tmp_path.joinpath("rec.parquet")
+    make_recording(fileName)
+
+    with pytest.raises(ValueError):
+        read_recording(fileName, timeField="time")
+
+
+# ============================================
+#            test_device_recording
+# ============================================
+def test_device_recording(device: Device, tmp_path: Path) -> None:
+    fileName = tmp_path.joinpath("device.parquet")
+    recorder = device.start_recording(fileName, chunkRows=20)
+    with pytest.raises(RuntimeError):
+        device.start_recording(fileName)
+    sleep(0.1)
+    device.stop_recording()
+    device.stop_acquisition()
+
+    data = read_recording(fileName)
+    assert list(data) == simulatedFields
+    assert len(data["state_time"]) == recorder.nRows > 20
+    assert (np.diff(data["state_time"]) == 1).all()
+    assert read_recording_metadata(fileName)
@@ -0,0 +1,133 @@
+from pathlib import Path
+from time import sleep
+
+import numpy as np
+import pytest
+
+from flexsea.binary_log import BinaryLogWriter
+from flexsea.recorder import Recorder
+from flexsea.replay import ReplayDevice
+
+fields = ["state_time", "mot_cur", "mot_volt"]
+
+
+# ============================================
+#                make_rows
+# ============================================
+def make_rows(n: int = 100) -> np.ndarray:
+    rows = np.zeros((n, len(fields)), dtype=np.int32)
+    rows[:, 0] = np.arange(n)
+    rows[:, 1] = 10 * np.arange(n)
+    rows[:, 2] = -np.arange(n)
+    return rows
+
+
+# ============================================
+#               write_source
+# ============================================
+def write_source(kind: str, path: Path, rows: np.ndarray) -> Path:
+    if kind == "binary":
+        fileName = path.joinpath("session.fxlog")
+        with BinaryLogWriter(fileName, fields, {"name": "actpack"}) as log:
+            log.write(rows)
+    elif kind == "parquet":
+        fileName = path.joinpath("session.parquet")
+        pytest.importorskip("pyarrow")
+        recorder = Recorder(
+            fileName, fields, (len(fields),), np.int32, 30, metadata={"name": "actpack"}
+        )
+        recorder.write(rows)
+        recorder.close()
+    else:
+        fileName = path.joinpath("DataLog_1.csv")
+        lines = [",".join(fields) + ","]
+        lines += [",".join(str(value) for value in row) for row in rows.tolist()]
+        fileName.write_text("\n".join(lines) + "\n")
+    return fileName
+
+
+# ============================================
+#            test_replay_sources
+# ============================================
+@pytest.mark.parametrize("kind", ["binary", "parquet", "csv"])
+def test_replay_sources(tmp_path: Path, kind: str) -> None:
+    rows = make_rows()
+    fileName = write_source(kind, tmp_path, rows)
+
+    device = ReplayDevice(fileName, speed=None, chunkRows=16)
+    device.open()
+    device.start_streaming(1000)
+
+    # As fast as possible, each read returns the next sample
+    assert device.read() == dict(zip(fields, rows[0].tolist()))
+    assert device.read_array().tolist() == rows[1].tolist()
+
+    samples = []
+    while not device.finished:
+        samples.extend(device.read(allData=True))
+    assert [sample["state_time"] for sample in samples] == list(range(2, 100))
+    assert [sample["mot_cur"] for sample in samples] == rows[2:, 1].tolist()
+
+    if kind != "csv":
+        assert device.name == "actpack"
+    device.close()
+
+
+# ============================================
+#          test_replay_legacy_data_log
+# ============================================
+def test_replay_legacy_data_log(tmp_path: Path) -> None:
+    # Legacy devices log floats, which must not be truncated
+    fileName = tmp_path.joinpath("DataLog_1.csv")
+    fileName.write_text("state_time,accl_x,\n0,0.25\n1,-1.5\n2,3.75\n")
+
+    device = ReplayDevice(fileName, speed=None)
+    device.open()
+    device.start_streaming()
+    data = device.read(allData=True)
+    device.close()
+
+    assert [sample["accl_x"] for sample in data] == [0.25, -1.5, 3.75]
+
+
+# ============================================
+#            test_replay_real_time
+# ============================================
+def test_replay_real_time(tmp_path: Path) -> None:
+    # 100 samples, 1 ms apart, replayed at twice the recorded rate
+    fileName = write_source("binary", tmp_path, make_rows())
+    device = ReplayDevice(fileName, speed=2.0)
+    device.open()
+    device.start_streaming()
+
+    assert device.read_array()[0] <= 1
+    sleep(0.02)
+    latest = device.read()["state_time"]
+    assert 30 <= latest < 100
+    sleep(0.1)
+    assert device.read()["state_time"] == 99
+    assert device.finished or device.read(allData=True) == []
+    device.close()
+
+
+# ============================================
+#            test_command_capture
+# ============================================
+def test_command_capture(tmp_path: Path) -> None:
+    fileName = write_source("binary", tmp_path, make_rows())
+    commandLog = tmp_path.joinpath("commands.csv")
+    device = ReplayDevice(fileName, speed=None, commandLog=commandLog)
+    device.open()
+    device.start_streaming()
+
+    device.read()
+    device.read()
+    device.command_motor_current(500)
+    device.stop_motor()
+    device.close()
+
+    assert device.commands[0] == (1.0, "current", (500,))
+    assert len(device.commands) == 2
+    lines = commandLog.read_text().splitlines()
+    assert lines[0] == "time,command,values"
+    assert lines[1] == "1.0,current,500"
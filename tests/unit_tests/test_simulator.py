@@ -0,0 +1,83 @@
+from time import sleep
+
+import pytest
+
+from flexsea.device import Device
+import flexsea.utilities.constants as fxc
+from flexsea.utilities.simulator import SimulatedLibrary
+from flexsea.utilities.simulator import SimulatedMotor
+from flexsea.utilities.simulator import simulatedFields
+
+
+# ============================================
+#           test_current_control
+# ============================================
+def test_current_control() -> None:
+    motor = SimulatedMotor()
+    motor.command(fxc.controllers["current"].value, 2000)
+    motor.step(0.01)
+
+    assert motor.current == pytest.approx(2000, rel=1e-3)
+    assert motor.velocity > 0
+
+
+# ============================================
+#           test_position_control
+# ============================================
+def test_position_control() -> None:
+    motor = SimulatedMotor()
+    motor.gains = {"kp": 50, "ki": 0, "kd": 200, "k": 0, "b": 0, "ff": 0}
+    motor.command(fxc.controllers["position"].value, 1000)
+    motor.step(1.0)
+
+    assert motor.angle * motor.ticksPerRad == pytest.approx(1000, abs=20)
+
+
+# ============================================
+#             test_streaming
+# ============================================
+def test_streaming() -> None:
+    clib = SimulatedLibrary(queueSize=50, seed=0)
+    devId = clib.fxOpen(b"sim", 0, 0)
+
+    status = clib.fxStartStreaming(devId, 1000, False)
+    assert status == fxc.deviceErrorCodes["SUCCESS"].value
+    sleep(0.1)
+    nSamples = clib.fxGetReadDataQueueSize(devId)
+
+    # Samples are generated at the streaming rate and the oldest ones are
+    # dropped once the queue is full
+    assert nSamples == 50
+    assert clib.nSamples >= 100
+    assert len(clib.queue[-1]) == len(simulatedFields)
+    assert clib.queue[-1][0] == clib.nSamples
+
+
+# ============================================
+#           test_unknown_function
+# ============================================
+def test_unknown_function() -> None:
+    clib = SimulatedLibrary()
+
+    with pytest.raises(AttributeError):
+        clib.fxDoesNotExist()
+    # Like a CDLL, attribute access returns the same function each time
+    # whereas indexing returns a new one
+    assert clib.fxOpen is clib.fxOpen
+    assert clib["fxOpen"] is not clib["fxOpen"]
+
+
+# ============================================
+#              test_device
+# ============================================
+def test_device(device: Device) -> None:
+    sleep(0.02)
+    data = device.read()
+
+    assert list(data) == simulatedFields
+    assert str(device.firmwareVersion) == "12.0.0"
+    assert device.name == "actpack"
+
+    device.command_motor_current(1500)
+    sleep(0.05)
+    assert abs(device.read()["mot_cur"] - 1500) < 200
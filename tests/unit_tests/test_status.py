@@ -0,0 +1,93 @@
+from pathlib import Path
+from time import sleep
+
+import pytest
+
+from flexsea.device import Device
+from flexsea.utilities.simulator import SimulatedLibrary
+
+
+# ============================================
+#                make_device
+# ============================================
+def make_device(**kwargs) -> Device:
+    clib = SimulatedLibrary(seed=0)
+    device = Device("12.0.0", "sim", clib=clib, debug=True, **kwargs)
+    device.open()
+    device.start_streaming(1000)
+    return device
+
+
+# ============================================
+#                 drop_out
+# ============================================
+def drop_out(device: Device) -> None:
+    """
+    Makes the simulated device stop streaming behind the device's back.
+    """
+    # pylint: disable-next=protected-access
+    device._clib.isStreaming = False
+
+
+# ============================================
+#           test_untracked_status
+# ============================================
+def test_untracked_status(dephy_dir: Path) -> None:
+    # pylint: disable=unused-argument
+    device = make_device()
+    drop_out(device)
+
+    assert device.connected
+    assert not device.streaming
+    device.close()
+
+
+# ============================================
+#            test_tracked_status
+# ============================================
+def test_tracked_status(dephy_dir: Path) -> None:
+    # pylint: disable=unused-argument
+    device = make_device(trackStatus=True)
+    assert device.connected and device.streaming
+
+    device.stop_streaming()
+    assert device.connected and not device.streaming
+    device.start_streaming(1000)
+    assert device.streaming
+
+    # The drop out is only noticed once a read fails
+    drop_out(device)
+    assert device.streaming
+    with pytest.raises(RuntimeError):
+        device.read()
+    assert not device.streaming
+
+    device.close()
+    assert not device.connected and not device.streaming
+
+
+# ============================================
+#             test_sync_status
+# ============================================
+def test_sync_status(dephy_dir: Path) -> None:
+    # pylint: disable=unused-argument
+    device = make_device(trackStatus=True)
+    drop_out(device)
+
+    device.sync_status()
+    assert device.connected and not device.streaming
+    device.close()
+
+
+# ============================================
+#           test_status_resync_period
+# ============================================
+def test_status_resync_period(dephy_dir: Path) -> None:
+    # pylint: disable=unused-argument
+    device = make_device(trackStatus=True, statusResyncPeriod=0.05)
+    drop_out(device)
+    assert device.streaming
+
+    sleep(0.1)
+    assert not device.streaming
+    device.close()
@@ -0,0 +1,91 @@
+from time import sleep
+from typing import List
+
+import numpy as np
+import pytest
+
+from flexsea.commander import FastCommander
+from flexsea.device import Device
+from flexsea.trajectory import TrajectoryPlayer
+
+
+# ============================================
+#             make_commander
+# ============================================
+def make_commander(sent: List[int], slowValue: int, delay: float) -> FastCommander:
+    """
+    Records every setpoint sent and takes ``delay`` seconds to send
+    ``slowValue``. Setpoints below 0 fail.
+    """
+
+    def send(devId: int, controller: int, value: int) -> int:
+        # pylint: disable=unused-argument
+        sent.append(value)
+        if value == slowValue:
+            sleep(delay)
+        return 1 if value >= 0 else 0
+
+    return FastCommander(send, 1, 2, "current", 1)
+
+
+# ============================================
+#           test_device_trajectory
+# ============================================
+def test_device_trajectory(device: Device) -> None:
+    setpoints = np.arange(50) * 10
+    player = device.start_trajectory(setpoints, 200, "current")
+    assert player.wait(5)
+
+    # Setpoints are only skipped if the machine is too busy to keep up
+    results = player.results
+    sent = results["retCode"] != -1
+    assert player.nSent + player.missedDeadlines == 50
+    assert player.nSent == sent.sum()
+    assert (results["commanded"] == setpoints).all()
+    assert (results["retCode"][sent] == device.success).all()
+    # The device is streaming, so the current is recorded
+    assert not np.isnan(results["measured"][sent]).any()
+    assert (np.diff(results["time"][sent]) > 0).all()
+    # pylint: disable-next=protected-access
+    assert device._clib.motor.setpoint == 490
+
+
+# ============================================
+#          test_overdue_setpoints
+# ============================================
+def test_overdue_setpoints() -> None:
+    sent: List[int] = []
+    period = 0.01
+    # Sending setpoint 2 runs past the deadlines of 3 and 4
+    commander = make_commander(sent, 2, 3.5 * period)
+    player = TrajectoryPlayer(commander, np.arange(10), 1 / period)
+    player.start()
+    assert player.wait(5)
+
+    # The overdue setpoints are skipped rather than sent back-to-back
+    assert sent[:3] == [0, 1, 2]
+    assert 3 not in sent and 4 not in sent
+    assert sent == sorted(sent) and sent[-1] == 9
+    assert player.nSent == len(sent)
+    assert player.missedDeadlines == 10 - len(sent)
+
+    results = player.results
+    skipped = results["retCode"] == -1
+    assert skipped.sum() == player.missedDeadlines
+    assert np.isnan(results["time"][skipped]).all()
+    assert (results["lateness"][~skipped] < period).all()
+
+
+# ============================================
+#             test_failed_command
+# ============================================
+def test_failed_command() -> None:
+    sent: List[int] = []
+    commander = make_commander(sent, 0, 0)
+    player = TrajectoryPlayer(commander, [1, -1, 2], 20)
+    player.start()
+
+    with pytest.raises(RuntimeError):
+        player.wait(5)
+    assert sent == [1, -1]
+    assert player.results["retCode"].tolist() == [1, 0]